@@ -0,0 +1,95 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Frame decoder benchmark.
+
+Measures decoding throughput of large settings blobs received in
+socket sized chunks and of many small coalesced replies."""
+
+import os
+import sys
+import timeit
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(parentdir)
+
+from src.ghsapi import framing
+
+BLOB_SIZES = [1048576, 16777216, 67108864]
+CHUNK_SIZE = 65536
+SMALL_FRAMES = 10000
+REPEAT = 5
+
+
+def decode_in_chunks(data: bytes, chunk_size: int) -> int:
+    """Feed data to a new decoder in chunks of chunk_size bytes."""
+
+    decoder = framing.FrameDecoder()
+    count = 0
+    with memoryview(data) as view:
+        for offset in range(0, len(data), chunk_size):
+            count += len(decoder.feed(view[offset : offset + chunk_size]))
+    return count
+
+
+def main():
+    """Run the frame decoder benchmarks."""
+
+    for blob_size in BLOB_SIZES:
+        frame = framing.encode_frame(b"x" * (blob_size - 1) + b"\0")
+        elapsed = min(
+            timeit.repeat(
+                lambda: decode_in_chunks(frame, CHUNK_SIZE),
+                number=1,
+                repeat=REPEAT,
+            )
+        )
+        print(
+            f"blob {blob_size:>10} bytes: {elapsed * 1000:8.2f} ms "
+            f"({blob_size / elapsed / 1048576:8.1f} MiB/s)"
+        )
+
+    frames = b"".join(
+        framing.encode_frame(
+            b'{"jsonrpc":"2.0","result":1,"id":%d}\0' % request_id
+        )
+        for request_id in range(SMALL_FRAMES)
+    )
+    elapsed = min(
+        timeit.repeat(
+            lambda: decode_in_chunks(frames, CHUNK_SIZE),
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+    print(
+        f"{SMALL_FRAMES} coalesced replies: {elapsed * 1000:8.2f} ms "
+        f"({SMALL_FRAMES / elapsed:10.0f} frames/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
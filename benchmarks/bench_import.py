@@ -0,0 +1,105 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Import time benchmark.
+
+Measures the time to import the package and its entry points in a
+fresh interpreter, and lists the package modules each import loads.
+Exits with status 1 when an import takes longer than --max-ms."""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+TARGETS = [
+    "ghsapi",
+    "ghsapi.connection_api",
+    "ghsapi.acquisition_api",
+    "ghsapi.ghsapi",
+]
+REPEAT = 20
+
+MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, sorted(
+    name for name in sys.modules if name.startswith("ghsapi.")
+)]))
+"""
+
+
+def measure(target: str) -> tuple[float, list[str]]:
+    """Import target in a new interpreter, return seconds and modules."""
+
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(target=target)],
+        cwd=os.path.join(parentdir, "src"),
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    elapsed, modules = json.loads(output)
+    return elapsed, modules
+
+
+def main():
+    """Run the import time benchmarks."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument(
+        "--max-ms", type=float, help="fail when a median exceeds this"
+    )
+    args = parser.parse_args()
+
+    too_slow = []
+    for target in TARGETS:
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, modules = measure(target)
+            timings.append(elapsed * 1000)
+        median = statistics.median(timings)
+        print(
+            f"import {target:24} median {median:7.2f} ms  "
+            f"min {min(timings):7.2f} ms  {len(modules)} package modules"
+        )
+        print("    " + ", ".join(name[7:] for name in modules))
+        if args.max_ms is not None and median > args.max_ms:
+            too_slow.append(target)
+
+    if too_slow:
+        print("slower than limit: " + ", ".join(too_slow))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,30 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-"""Import all Gen Daq APIs for integration"""
+"""Import all Gen Daq APIs for integration
 
-from . import ghsapi
+Submodules are imported on first access, e.g. ``ghsapi.ghsapi.GHS``, so
+that importing the package or a single submodule stays cheap.
+"""
+
+import importlib
+import pkgutil
+
+
+def __getattr__(name: str):
+    try:
+        return importlib.import_module(f".{name}", __name__)
+    except ModuleNotFoundError as error:
+        if error.name != f"{__name__}.{name}":
+            # A dependency of the submodule is missing
+            raise
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+
+
+def __dir__() -> list[str]:
+    return sorted(
+        set(globals())
+        | {module.name for module in pkgutil.iter_modules(__path__)}
+    )
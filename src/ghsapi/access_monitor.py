@@ -0,0 +1,196 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Monitoring of the mainframe write access of a connection.
+
+Write access of a GEN DAQ API client is dropped while Perception is
+connected to the same mainframe. The monitor polls GetCurrentAccess in
+the background and also learns the access from the responses to other
+requests, so the current access is known without a round trip.
+
+While the access is ReadOnly, requests that need write access are
+answered with WriteAccessBlocked without being sent, or with
+block_writes wait until ReadWrite access returns. Writes staged with
+GHS.ghs_staged_writes() stay staged while the access is ReadOnly; with
+block_writes sending them waits for access, without it they are answered
+with WriteAccessBlocked when sent.
+"""
+
+import threading
+from typing import Callable
+
+from .connection import ConnectionHandler
+from .ghsapi_states import (
+    RETURN_KEY,
+    WRITE_ACCESS_FREE_METHODS,
+    GHSAccess,
+    GHSReturnValue,
+    optional_to_string,
+)
+from .scheduling import NORMAL
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class AccessMonitor:
+    """Tracks the access of a connection and gates write requests.
+
+    Attributes:
+        poll_interval: Seconds between GetCurrentAccess polls.
+        block_writes: Wait for ReadWrite access instead of answering
+        write requests with WriteAccessBlocked.
+        block_timeout: Maximum seconds to wait for write access, None
+        to wait without limit.
+    """
+
+    def __init__(
+        self,
+        con_handle: ConnectionHandler,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        block_writes: bool = False,
+        block_timeout: float | None = None,
+    ) -> None:
+        self._con_handle = con_handle
+        self.poll_interval = poll_interval
+        self.block_writes = block_writes
+        self.block_timeout = block_timeout
+        self._access = None
+        self._listeners = []
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def access(self) -> str | None:
+        """Last known access, 'ReadOnly', 'ReadWrite' or None."""
+
+        return self._access
+
+    def add_listener(self, listener: Callable[[str | None, str], None]):
+        """Register a callable receiving old and new access on changes.
+
+        Listeners are called from the thread that learned about the
+        change, often the polling thread.
+        """
+
+        self._listeners.append(listener)
+
+    def start(self) -> "AccessMonitor":
+        """Attach to the connection and start polling."""
+
+        self._con_handle.response_observers.append(self._observe)
+        self._con_handle.write_gate = self._gate
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop polling and detach from the connection."""
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._observe in self._con_handle.response_observers:
+            self._con_handle.response_observers.remove(self._observe)
+        if self._con_handle.write_gate == self._gate:
+            self._con_handle.write_gate = None
+        with self._changed:
+            self._changed.notify_all()
+
+    def poll(self) -> str | None:
+        """Ask the mainframe for the current access.
+
+        A failed poll keeps the last known access, so a dropped
+        connection does not open the write gate.
+
+        Returns:
+            The last known access, None before it was learned.
+        """
+
+        # Sent directly: the poll must neither flush staged writes nor
+        # wait at its own write gate.
+        self._con_handle.send_request_direct(
+            "GetCurrentAccess", None, NORMAL, notify=True
+        )
+        return self._access
+
+    def wait_for_write_access(self, timeout: float | None = None) -> bool:
+        """Block until the access is not ReadOnly.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait without
+            limit.
+
+        Returns:
+            True when write access is available, False on timeout or
+            when the monitor was stopped.
+        """
+
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._access != "ReadOnly" or self._stopped.is_set(),
+                timeout,
+            )
+            return self._access != "ReadOnly"
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.poll()
+            self._stopped.wait(self.poll_interval)
+
+    def _gate(self, method_name: str) -> dict | None:
+        if self._access != "ReadOnly":
+            return None
+        if self.block_writes and self.wait_for_write_access(
+            self.block_timeout
+        ):
+            return None
+        return {RETURN_KEY: GHSReturnValue["WriteAccessBlocked"]}
+
+    def _observe(self, method_name: str, response_json: dict) -> None:
+        if "Access" in response_json:
+            self._update(
+                optional_to_string(response_json["Access"], GHSAccess)
+            )
+        elif (
+            response_json.get(RETURN_KEY)
+            == GHSReturnValue["WriteAccessBlocked"]
+        ):
+            self._update("ReadOnly")
+        elif (
+            method_name not in WRITE_ACCESS_FREE_METHODS
+            and response_json.get(RETURN_KEY) == GHSReturnValue["OK"]
+        ):
+            self._update("ReadWrite")
+
+    def _update(self, access: str | None) -> None:
+        with self._changed:
+            old, self._access = self._access, access
+            if old == access:
+                return
+            self._changed.notify_all()
+        for listener in self._listeners:
+            listener(old, access)
@@ -27,7 +27,9 @@
 It is used to control acquisition state of the mainframe.
 """
 
+from .command_scheduler import schedule_command
 from .connection import ConnectionHandler
+from .ghsapi_results import AcquisitionStartTime, ScheduledCommand
 from .ghsapi_states import (
     RETURN_KEY,
     GHSAcquisitionState,
@@ -142,6 +144,36 @@ def trigger(con_handle: ConnectionHandler) -> str:
     return to_string(response_json[RETURN_KEY], GHSReturnValue)
 
 
+def start_recording_at(
+    con_handle: ConnectionHandler, at: float
+) -> ScheduledCommand:
+    """Interface to start recording at a wall-clock time.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        at: Wall-clock time as seconds since the epoch.
+
+    Returns:
+        Named tuple with request status and achieved timing.
+    """
+
+    return schedule_command(con_handle, "StartRecording", at)
+
+
+def trigger_at(con_handle: ConnectionHandler, at: float) -> ScheduledCommand:
+    """Interface to issue a trigger at a wall-clock time.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        at: Wall-clock time as seconds since the epoch.
+
+    Returns:
+        Named tuple with request status and achieved timing.
+    """
+
+    return schedule_command(con_handle, "Trigger", at)
+
+
 def get_acquisition_state(
     con_handle: ConnectionHandler,
 ) -> tuple[str, str | None]:
@@ -168,7 +200,7 @@ def get_acquisition_state(
 
 def get_acquisition_start_time(
     con_handle: ConnectionHandler,
-) -> tuple[str, int | None, int | None, float | None]:
+) -> AcquisitionStartTime:
     """Interface to get absolute time of the start of acquisition.
 
     Args:
@@ -183,27 +215,14 @@ def get_acquisition_start_time(
         "GetAcquisitionStartTime", None
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "AbsoluteTimeYear",
-                "AbsoluteTimeDay",
-                "AbsoluteTimeSeconds",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-            None,
-        )
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["AbsoluteTimeYear"],
-        response_json["AbsoluteTimeDay"],
-        response_json["AbsoluteTimeSeconds"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return AcquisitionStartTime(status)
+    return AcquisitionStartTime(
+        status,
+        response_json.get("AbsoluteTimeYear"),
+        response_json.get("AbsoluteTimeDay"),
+        response_json.get("AbsoluteTimeSeconds"),
     )
 
 
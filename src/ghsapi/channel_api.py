@@ -25,6 +25,16 @@
 """Channel module interface."""
 
 from .connection import ConnectionHandler
+from .ghsapi_results import (
+    AutoRange,
+    ChannelCalInfo,
+    Excitation,
+    FilterTypeAndFrequency,
+    SpanAndOffset,
+    TechnicalUnits,
+    TimerCounterRange,
+    TriggerSettings,
+)
 from .ghsapi_states import (
     RETURN_KEY,
     GHSAmplifierMode,
@@ -40,6 +50,7 @@ from .ghsapi_states import (
     GHSTriggerMode,
     GHSChannelType,
     from_string,
+    optional_to_string,
     to_string,
 )
 
@@ -373,9 +384,7 @@ def cmd_zeroing(
 
 def get_trigger_settings(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[
-    str, str | None, float | None, float | None, float | None, str | None
-]:
+) -> TriggerSettings:
     """Determine the trigger settings for an analog channel.
 
      Read - This method can be called by multiple connected clients at
@@ -393,7 +402,7 @@ def get_trigger_settings(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None, None, None, None
+        return TriggerSettings("NullPtrArgument")
 
     trigger_settings_dict = {
         "SlotId": slot_id,
@@ -404,34 +413,16 @@ def get_trigger_settings(
         "GetTriggerSettings", trigger_settings_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "TriggerMode",
-                "PrimaryLevel",
-                "SecondaryLevel",
-                "Hysteresis",
-                "Direction",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-            None,
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        to_string(response_json["TriggerMode"], GHSTriggerMode),
-        response_json["PrimaryLevel"],
-        response_json["SecondaryLevel"],
-        response_json["Hysteresis"],
-        to_string(response_json["Direction"], GHSDirection),
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return TriggerSettings(status)
+    return TriggerSettings(
+        status,
+        optional_to_string(response_json.get("TriggerMode"), GHSTriggerMode),
+        response_json.get("PrimaryLevel"),
+        response_json.get("SecondaryLevel"),
+        response_json.get("Hysteresis"),
+        optional_to_string(response_json.get("Direction"), GHSDirection),
     )
 
 
@@ -726,7 +717,7 @@ def set_input_coupling(
 
 def get_span_and_offset(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[str, float | None, float | None]:
+) -> SpanAndOffset:
     """Determine the span and offset for an analog channel.
 
      Read - This method can be called by multiple connected clients at
@@ -744,7 +735,7 @@ def get_span_and_offset(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None
+        return SpanAndOffset("NullPtrArgument")
 
     span_offset_dict = {
         "SlotId": slot_id,
@@ -755,25 +746,13 @@ def get_span_and_offset(
         "GetSpanAndOffset", span_offset_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "Span",
-                "Offset",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["Span"],
-        response_json["Offset"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return SpanAndOffset(status)
+    return SpanAndOffset(
+        status,
+        response_json.get("Span"),
+        response_json.get("Offset"),
     )
 
 
@@ -827,7 +806,7 @@ def set_span_and_offset(
 
 def get_filter_type_and_frequency(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[str, str | None, float | None]:
+) -> FilterTypeAndFrequency:
     """Determine the filter type and frequency for an analog channel.
 
      Read - This method can be called by multiple connected clients at
@@ -846,7 +825,7 @@ def get_filter_type_and_frequency(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None
+        return FilterTypeAndFrequency("NullPtrArgument")
 
     filter_freq_dict = {
         "SlotId": slot_id,
@@ -857,25 +836,13 @@ def get_filter_type_and_frequency(
         "GetFilterTypeAndFrequency", filter_freq_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "FilterType",
-                "Frequency",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        to_string(response_json["FilterType"], GHSFilterType),
-        response_json["Frequency"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return FilterTypeAndFrequency(status)
+    return FilterTypeAndFrequency(
+        status,
+        optional_to_string(response_json.get("FilterType"), GHSFilterType),
+        response_json.get("Frequency"),
     )
 
 
@@ -945,7 +912,7 @@ def set_filter_type_and_frequency(
 
 def get_excitation(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[str, str | None, float | None]:
+) -> Excitation:
     """Determine the excitation type and value for an analog channel.
 
      Read - This method can be called by multiple connected clients at
@@ -963,7 +930,7 @@ def get_excitation(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None
+        return Excitation("NullPtrArgument")
 
     excitation_dict = {
         "SlotId": slot_id,
@@ -974,25 +941,15 @@ def get_excitation(
         "GetExcitation", excitation_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "ExcitationType",
-                "ExcitationValue",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        to_string(response_json["ExcitationType"], GHSExcitationType),
-        response_json["ExcitationValue"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return Excitation(status)
+    return Excitation(
+        status,
+        optional_to_string(
+            response_json.get("ExcitationType"), GHSExcitationType
+        ),
+        response_json.get("ExcitationValue"),
     )
 
 
@@ -1174,7 +1131,7 @@ def set_amplifier_mode(
 
 def get_technical_units(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[str, str | None, float | None, float | None]:
+) -> TechnicalUnits:
     """Determine the technical units, unit multiplier and unit offset for an
     analog channel.
 
@@ -1196,7 +1153,7 @@ def get_technical_units(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None, None
+        return TechnicalUnits("NullPtrArgument")
 
     technical_dict = {
         "SlotId": slot_id,
@@ -1207,28 +1164,14 @@ def get_technical_units(
         "GetTechnicalUnits", technical_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "Multiplier",
-                "Offset",
-                "UnitType",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["UnitType"],
-        response_json["Multiplier"],
-        response_json["Offset"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return TechnicalUnits(status)
+    return TechnicalUnits(
+        status,
+        response_json.get("UnitType"),
+        response_json.get("Multiplier"),
+        response_json.get("Offset"),
     )
 
 
@@ -1297,7 +1240,7 @@ def set_technical_units(
 
 def get_auto_range(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[str, str | None, float | None]:
+) -> AutoRange:
     """Determine the auto range enable and time settings.
 
      Read - This method can be called by multiple connected clients at
@@ -1316,7 +1259,7 @@ def get_auto_range(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None
+        return AutoRange("NullPtrArgument")
 
     auto_dict = {
         "SlotId": slot_id,
@@ -1327,25 +1270,15 @@ def get_auto_range(
         "GetAutoRange", auto_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "AutoRangeEnabled",
-                "AutoRangeTime",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        to_string(response_json["AutoRangeEnabled"], GHSEnableDisable),
-        response_json["AutoRangeTime"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return AutoRange(status)
+    return AutoRange(
+        status,
+        optional_to_string(
+            response_json.get("AutoRangeEnabled"), GHSEnableDisable
+        ),
+        response_json.get("AutoRangeTime"),
     )
 
 
@@ -1465,9 +1398,7 @@ def cmd_auto_range_now(
 
 def get_channel_cal_info(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[
-    str, str | None, str | None, str | None, str | None, str | None, str | None
-]:
+) -> ChannelCalInfo:
     """Retrieve calibration information for an analog channel.
 
     The calibrationDateTime, verificationDateTime, powerVerificationDateTime,
@@ -1486,7 +1417,7 @@ def get_channel_cal_info(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None, None, None, None, None
+        return ChannelCalInfo("NullPtrArgument")
 
     cal_info_dict = {
         "SlotId": slot_id,
@@ -1497,43 +1428,20 @@ def get_channel_cal_info(
         "GetChannelCalibrationInformation", cal_info_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "CalibrationDateTime",
-                "VerificationDateTime",
-                "PowerVerificationDateTime",
-                "CalibrationLab",
-                "VerificationLab",
-                "PowerVerificationLab",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-            None,
-            None,
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["CalibrationDateTime"],
-        response_json["VerificationDateTime"],
-        response_json["PowerVerificationDateTime"],
-        response_json["CalibrationLab"],
-        response_json["VerificationLab"],
-        response_json["PowerVerificationLab"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return ChannelCalInfo(status)
+    return ChannelCalInfo(
+        status,
+        response_json.get("CalibrationDateTime"),
+        response_json.get("VerificationDateTime"),
+        response_json.get("PowerVerificationDateTime"),
+        response_json.get("CalibrationLab"),
+        response_json.get("VerificationLab"),
+        response_json.get("PowerVerificationLab"),
     )
 
 
-# Timer/Counter
-
-
 def get_timer_counter_gate_time(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
 ) -> tuple[str, float | None]:
@@ -1730,7 +1638,7 @@ def set_timer_counter_mode(
 
 def get_timer_counter_range(
     con_handle: ConnectionHandler, slot_id: str, channel_index: int
-) -> tuple[str, float | None, float | None]:
+) -> TimerCounterRange:
     """Determine the range for a timer/counter channel.
 
     Read - This method can be called by multiple connected clients at
@@ -1748,7 +1656,7 @@ def get_timer_counter_range(
     """
 
     if not slot_id or not channel_index:
-        return "NullPtrArgument", None, None
+        return TimerCounterRange("NullPtrArgument")
 
     range_dict = {
         "SlotId": slot_id,
@@ -1759,25 +1667,13 @@ def get_timer_counter_range(
         "GetTimerCounterRange", range_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "UpperValue",
-                "LowerValue",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["LowerValue"],
-        response_json["UpperValue"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return TimerCounterRange(status)
+    return TimerCounterRange(
+        status,
+        response_json.get("LowerValue"),
+        response_json.get("UpperValue"),
     )
 
 
@@ -0,0 +1,271 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Bulk channel setters.
+
+Apply one setting to many channels of a recorder, e.g. from a sensor
+calibration sheet. The arguments are validated once for all channels and
+the requests are pipelined.
+"""
+
+import math
+from collections.abc import Iterable
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+from .connection import PIPELINE_WINDOW, ConnectionHandler
+from .ghsapi_results import BulkSetResult
+from .ghsapi_states import (
+    RETURN_KEY,
+    GHSDirection,
+    GHSReturnValue,
+    GHSTriggerMode,
+    to_string,
+)
+
+
+def _as_list(values) -> list | None:
+    """Return the items of an array or non-string iterable, else None."""
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.tolist() if values.ndim else None
+    if isinstance(values, Iterable) and not isinstance(values, (str, bytes)):
+        return list(values)
+    return None
+
+
+def _broadcast(values, count: int) -> list | None:
+    """Return values as a list of count items, repeating a scalar.
+
+    Returns None when an array or iterable has the wrong length.
+    """
+
+    items = _as_list(values)
+    if items is None:
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            values = values.item()
+        return [values] * count
+    return items if len(items) == count else None
+
+
+def _valid_numbers(values: list) -> bool:
+    """Check all values are finite int or float numbers."""
+
+    return all(
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+        for value in values
+    )
+
+
+def _valid_indices(values: list) -> bool:
+    """Check all values are one-based channel indices."""
+
+    return all(
+        isinstance(value, int) and not isinstance(value, bool) and value > 0
+        for value in values
+    )
+
+
+def _encode(values: list, ghs_dict: dict) -> list | None:
+    """Map state names or values to values, None if one is unknown."""
+
+    lookup = dict(ghs_dict)
+    lookup.update((value, value) for value in ghs_dict.values())
+    codes = []
+    for value in values:
+        if isinstance(value, bool) or value not in lookup:
+            return None
+        codes.append(lookup[value])
+    return codes
+
+
+def _send(
+    con_handle: ConnectionHandler,
+    method_name: str,
+    params: list[dict],
+    window: int,
+) -> BulkSetResult:
+    """Pipeline one request per channel and collect the statuses."""
+
+    responses = con_handle.send_requests_pipelined(
+        [(method_name, param) for param in params], window
+    )
+    statuses = [
+        to_string(response_json[RETURN_KEY], GHSReturnValue)
+        for response_json in responses
+    ]
+    status = next((status for status in statuses if status != "OK"), "OK")
+    return BulkSetResult(status, statuses)
+
+
+def set_span_and_offset_bulk(
+    con_handle: ConnectionHandler,
+    slot_id: str,
+    channel_indices: Iterable[int],
+    spans: Iterable[float] | float,
+    offsets: Iterable[float] | float,
+    window: int = PIPELINE_WINDOW,
+) -> BulkSetResult:
+    """Set span and offset for many analog channels of a recorder.
+
+     ReadWrite - This method will only process requests from the
+     connected client with the most privileges order (Privileges order:
+     1- Perception, 2- GenDaq, 3- Other)
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        slot_id: The slot containing the recorder (e.g. 'A' for the
+        first slot).
+        channel_indices: Iterable or NumPy array of one-based channel
+        indices.
+        spans: Span per channel in user units, or one span for all.
+        offsets: Offset per channel in user units, or one offset for
+        all.
+        window: Maximum number of requests in flight.
+
+    Returns:
+        Overall status, the first failure if any, and the status per
+        channel. No request is sent when validation fails.
+    """
+
+    if not slot_id or channel_indices is None:
+        return BulkSetResult("NullPtrArgument")
+    indices = _as_list(channel_indices)
+    if indices is None:
+        return BulkSetResult("InvalidDataType")
+    count = len(indices)
+    spans = _broadcast(spans, count)
+    offsets = _broadcast(offsets, count)
+    if not count or spans is None or offsets is None:
+        return BulkSetResult("InvalidDataType")
+    if not (
+        _valid_indices(indices)
+        and _valid_numbers(spans)
+        and _valid_numbers(offsets)
+    ):
+        return BulkSetResult("InvalidDataType")
+
+    params = [
+        {
+            "SlotId": slot_id,
+            "ChannelIndex": index,
+            "Span": float(span),
+            "Offset": float(offset),
+        }
+        for index, span, offset in zip(indices, spans, offsets)
+    ]
+    return _send(con_handle, "SetSpanAndOffset", params, window)
+
+
+def set_trigger_settings_bulk(
+    con_handle: ConnectionHandler,
+    slot_id: str,
+    channel_indices: Iterable[int],
+    trigger_modes: Iterable[str | int] | str | int,
+    primary_levels: Iterable[float] | float,
+    secondary_levels: Iterable[float] | float,
+    hysteresis: Iterable[float] | float,
+    directions: Iterable[str | int] | str | int,
+    window: int = PIPELINE_WINDOW,
+) -> BulkSetResult:
+    """Set the trigger settings for many analog channels of a recorder.
+
+     The system needs to be idle before calling this function.
+
+     ReadWrite - This method will only process requests from the
+     connected client with the most privileges order (Privileges order:
+     1- Perception, 2- GenDaq, 3- Other)
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        slot_id: The slot containing the recorder (e.g. 'A' for the
+        first slot).
+        channel_indices: Iterable or NumPy array of one-based channel
+        indices.
+        trigger_modes: Trigger mode per channel, or one for all.
+        primary_levels: Primary trigger level per channel, or one for
+        all.
+        secondary_levels: Secondary trigger level per channel, or one
+        for all.
+        hysteresis: Trigger hysteresis per channel, or one for all.
+        directions: Trigger direction per channel, or one for all.
+        window: Maximum number of requests in flight.
+
+    Returns:
+        Overall status, the first failure if any, and the status per
+        channel. No request is sent when validation fails.
+    """
+
+    if not slot_id or channel_indices is None:
+        return BulkSetResult("NullPtrArgument")
+    indices = _as_list(channel_indices)
+    if indices is None:
+        return BulkSetResult("InvalidDataType")
+    count = len(indices)
+    columns = [
+        _broadcast(values, count)
+        for values in (
+            trigger_modes,
+            primary_levels,
+            secondary_levels,
+            hysteresis,
+            directions,
+        )
+    ]
+    if not count or any(column is None for column in columns):
+        return BulkSetResult("InvalidDataType")
+    modes, primaries, secondaries, hystereses, directions = columns
+    modes = _encode(modes, GHSTriggerMode)
+    directions = _encode(directions, GHSDirection)
+    if (
+        modes is None
+        or directions is None
+        or not _valid_indices(indices)
+        or not all(
+            _valid_numbers(column)
+            for column in (primaries, secondaries, hystereses)
+        )
+    ):
+        return BulkSetResult("InvalidDataType")
+
+    params = [
+        {
+            "SlotId": slot_id,
+            "ChannelIndex": index,
+            "TriggerMode": mode,
+            "PrimaryLevel": float(primary),
+            "SecondaryLevel": float(secondary),
+            "Hysteresis": float(hyst),
+            "Direction": direction,
+        }
+        for index, mode, primary, secondary, hyst, direction in zip(
+            indices, modes, primaries, secondaries, hystereses, directions
+        )
+    ]
+    return _send(con_handle, "SetTriggerSettings", params, window)
@@ -0,0 +1,467 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Columnar export of the recorder and channel settings of a mainframe.
+
+The settings of all recorders and channels are read with pipelined
+requests and collected per column, ready to be turned into a NumPy
+structured array or an Arrow table when those packages are installed.
+"""
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+from .connection import PIPELINE_WINDOW, ConnectionHandler
+from .ghsapi_states import (
+    RETURN_KEY,
+    GHSAmplifierMode,
+    GHSChannelType,
+    GHSDirection,
+    GHSEnableDisable,
+    GHSExcitationType,
+    GHSFilterType,
+    GHSRecordingDataSource,
+    GHSReturnValue,
+    GHSTriggerMode,
+    optional_to_string,
+    to_string,
+)
+
+# Column name, request method, response key, state dictionary of the
+# analog channel settings. Non analog channels leave these empty.
+ANALOG_COLUMNS = [
+    ("span", "GetSpanAndOffset", "Span", None),
+    ("offset", "GetSpanAndOffset", "Offset", None),
+    ("filter_type", "GetFilterTypeAndFrequency", "FilterType", GHSFilterType),
+    ("filter_frequency", "GetFilterTypeAndFrequency", "Frequency", None),
+    ("excitation_type", "GetExcitation", "ExcitationType", GHSExcitationType),
+    ("excitation_value", "GetExcitation", "ExcitationValue", None),
+    ("amplifier_mode", "GetAmplifierMode", "AmplifierMode", GHSAmplifierMode),
+    ("units", "GetTechnicalUnits", "UnitType", None),
+    ("unit_multiplier", "GetTechnicalUnits", "Multiplier", None),
+    ("unit_offset", "GetTechnicalUnits", "Offset", None),
+    ("trigger_mode", "GetTriggerSettings", "TriggerMode", GHSTriggerMode),
+    ("trigger_primary_level", "GetTriggerSettings", "PrimaryLevel", None),
+    ("trigger_secondary_level", "GetTriggerSettings", "SecondaryLevel", None),
+    ("trigger_hysteresis", "GetTriggerSettings", "Hysteresis", None),
+    ("trigger_direction", "GetTriggerSettings", "Direction", GHSDirection),
+]
+
+KEY_COLUMNS = ["slot_id", "channel_index", "channel_type", "storage_enabled"]
+
+COLUMNS = KEY_COLUMNS + [column[0] for column in ANALOG_COLUMNS]
+
+# Column name, request method, response key, state dictionary of the
+# recorder settings.
+RECORDER_COLUMNS = [
+    (
+        "recorder_enabled",
+        "GetRecorderEnabled",
+        "IsRecorderEnabled",
+        GHSEnableDisable,
+    ),
+    ("sample_rate", "GetSampleRate", "SampleRate", None),
+    (
+        "high_rate_storage",
+        "GetHighLowRateStorageEnabled",
+        "HighRateEnable",
+        GHSEnableDisable,
+    ),
+    (
+        "low_rate_storage",
+        "GetHighLowRateStorageEnabled",
+        "LowRateEnable",
+        GHSEnableDisable,
+    ),
+]
+
+_CONNECTION_ERRORS = (
+    GHSReturnValue["NoConnection"],
+    GHSReturnValue["MainframeTimeout"],
+)
+
+
+class ChannelTable:
+    """Channel settings with one list of values per column.
+
+    Row i of the table describes the channel at slot_id[i] and
+    channel_index[i]. Settings that do not apply to a channel or could
+    not be read are None.
+    """
+
+    COLUMNS = COLUMNS
+    INTEGER_COLUMNS = frozenset(["channel_index"])
+    # Columns holding text, all other columns are floats.
+    TEXT_COLUMNS = frozenset(
+        ["slot_id", "channel_type", "storage_enabled", "units"]
+        + [column[0] for column in ANALOG_COLUMNS if column[3] is not None]
+    )
+
+    def __init__(self, columns: dict[str, list] | None = None) -> None:
+        self.columns = columns or {name: [] for name in self.COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns["slot_id"])
+
+    def rows(self) -> list[dict]:
+        """Return the table as a list of dicts, one per row."""
+
+        names = list(self.columns)
+        return [
+            dict(zip(names, values))
+            for values in zip(*(self.columns[name] for name in names))
+        ]
+
+    def to_numpy(self):
+        """Return the table as a NumPy structured array.
+
+        Text columns are fixed width unicode, missing numbers are NaN.
+
+        Raises:
+            ImportError: NumPy is not installed.
+        """
+
+        if numpy is None:
+            raise ImportError("to_numpy requires numpy")
+
+        dtype = []
+        for name, values in self.columns.items():
+            if name in self.TEXT_COLUMNS:
+                width = max(
+                    (len(v) for v in values if v is not None), default=1
+                )
+                dtype.append((name, f"U{max(width, 1)}"))
+            elif name in self.INTEGER_COLUMNS:
+                dtype.append((name, "i4"))
+            else:
+                dtype.append((name, "f8"))
+
+        table = numpy.empty(len(self), dtype=dtype)
+        for name, values in self.columns.items():
+            if name in self.TEXT_COLUMNS:
+                table[name] = ["" if v is None else v for v in values]
+            elif name in self.INTEGER_COLUMNS:
+                table[name] = [0 if v is None else v for v in values]
+            else:
+                table[name] = [numpy.nan if v is None else v for v in values]
+        return table
+
+    def to_arrow(self):
+        """Return the table as an Arrow table.
+
+        Raises:
+            ImportError: pyarrow is not installed.
+        """
+
+        if pyarrow is None:
+            raise ImportError("to_arrow requires pyarrow")
+
+        fields = []
+        for name in self.columns:
+            if name in self.TEXT_COLUMNS:
+                fields.append(pyarrow.field(name, pyarrow.string()))
+            elif name in self.INTEGER_COLUMNS:
+                fields.append(pyarrow.field(name, pyarrow.int32()))
+            else:
+                fields.append(pyarrow.field(name, pyarrow.float64()))
+        return pyarrow.table(self.columns, schema=pyarrow.schema(fields))
+
+    def to_columnar(self):
+        """Return the best columnar form available.
+
+        An Arrow table when pyarrow is installed, otherwise a NumPy
+        structured array, otherwise the plain dict of lists.
+        """
+
+        if pyarrow is not None:
+            return self.to_arrow()
+        if numpy is not None:
+            return self.to_numpy()
+        return self.columns
+
+
+class RecorderTable(ChannelTable):
+    """Recorder settings with one list of values per column.
+
+    Row i of the table describes the recorder in slot_id[i]. Empty
+    slots are not listed.
+    """
+
+    COLUMNS = ["slot_id", "channel_count"] + [
+        column[0] for column in RECORDER_COLUMNS
+    ]
+    INTEGER_COLUMNS = frozenset(["channel_count"])
+    TEXT_COLUMNS = frozenset(
+        [
+            "slot_id",
+            "recorder_enabled",
+            "high_rate_storage",
+            "low_rate_storage",
+        ]
+    )
+
+
+def _error(response_json: dict) -> tuple[str, None]:
+    """Return the failure status of a response."""
+
+    return to_string(response_json[RETURN_KEY], GHSReturnValue), None
+
+
+def _read_columns(
+    con_handle: ConnectionHandler,
+    table: ChannelTable,
+    rows: list[int],
+    columns: list[tuple],
+    params: list[dict],
+    window: int,
+    method_params: dict[str, dict] | None = None,
+) -> dict | None:
+    """Read columns of the given rows with one pipelined batch.
+
+    Settings that cannot be read stay None. params holds the request
+    parameters per row, method_params extra parameters per method.
+
+    Returns:
+        The failure response when the connection was lost, else None.
+    """
+
+    methods = list(dict.fromkeys(column[1] for column in columns))
+    method_params = method_params or {}
+    responses = con_handle.send_requests_pipelined(
+        [
+            (method_name, {**param, **method_params.get(method_name, {})})
+            for param in params
+            for method_name in methods
+        ],
+        window,
+    )
+    for response_json in responses:
+        if response_json[RETURN_KEY] in _CONNECTION_ERRORS:
+            return response_json
+
+    for column in columns:
+        table.columns[column[0]] = [None] * len(table)
+    for position, row in enumerate(rows):
+        replies = dict(
+            zip(
+                methods,
+                responses[
+                    position * len(methods) : (position + 1) * len(methods)
+                ],
+            )
+        )
+        for name, method_name, key, ghs_dict in columns:
+            response_json = replies[method_name]
+            if response_json[RETURN_KEY] != GHSReturnValue["OK"]:
+                continue
+            value = response_json.get(key)
+            if ghs_dict is not None:
+                value = optional_to_string(value, ghs_dict)
+            table.columns[name][row] = value
+    return None
+
+
+def get_recorder_table(
+    con_handle: ConnectionHandler,
+    slot_ids: list[str] | None = None,
+    window: int = PIPELINE_WINDOW,
+) -> tuple[str, RecorderTable | None]:
+    """Read the settings of all recorders into a columnar table.
+
+    The channel counts and the recorder settings are each read with one
+    pipelined batch of requests. Empty slots are skipped.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        slot_ids: Slots to read, all slots of the mainframe if None.
+        window: Maximum number of requests in flight.
+
+    Returns:
+        Tuple with status and the recorder table.
+    """
+
+    if slot_ids is None:
+        response_json = con_handle.send_request_wait_response(
+            "GetSlotCount", None
+        )
+        if response_json[RETURN_KEY] != GHSReturnValue["OK"]:
+            return _error(response_json)
+        slot_ids = [
+            chr(ord("A") + slot) for slot in range(response_json["SlotCount"])
+        ]
+
+    responses = con_handle.send_requests_pipelined(
+        [("GetChannelCount", {"SlotId": slot_id}) for slot_id in slot_ids],
+        window,
+    )
+    table = RecorderTable()
+    for slot_id, response_json in zip(slot_ids, responses):
+        if response_json[RETURN_KEY] == GHSReturnValue["EmptySlot"]:
+            continue
+        if response_json[RETURN_KEY] != GHSReturnValue["OK"]:
+            return _error(response_json)
+        table.columns["slot_id"].append(slot_id)
+        table.columns["channel_count"].append(response_json["ChannelCount"])
+
+    error_json = _read_columns(
+        con_handle,
+        table,
+        list(range(len(table))),
+        RECORDER_COLUMNS,
+        [{"SlotId": slot_id} for slot_id in table.columns["slot_id"]],
+        window,
+        {
+            "GetHighLowRateStorageEnabled": {
+                "Source": GHSRecordingDataSource["SyncChannels"]
+            }
+        },
+    )
+    if error_json:
+        return _error(error_json)
+    return "OK", table
+
+
+def get_channel_table(
+    con_handle: ConnectionHandler,
+    slot_ids: list[str] | None = None,
+    window: int = PIPELINE_WINDOW,
+    recorders: RecorderTable | None = None,
+    analog_settings: bool = True,
+) -> tuple[str, ChannelTable | None]:
+    """Read the settings of all channels into a columnar table.
+
+    The channel counts, channel types and storage enabled states, and
+    analog settings are each read with one pipelined batch of requests.
+    Empty slots are skipped.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        slot_ids: Slots to read, all slots of the mainframe if None.
+        window: Maximum number of requests in flight.
+        recorders: Recorder table read before, its channel counts are
+        used instead of reading them again.
+        analog_settings: Read the analog settings, when False their
+        columns stay None.
+
+    Returns:
+        Tuple with status and the channel table.
+    """
+
+    if recorders is None:
+        status, recorders = get_recorder_table(con_handle, slot_ids, window)
+        if status != "OK":
+            return status, None
+    elif slot_ids is not None:
+        recorders = RecorderTable(
+            {
+                name: [
+                    value
+                    for slot_id, value in zip(
+                        recorders.columns["slot_id"], values
+                    )
+                    if slot_id in slot_ids
+                ]
+                for name, values in recorders.columns.items()
+            }
+        )
+
+    channels = [
+        (slot_id, channel_index)
+        for slot_id, count in zip(
+            recorders.columns["slot_id"], recorders.columns["channel_count"]
+        )
+        for channel_index in range(1, count + 1)
+    ]
+    responses = con_handle.send_requests_pipelined(
+        [
+            ("GetChannelType", {"SlotId": slot_id, "ChannelIndex": index})
+            for slot_id, index in channels
+        ],
+        window,
+    )
+    table = ChannelTable()
+    channel_types = []
+    for (slot_id, channel_index), response_json in zip(channels, responses):
+        if response_json[RETURN_KEY] != GHSReturnValue["OK"]:
+            return _error(response_json)
+        channel_types.append(response_json.get("ChannelType"))
+        table.columns["slot_id"].append(slot_id)
+        table.columns["channel_index"].append(channel_index)
+        table.columns["channel_type"].append(
+            optional_to_string(channel_types[-1], GHSChannelType)
+        )
+
+    error_json = _read_columns(
+        con_handle,
+        table,
+        list(range(len(table))),
+        [
+            (
+                "storage_enabled",
+                "GetChannelStorageEnabled",
+                "Enabled",
+                GHSEnableDisable,
+            )
+        ],
+        [
+            {
+                "SlotId": slot_id,
+                "ChannelIndex": channel_index,
+                "ChannelType": channel_type,
+            }
+            for (slot_id, channel_index), channel_type in zip(
+                channels, channel_types
+            )
+        ],
+        window,
+    )
+    if error_json:
+        return _error(error_json)
+
+    analog_rows = [
+        row
+        for row, channel_type in enumerate(table.columns["channel_type"])
+        if channel_type == "Analog" and analog_settings
+    ]
+    error_json = _read_columns(
+        con_handle,
+        table,
+        analog_rows,
+        ANALOG_COLUMNS,
+        [
+            {"SlotId": channels[row][0], "ChannelIndex": channels[row][1]}
+            for row in analog_rows
+        ],
+        window,
+    )
+    if error_json:
+        return _error(error_json)
+    return "OK", table
@@ -0,0 +1,250 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Circuit breakers failing requests to unreachable mainframes fast.
+
+Every request to a powered off mainframe waits for the socket timeout,
+so a sweep over many mainframes takes as long as its dead ones. A
+circuit breaker per mainframe counts consecutive connection failures
+and timeouts. After failure_threshold of them it opens and requests fail
+at once with NoConnection. After reset_timeout seconds it turns half
+open: one caller probes the mainframe with GetCurrentAccess, and the
+breaker closes when the probe is answered or opens again when not.
+
+    breakers = CircuitBreakers()
+    with fleet.connected(address, timeout, breakers) as (status, gen):
+        ...
+
+A fleet sweep connects to every mainframe once, so the breakers of a
+sweep trip on the first failed connect and their state is kept in a
+file for the next sweep. Mainframes that were unreachable are then
+skipped until reset_timeout has passed.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable
+
+from .connection import ConnectionHandler
+from .ghsapi_states import RETURN_KEY, GHSReturnValue
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Statuses telling the mainframe is unreachable, by name and by value
+FAILURE_STATUSES = frozenset(
+    ["NoConnection", "ConnectionFailed", "MainframeTimeout"]
+)
+_FAILURE_VALUES = frozenset(GHSReturnValue[name] for name in FAILURE_STATUSES)
+
+
+def is_failure(status: str | int) -> bool:
+    """Whether a status name or value tells the mainframe is unreachable."""
+
+    if isinstance(status, str):
+        return status in FAILURE_STATUSES
+    return status in _FAILURE_VALUES
+
+
+class CircuitBreaker:
+    """Connection failure tracking of one mainframe.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the breaker.
+        reset_timeout: Seconds the breaker stays open before a probe.
+        state: closed, open or half_open.
+        failures: Number of consecutive failures.
+        rejected_calls: Number of calls failed without a request.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.rejected_calls = 0
+        self._opened_at = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self) -> str:
+        """Admit a call.
+
+        Returns:
+            closed when the call may go ahead, half_open when the
+            caller is the one to probe the mainframe and record the
+            result, open when the call has to fail at once.
+        """
+
+        with self._lock:
+            if self.state == CLOSED:
+                return CLOSED
+            if (
+                self.state == OPEN
+                and self._clock() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = HALF_OPEN
+                return HALF_OPEN
+            self.rejected_calls += 1
+            return OPEN
+
+    def record(self, status: str | int) -> None:
+        """Record the status of a call or probe."""
+
+        with self._lock:
+            if not is_failure(status):
+                self.failures = 0
+                self.state = CLOSED
+                return
+            self.failures += 1
+            if (
+                self.state == HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self._opened_at = self._clock()
+
+    def observe(self, method_name: str, response_json: dict) -> None:
+        """Response observer recording the status of every response."""
+
+        self.record(response_json[RETURN_KEY])
+
+
+class CircuitBreakers:
+    """Circuit breakers by mainframe address, created on first use.
+
+    Attributes:
+        path: Optional JSON file keeping the breaker states between
+        runs, read on creation and written by save().
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.time,
+        path: str | None = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.path = path
+        self._clock = clock
+        self._breakers = {}
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as state_file:
+                saved = json.load(state_file)
+        except FileNotFoundError:
+            return
+        for address, state in saved.items():
+            breaker = self.get(address)
+            breaker.failures = state["failures"]
+            if state["state"] != CLOSED:
+                # A probe of an earlier run did not finish
+                breaker.state = OPEN
+                breaker._opened_at = state["opened_at"]
+
+    def save(self) -> None:
+        """Write the breaker states to the path, if any."""
+
+        if not self.path:
+            return
+        with self._lock:
+            saved = {
+                address: {
+                    "state": breaker.state,
+                    "failures": breaker.failures,
+                    "opened_at": breaker._opened_at,
+                }
+                for address, breaker in self._breakers.items()
+            }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump(saved, state_file, indent=2)
+        os.replace(temp_path, self.path)
+
+    def get(self, address: str) -> CircuitBreaker:
+        """Circuit breaker of a mainframe address."""
+
+        with self._lock:
+            if address not in self._breakers:
+                self._breakers[address] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self._clock
+                )
+            return self._breakers[address]
+
+    def states(self) -> dict[str, str]:
+        """State of every circuit breaker by address."""
+
+        with self._lock:
+            return {
+                address: breaker.state
+                for address, breaker in self._breakers.items()
+            }
+
+
+def enable_circuit_breaker(
+    con_handle: ConnectionHandler, breaker: CircuitBreaker
+) -> CircuitBreaker:
+    """Guard the requests of a connection with a circuit breaker.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        breaker: Circuit breaker of the mainframe, may be shared with
+        other connections to the same mainframe.
+
+    Returns:
+        The circuit breaker, detach it with disable_circuit_breaker().
+    """
+
+    disable_circuit_breaker(con_handle)
+    con_handle.breaker = breaker
+    con_handle.response_observers.append(breaker.observe)
+    return breaker
+
+
+def disable_circuit_breaker(con_handle: ConnectionHandler) -> None:
+    """Detach the circuit breaker of a connection."""
+
+    breaker, con_handle.breaker = con_handle.breaker, None
+    if (
+        breaker is not None
+        and breaker.observe in con_handle.response_observers
+    ):
+        con_handle.response_observers.remove(breaker.observe)
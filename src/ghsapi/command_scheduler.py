@@ -0,0 +1,234 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Acquisition control commands sent at a wall-clock time.
+
+Sleeping until a start time and then sending StartRecording adds the
+sleep overshoot of the operating system and the network latency to the
+moment the mainframe acts. The scheduler instead estimates the one-way
+latency as half the median round trip of idle GetCurrentAccess probes,
+encodes the command frame ahead of time and keeps the socket warm by
+probing until shortly before the send time. It then sleeps until just
+before the send time, spins on the high-resolution clock for the rest
+and writes the frame at the target time minus the latency.
+
+    scheduler = CommandScheduler(con_handle)
+    result = scheduler.run("StartRecording", time.time() + 5.0)
+    print(result.status, result.arrival_error)
+"""
+
+import collections
+import socket
+import statistics
+import time
+from typing import Callable
+
+from .connection import ConnectionHandler
+from .ghsapi_results import ScheduledCommand
+from .ghsapi_states import (
+    CONTROL_METHODS,
+    RETURN_KEY,
+    GHSReturnValue,
+    to_string,
+)
+from .scheduling import NORMAL
+
+PROBE_METHOD = "GetCurrentAccess"
+DEFAULT_PROBE_INTERVAL = 0.2
+# Round trips kept for the latency estimate
+DEFAULT_SAMPLES = 32
+# Round trips measured before the first estimate
+MIN_SAMPLES = 5
+# Probing stops this many round trips, at least MIN_PROBE_GUARD
+# seconds, before the send time so no probe delays the command
+PROBE_GUARD_RTTS = 4
+MIN_PROBE_GUARD = 0.02
+# Seconds spun instead of slept before the send time, covers the sleep
+# granularity of common platforms
+SPIN_TIME = 0.02
+
+
+def spin_until(
+    deadline: float,
+    clock: Callable[[], float] = time.perf_counter,
+    sleep: Callable[[float], None] = time.sleep,
+) -> float:
+    """Sleep, then busy wait until the clock reaches the deadline.
+
+    Args:
+        deadline: Time of the clock to return at.
+        clock: High-resolution clock.
+        sleep: Sleep function used until SPIN_TIME before the deadline.
+
+    Returns:
+        Clock time at return.
+    """
+
+    remaining = deadline - clock()
+    if remaining > SPIN_TIME:
+        sleep(remaining - SPIN_TIME)
+    now = clock()
+    while now < deadline:
+        now = clock()
+    return now
+
+
+class CommandScheduler:
+    """Sends commands of one connection at a wall-clock time.
+
+    Attributes:
+        con_handle: Connection the commands are sent on.
+        probe_interval: Seconds between latency probes while waiting.
+        failed_probes: Number of probes not answered with OK.
+    """
+
+    def __init__(
+        self,
+        con_handle: ConnectionHandler,
+        probe_interval: float = DEFAULT_PROBE_INTERVAL,
+        samples: int = DEFAULT_SAMPLES,
+        wall_clock: Callable[[], float] = time.time,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.con_handle = con_handle
+        self.probe_interval = probe_interval
+        self.failed_probes = 0
+        self._rtts = collections.deque(maxlen=samples)
+        self._wall_clock = wall_clock
+        self._clock = clock
+        self._sleep = sleep
+        try:
+            con_handle.sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+            )
+        except (AttributeError, OSError):
+            # Not a TCP socket, small frames are not delayed
+            pass
+
+    def probe(self) -> str:
+        """Measure one round trip with an idle request.
+
+        Returns:
+            String value representing the probe status.
+        """
+
+        sent_at, response_json = self.con_handle.send_prepared_request(
+            self.con_handle.prepare_request(PROBE_METHOD, None),
+            priority=NORMAL,
+            clock=self._clock,
+        )
+        rtt = self._clock() - sent_at
+        if response_json[RETURN_KEY] != GHSReturnValue["OK"]:
+            self.failed_probes += 1
+        else:
+            self._rtts.append(rtt)
+        return to_string(response_json[RETURN_KEY], GHSReturnValue)
+
+    def latency(self) -> float | None:
+        """Estimated one-way latency in seconds, None before probing."""
+
+        if not self._rtts:
+            return None
+        return statistics.median(self._rtts) / 2.0
+
+    def _probe_guard(self, latency: float) -> float:
+        return max(PROBE_GUARD_RTTS * 2.0 * latency, MIN_PROBE_GUARD)
+
+    def run(
+        self,
+        method_name: str,
+        at: float,
+        method_param: dict | None = None,
+    ) -> ScheduledCommand:
+        """Send a command so that it arrives at a wall-clock time.
+
+        Probes every probe_interval seconds until shortly before the
+        send time. A time that has passed sends the command at once.
+
+        Args:
+            method_name: Acquisition control method, e.g.
+            StartRecording or Trigger.
+            at: Wall-clock time as seconds since the epoch.
+            method_param: Method parameters.
+
+        Returns:
+            The status of the command and the achieved timing.
+        """
+
+        if method_name not in CONTROL_METHODS:
+            return ScheduledCommand("NOK")
+
+        prepared = self.con_handle.prepare_request(method_name, method_param)
+        while len(self._rtts) < MIN_SAMPLES:
+            return_var = self.probe()
+            if return_var != "OK":
+                return ScheduledCommand(return_var)
+
+        while True:
+            latency = self.latency()
+            send_at = at - self._wall_clock() + self._clock() - latency
+            remaining = send_at - self._clock() - self._probe_guard(latency)
+            if remaining <= 0:
+                break
+            self._sleep(min(self.probe_interval, remaining))
+            if self._clock() < send_at - self._probe_guard(latency):
+                self.probe()
+
+        sent_at, response_json = self.con_handle.send_prepared_request(
+            prepared,
+            lambda: spin_until(send_at, self._clock, self._sleep),
+            clock=self._clock,
+        )
+        # The command itself arrived after half its own round trip
+        arrival_error = (sent_at + self._clock()) / 2.0 - send_at - latency
+        return ScheduledCommand(
+            to_string(response_json[RETURN_KEY], GHSReturnValue),
+            at,
+            at + arrival_error,
+            latency,
+            sent_at - send_at,
+            arrival_error,
+        )
+
+
+def schedule_command(
+    con_handle: ConnectionHandler,
+    method_name: str,
+    at: float,
+    method_param: dict | None = None,
+) -> ScheduledCommand:
+    """Send an acquisition control command at a wall-clock time.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        method_name: Acquisition control method name.
+        at: Wall-clock time as seconds since the epoch.
+        method_param: Method parameters.
+
+    Returns:
+        The status of the command and the achieved timing.
+    """
+
+    return CommandScheduler(con_handle).run(method_name, at, method_param)
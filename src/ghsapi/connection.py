@@ -25,13 +25,57 @@
 """Implementaion of Connection module."""
 
 import errno
+import json
 import socket
-from struct import pack, unpack
+import threading
+import time
+from collections import deque
+from typing import Callable, NamedTuple
 
 from . import json_rpc
-from .ghsapi_states import RETURN_KEY, GHSReturnValue
+from .framing import API_VERSION_HEADER, FrameDecoder, encode_frame
+from .ghsapi_states import (
+    CONTROL_METHODS,
+    READ_ONLY_METHODS,
+    RETURN_KEY,
+    SETTINGS_PRESERVING_METHODS,
+    STAGEABLE_METHODS,
+    TARGET_PARAMS,
+    WRITE_ACCESS_FREE_METHODS,
+    GHSReturnValue,
+)
+from .scheduling import (
+    BULK,
+    CONTROL,
+    NORMAL,
+    PRIORITY_CLASSES,
+    LatencyStats,
+    PriorityLock,
+)
 
 MAX_CONNECTIONS = 30
+RECV_BUFFER_SIZE = 65536
+MAX_RECV_SIZE = 1048576
+PIPELINE_WINDOW = 32
+
+
+class _Flight:
+    """A read-only request in flight, shared by identical calls."""
+
+    __slots__ = ("done", "response")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response = {RETURN_KEY: GHSReturnValue["NOK"]}
+
+
+class PreparedRequest(NamedTuple):
+    """Request encoded ahead of sending."""
+
+    method_name: str
+    request_id: int
+    request_json: bytes
+    frame: bytes
 
 
 class ConnectionHandler:
@@ -45,15 +89,71 @@ class ConnectionHandler:
         request_id: Client request id
         sock: Socket object
         ip_address: Mainframe ip address
+        port_num: Mainframe port number, 0 for a session proxy
+        settings_digest: Content hash of the current mainframe settings
+        as last seen or applied by this connection, None when unknown.
+        Cleared by every request that may change settings.
+        persisted_settings_digest: Content hash of the persisted
+        mainframe settings, None when unknown.
+        staged_calls: Number of setter calls staged since staging
+        began.
+        write_gate: Optional callable receiving the name of a method
+        that needs write access before it is sent. It may block, and
+        returns a response dict to answer the request without sending
+        it, or None to send it. It is called without holding the
+        connection, so other threads can use the connection meanwhile.
+        response_observers: Callables receiving the method name and the
+        response of every request.
+        capture: Optional wire capture receiving the payload of every
+        request frame written and response frame read, see
+        wire_capture.WireCapture.
+        limiter: Optional flow control limiting the requests in flight
+        and the request rate, see flow_control.AIMDLimiter. It learns
+        from the latency and status of every response.
+        latency_stats: LatencyStats per priority class name, of single
+        requests and of whole pipelined batches.
+        single_flight: Share one request between concurrent identical
+        read-only requests, True by default.
+        deduplicated_calls: Number of requests answered by sharing.
+        hedge: Optional hedging of read-only requests on spare
+        connections, see hedging.Hedger.
+        breaker: Optional circuit breaker failing requests at once
+        while the mainframe is unreachable, see
+        circuit_breaker.CircuitBreaker.
     """
 
     connection_count = 0
-    api_version_header = 1195638785
+    api_version_header = API_VERSION_HEADER
 
     def __init__(self):
         self.request_id = 0
+        # Request ids are also reserved without holding the connection
+        self._request_id_lock = threading.Lock()
         self.sock = 0
         self.ip_address = 0
+        self.port_num = 0
+        self.settings_digest = None
+        self.persisted_settings_digest = None
+        self._decoder = FrameDecoder(self.api_version_header)
+        self._received_frames = deque()
+        self._staged = None
+        self._staging_lock = threading.Lock()
+        self._flushed = []
+        self.staged_calls = 0
+        self._lock = PriorityLock()
+        self.write_gate = None
+        self.response_observers = []
+        self.capture = None
+        self.limiter = None
+        self.latency_stats = {
+            name: LatencyStats() for name in PRIORITY_CLASSES
+        }
+        self.single_flight = True
+        self.deduplicated_calls = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self.hedge = None
+        self.breaker = None
 
     def get_num_of_connections(self) -> int:
         """Get count of all connections."""
@@ -65,12 +165,16 @@ class ConnectionHandler:
 
         return self.ip_address
 
-    def connection_establish(self, ip_address: int, port_num: int) -> int:
+    def connection_establish(
+        self, ip_address: int, port_num: int, timeout: float | None = None
+    ) -> int:
         """Establishes connection to the mainframe.
 
         Args:
             ip_address: IP address of the mainframe.
             port_num: Mainframe port number.
+            timeout: Optional timeout in seconds for connecting and for
+            every socket operation on the connection.
 
         Returns:
             Integer value representing connection status code.
@@ -89,26 +193,94 @@ class ConnectionHandler:
             return GHSReturnValue["NOK"]
 
         try:
+            self.sock.settimeout(timeout)
             self.sock.connect((ip_address, port_num))
         except socket.gaierror:
             return GHSReturnValue["ConnectionFailed"]
+        except socket.timeout:
+            return GHSReturnValue["MainframeTimeout"]
         except socket.error:
             return GHSReturnValue["NoConnection"]
         except RuntimeError:
             return GHSReturnValue["NOK"]
 
         self.ip_address = ip_address
-        self.connection_count += 1
+        self.port_num = port_num
+        self._reset_session()
         return GHSReturnValue["OK"]
 
+    def connection_establish_unix(
+        self, socket_path: str, timeout: float | None = None
+    ) -> int:
+        """Establishes connection to a session proxy on a Unix socket.
+
+        The proxy speaks the mainframe protocol on behalf of a mainframe
+        it keeps connected.
+
+        Args:
+            socket_path: Path of the proxy's Unix socket.
+            timeout: Optional timeout in seconds for connecting and for
+            every socket operation on the connection.
+
+        Returns:
+            Integer value representing connection status code.
+        """
+
+        if not socket_path:
+            return GHSReturnValue["NullPtrArgument"]
+        if not hasattr(socket, "AF_UNIX"):
+            return GHSReturnValue["ConnectionFailed"]
+
+        try:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path)
+        except socket.timeout:
+            return GHSReturnValue["MainframeTimeout"]
+        except (FileNotFoundError, ConnectionRefusedError):
+            return GHSReturnValue["ConnectionFailed"]
+        except socket.error:
+            return GHSReturnValue["NoConnection"]
+
+        self.ip_address = socket_path
+        self._reset_session()
+        return GHSReturnValue["OK"]
+
+    def connection_close(self) -> None:
+        """Close the socket, the connection can be established again."""
+
+        try:
+            self.sock.close()
+        except (AttributeError, OSError):
+            pass
+        self.sock = 0
+
+    def _reset_session(self) -> None:
+        """Forget the state of an earlier connection."""
+
+        self.connection_count += 1
+        self.settings_digest = None
+        self.persisted_settings_digest = None
+        self._decoder.reset()
+        self._received_frames.clear()
+
     def send_request_wait_response(
-        self, method_name: str, method_param: dict | None
+        self,
+        method_name: str,
+        method_param: dict | None,
+        progress: Callable[[int, int], None] | None = None,
+        priority: int | None = None,
     ) -> dict:
         """Sends request to the mainframe.
 
         Args:
             method_name: Request method name .
             method_param: Request method parameter.
+            progress: Optional callback receiving transferred and total
+            bytes, first while sending the request and then while
+            receiving the response.
+            priority: Priority class value, CONTROL for acquisition
+            control methods and NORMAL for others if None.
 
         Returns:
             Dict representing response from the mainframe.
@@ -117,38 +289,665 @@ class ConnectionHandler:
         if not method_name:
             return {RETURN_KEY: GHSReturnValue["NullPtrArgument"]}
 
-        self.request_id += 1
+        if self._staged is not None:
+            if method_name in STAGEABLE_METHODS and self._stage(
+                [(method_name, method_param)]
+            ):
+                return {RETURN_KEY: GHSReturnValue["OK"]}
+            self._flush_staged()
+
+        error_json = self._check_write_gate([method_name])
+        if error_json:
+            return error_json
+
+        if priority is None:
+            priority = CONTROL if method_name in CONTROL_METHODS else NORMAL
+        error_json = self._check_breaker(priority)
+        if error_json:
+            return error_json
+        if progress is None and method_name in READ_ONLY_METHODS:
+            if self.single_flight:
+                return self._single_flight(
+                    method_name, method_param, priority
+                )
+            response_json = self._read(method_name, method_param, priority)
+        else:
+            response_json = self._exchange(
+                method_name, method_param, progress, priority
+            )
+        self._notify_observers(method_name, response_json)
+        return response_json
+
+    def send_request_direct(
+        self,
+        method_name: str,
+        method_param: dict | None,
+        priority: int = NORMAL,
+        notify: bool = False,
+    ) -> dict:
+        """Send one request on this connection and read its response.
+
+        The request bypasses staging, the write gate, the circuit
+        breaker, single-flight and hedging. Staged calls are not sent
+        first.
+
+        Args:
+            method_name: Request method name.
+            method_param: Request method parameter.
+            priority: Priority class value.
+            notify: Pass the response to the response observers.
+
+        Returns:
+            Dict representing response from the mainframe.
+        """
+
+        response_json = self._exchange(
+            method_name, method_param, None, priority
+        )
+        if notify:
+            self._notify_observers(method_name, response_json)
+        return response_json
+
+    def _read(
+        self, method_name: str, method_param: dict | None, priority: int
+    ) -> dict:
+        """Send a read-only request, hedged when hedging is enabled."""
+
+        hedge = self.hedge
+        if hedge is not None:
+            return hedge.request(self, method_name, method_param, priority)
+        return self._exchange(method_name, method_param, None, priority)
+
+    def _single_flight(
+        self, method_name: str, method_param: dict | None, priority: int
+    ) -> dict:
+        """Send a read-only request unless the same one is in flight.
+
+        Calls made while an identical request waits for the connection
+        or for its response receive a copy of that response.
+        """
+
+        key = (method_name, json.dumps(method_param, sort_keys=True))
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.deduplicated_calls += 1
+        if not leader:
+            flight.done.wait()
+            return dict(flight.response)
+
+        try:
+            flight.response = self._read(method_name, method_param, priority)
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+        self._notify_observers(method_name, flight.response)
+        return flight.response
+
+    def _exchange(
+        self,
+        method_name: str,
+        method_param: dict | None,
+        progress: Callable[[int, int], None] | None,
+        priority: int,
+    ) -> dict:
+        """Send a request and read its response holding the connection."""
+
+        started_at = time.perf_counter()
+        self._lock.acquire(priority)
+        try:
+            limiter = self.limiter
+            if limiter is not None:
+                limiter.before_send()
+            sent_at = time.perf_counter()
+            request_id, response_json = self._send_request(
+                method_name, method_param, progress
+            )
+            if response_json is None:
+                response_json = self._receive_response(request_id, progress)
+            if limiter is not None:
+                limiter.on_response(
+                    time.perf_counter() - sent_at, response_json
+                )
+        finally:
+            self._lock.release()
+        self._record_latency(priority, started_at)
+        return response_json
+
+    def send_requests_pipelined(
+        self,
+        requests: list[tuple[str, dict | None]],
+        window: int = PIPELINE_WINDOW,
+        priority: int | None = None,
+    ) -> list[dict]:
+        """Sends several requests without waiting for each response.
+
+        Up to window requests are in flight at once, a next request is
+        sent as soon as a response arrives. Responses are returned in
+        request order. When the connection fails, the remaining
+        requests get the failure status. More urgent requests of other
+        threads are sent between the requests of the batch.
+
+        Args:
+            requests: List of method name and method parameter tuples.
+            window: Maximum number of requests in flight.
+            priority: Priority class value, CONTROL when all methods
+            are acquisition control methods and BULK otherwise if None.
+
+        Returns:
+            List of dicts representing the responses.
+        """
+
+        if self._staged is not None:
+            if all(
+                request[0] in STAGEABLE_METHODS for request in requests
+            ) and self._stage(requests):
+                return [{RETURN_KEY: GHSReturnValue["OK"]} for _ in requests]
+            self._flush_staged()
+        return self._send_pipelined(requests, window, priority)
+
+    def _send_pipelined(
+        self,
+        requests: list[tuple[str, dict | None]],
+        window: int = PIPELINE_WINDOW,
+        priority: int | None = None,
+    ) -> list[dict]:
+        """Send requests pipelined, bypassing staging."""
+
+        error_json = self._check_write_gate(
+            [method_name for method_name, _ in requests]
+        )
+        if error_json:
+            return [dict(error_json) for _ in requests]
+
+        if priority is None:
+            priority = (
+                CONTROL
+                if all(request[0] in CONTROL_METHODS for request in requests)
+                else BULK
+            )
+        error_json = self._check_breaker(priority)
+        if error_json:
+            return [dict(error_json) for _ in requests]
+        started_at = time.perf_counter()
+        self._lock.acquire(priority)
+        try:
+            responses = self._exchange_pipelined(requests, window, priority)
+        finally:
+            self._lock.release()
+        self._record_latency(priority, started_at)
+        for (method_name, _), response_json in zip(requests, responses):
+            self._notify_observers(method_name, response_json)
+        return responses
+
+    def _exchange_pipelined(
+        self,
+        requests: list[tuple[str, dict | None]],
+        window: int,
+        priority: int = BULK,
+    ) -> list[dict]:
+        """Send requests with a sliding window and read the responses.
+
+        While a more urgent request waits, no further request is sent.
+        Once the responses in flight are read, the connection is handed
+        to the waiting request and taken back afterwards.
+        """
+
+        responses = []
+        request_ids = []
+        sent_at = []
+        window = max(1, window)
+        limiter = self.limiter
+        aborting = (
+            GHSReturnValue["NoConnection"],
+            GHSReturnValue["MainframeTimeout"],
+        )
+
+        while len(responses) < len(requests):
+            if len(request_ids) == len(responses):
+                self._lock.yield_to_urgent(priority)
+            in_flight = window
+            if limiter is not None:
+                in_flight = max(1, min(window, limiter.limit))
+            if len(request_ids) > len(responses) and (
+                self._lock.urgent_waiting(priority)
+            ):
+                in_flight = 0
+            while (
+                len(request_ids) < len(requests)
+                and len(request_ids) - len(responses) < in_flight
+            ):
+                method_name, method_param = requests[len(request_ids)]
+                if not method_name:
+                    request_ids.append(None)
+                    sent_at.append(None)
+                    continue
+                if limiter is not None:
+                    limiter.before_send()
+                sent_at.append(time.perf_counter())
+                request_id, error_json = self._send_request(
+                    method_name, method_param
+                )
+                if error_json:
+                    if len(request_ids) > len(responses):
+                        # Responses in flight would be read by later calls
+                        self.connection_close()
+                    return self._complete_responses(
+                        responses, len(requests), error_json
+                    )
+                request_ids.append(request_id)
+
+            request_id = request_ids[len(responses)]
+            if request_id is None:
+                responses.append(
+                    {RETURN_KEY: GHSReturnValue["NullPtrArgument"]}
+                )
+                continue
+            response_json = self._receive_response(request_id)
+            if limiter is not None:
+                limiter.on_response(
+                    time.perf_counter() - sent_at[len(responses)],
+                    response_json,
+                )
+            if response_json[RETURN_KEY] in aborting:
+                if len(request_ids) > len(responses) + 1:
+                    # Responses in flight would be read by later calls
+                    self.connection_close()
+                return self._complete_responses(
+                    responses, len(requests), response_json
+                )
+            responses.append(response_json)
+        return responses
+
+    @property
+    def staging(self) -> bool:
+        """True while setter calls are staged instead of sent."""
+
+        return self._staged is not None
+
+    @property
+    def flushed_calls(self) -> int:
+        """Number of staged calls already sent since staging began."""
+
+        return len(self._flushed)
+
+    def begin_staging(self) -> None:
+        """Stage setter calls until commit_staging.
+
+        Staged calls are answered with OK right away. A later call to
+        the same setter for the same target (slot, channel, channel type
+        or data source) supersedes the earlier one. Any other request
+        first sends the staged calls, so reads see the staged values and
+        commands run after the setters that preceded them.
+        """
+
+        with self._staging_lock:
+            if self._staged is None:
+                self._staged = {}
+                self._flushed = []
+                self.staged_calls = 0
+
+    def commit_staging(self) -> list[tuple[str, dict | None, dict]]:
+        """Send the staged calls and stop staging.
+
+        Returns:
+            List of method name, method parameter and response tuples of
+            all calls sent since staging began.
+        """
+
+        if self._staged is None:
+            return []
+        self._flush_staged(stop=True)
+        with self._staging_lock:
+            flushed, self._flushed = self._flushed, []
+        return flushed
+
+    def discard_staging(self) -> int:
+        """Drop the staged calls and stop staging.
+
+        Calls already sent because of an intermediate request are not
+        undone.
+
+        Returns:
+            Number of dropped calls.
+        """
+
+        with self._staging_lock:
+            dropped = len(self._staged or {})
+            self._staged = None
+            self._flushed = []
+        return dropped
+
+    def _stage(self, requests: list[tuple[str, dict | None]]) -> bool:
+        """Stage setter calls, replacing calls to the same target.
+
+        Returns:
+            False when staging ended in the meantime, nothing staged.
+        """
+
+        with self._staging_lock:
+            if self._staged is None:
+                return False
+            # The mainframe settings will differ from the cached digest
+            self.settings_digest = None
+            for method_name, method_param in requests:
+                key = (method_name,) + tuple(
+                    (method_param or {}).get(name) for name in TARGET_PARAMS
+                )
+                # Moved to the end, applied after the calls staged since.
+                self._staged.pop(key, None)
+                self._staged[key] = (method_name, method_param)
+            self.staged_calls += len(requests)
+        return True
+
+    def _flush_staged(self, stop: bool = False) -> None:
+        """Send the staged calls pipelined.
+
+        Args:
+            stop: End staging, else staging stays active.
+        """
+
+        with self._staging_lock:
+            if self._staged is None:
+                return
+            requests = list(self._staged.values())
+            if stop:
+                self._staged = None
+            else:
+                self._staged.clear()
+        if not requests:
+            return
+        responses = self._send_pipelined(requests)
+        with self._staging_lock:
+            self._flushed.extend(
+                (method_name, method_param, response_json)
+                for (method_name, method_param), response_json in zip(
+                    requests, responses
+                )
+            )
+
+    def _record_latency(self, priority: int, started_at: float) -> None:
+        """Add the latency of a call to the stats of its class."""
+
+        for name, value in PRIORITY_CLASSES.items():
+            if value == priority:
+                self.latency_stats[name].add(time.perf_counter() - started_at)
+                return
+
+    def _check_write_gate(self, method_names: list[str]) -> dict | None:
+        """Ask the write gate whether requests may be sent.
+
+        Returns:
+            A response dict for requests that must not be sent, else
+            None.
+        """
+
+        if self.write_gate is None:
+            return None
+        for method_name in method_names:
+            if method_name and method_name not in WRITE_ACCESS_FREE_METHODS:
+                return self.write_gate(method_name)
+        return None
+
+    def _check_breaker(self, priority: int) -> dict | None:
+        """Error response while the circuit breaker is open, else None.
+
+        The caller admitted when the breaker turns half open probes the
+        mainframe with GetCurrentAccess first.
+        """
+
+        breaker = self.breaker
+        if breaker is None:
+            return None
+        state = breaker.allow()
+        if state == "closed":
+            return None
+        if state == "half_open":
+            probe_json = self._exchange(
+                "GetCurrentAccess", None, None, priority
+            )
+            breaker.record(probe_json[RETURN_KEY])
+            if breaker.state != "open":
+                return None
+            return probe_json
+        return {RETURN_KEY: GHSReturnValue["NoConnection"]}
+
+    def _notify_observers(self, method_name: str, response_json: dict):
+        """Pass a response to the response observers."""
+
+        for observer in self.response_observers:
+            observer(method_name, response_json)
+
+    @staticmethod
+    def _complete_responses(
+        responses: list[dict], count: int, error_json: dict
+    ) -> list[dict]:
+        """Fill the responses of unanswered requests with an error."""
+
+        return responses + [
+            {RETURN_KEY: error_json[RETURN_KEY]}
+            for _ in range(count - len(responses))
+        ]
+
+    def _send_request(
+        self,
+        method_name: str,
+        method_param: dict | None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> tuple[int, dict | None]:
+        """Write one request frame.
+
+        Returns:
+            Tuple with the request id and a response dict when the
+            request could not be written.
+        """
+
+        if method_name not in SETTINGS_PRESERVING_METHODS:
+            self.settings_digest = None
+
+        request_id = self._next_request_id()
         request_json = json_rpc.json_rpc_create_request(
-            self.request_id, method_name, method_param
+            request_id, method_name, method_param
         )
-        write_len = len(request_json)
-        header_sx = pack("!I", write_len) + pack("!I", self.api_version_header)
+        frame = encode_frame(request_json, self.api_version_header)
+        return request_id, self._write_frame(request_json, frame, progress)
+
+    def _next_request_id(self) -> int:
+        """Reserve the id of a new request."""
+
+        with self._request_id_lock:
+            self.request_id += 1
+            return self.request_id
+
+    def _write_frame(
+        self,
+        request_json: bytes,
+        frame: bytes,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> dict | None:
+        """Write an encoded request, a response dict when that fails.
+
+        A partly written frame breaks the framing of the stream, the
+        connection is then closed.
+        """
 
         try:
-            if self.connection_write(header_sx, len(header_sx)) != len(
-                header_sx
+            if self.connection_write(frame, len(frame), progress) != len(
+                frame
             ):
+                self.connection_close()
                 return {RETURN_KEY: GHSReturnValue["NOK"]}
-            if self.connection_write(request_json, write_len) != write_len:
-                return {RETURN_KEY: GHSReturnValue["NOK"]}
+        except socket.timeout:
+            self.connection_close()
+            return {RETURN_KEY: GHSReturnValue["MainframeTimeout"]}
         except OSError:
             return {RETURN_KEY: GHSReturnValue["NoConnection"]}
         except RuntimeError:
+            self.connection_close()
             return {RETURN_KEY: GHSReturnValue["NOK"]}
         except Exception:
             return {RETURN_KEY: GHSReturnValue["NoConnection"]}
+        if self.capture is not None:
+            self.capture.sent(request_json)
+        return None
 
-        header_rx_size = 8
-        header_rx = self.connection_read(header_rx_size)
-        if header_rx_size != len(header_rx):
-            return {RETURN_KEY: GHSReturnValue["NOK"]}
+    def prepare_request(
+        self, method_name: str, method_param: dict | None
+    ) -> PreparedRequest:
+        """Encode a request to send later with send_prepared_request.
+
+        Args:
+            method_name: Request method name.
+            method_param: Request method parameter.
+
+        Returns:
+            The prepared request with its reserved request id.
+        """
+
+        request_id = self._next_request_id()
+        request_json = json_rpc.json_rpc_create_request(
+            request_id, method_name, method_param
+        )
+        return PreparedRequest(
+            method_name,
+            request_id,
+            request_json,
+            encode_frame(request_json, self.api_version_header),
+        )
+
+    def send_prepared_request(
+        self,
+        prepared: PreparedRequest,
+        before_send: Callable[[], None] | None = None,
+        priority: int = CONTROL,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> tuple[float, dict]:
+        """Send a prepared request and read its response.
+
+        Staged writes are sent first. The connection is held from
+        before before_send is called until the response is read, so no
+        other request is written between the wait of before_send and
+        the prepared frame.
+
+        Args:
+            prepared: Request returned by prepare_request.
+            before_send: Optional callable returning when the frame is
+            to be written.
+            priority: Priority class value.
+            clock: Clock the returned send time is read from.
+
+        Returns:
+            Tuple with the clock time the frame was written and the
+            dict representing the response.
+        """
+
+        if self._staged is not None:
+            self._flush_staged()
+
+        error_json = self._check_write_gate([prepared.method_name])
+        if error_json:
+            return clock(), error_json
+        error_json = self._check_breaker(priority)
+        if error_json:
+            return clock(), error_json
+        if prepared.method_name not in SETTINGS_PRESERVING_METHODS:
+            self.settings_digest = None
 
-        header_rx_packet_header = unpack(">II", header_rx)
-        if header_rx_packet_header[1] != self.api_version_header:
+        self._lock.acquire(priority)
+        try:
+            if before_send is not None:
+                before_send()
+            started_at = time.perf_counter()
+            sent_at = clock()
+            response_json = self._write_frame(
+                prepared.request_json, prepared.frame
+            )
+            if response_json is None:
+                response_json = self._receive_response(prepared.request_id)
+        finally:
+            self._lock.release()
+        self._record_latency(priority, started_at)
+        self._notify_observers(prepared.method_name, response_json)
+        return sent_at, response_json
+
+    def _receive_response(
+        self,
+        request_id: int,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> dict:
+        """Read and parse the response to a request.
+
+        On a timeout or an invalid frame the connection is closed: the
+        late response or the rest of the stream would otherwise be read
+        as the response to the next request.
+        """
+
+        try:
+            response_json = self.read_frame(progress)
+        except ValueError:
+            self.connection_close()
             return {RETURN_KEY: GHSReturnValue["NOK"]}
+        except socket.timeout:
+            self.connection_close()
+            return {RETURN_KEY: GHSReturnValue["MainframeTimeout"]}
+        except OSError:
+            return {RETURN_KEY: GHSReturnValue["NoConnection"]}
+        if response_json is None:
+            # Closed by the mainframe, later responses will not arrive.
+            return {RETURN_KEY: GHSReturnValue["NoConnection"]}
+        if self.capture is not None:
+            self.capture.received(response_json)
+        return json_rpc.json_rpc_parse_response(request_id, response_json)
+
+    def read_frame(
+        self, progress: Callable[[int, int], None] | None = None
+    ) -> bytes | None:
+        """Read the payload of the next frame.
+
+        Frames that arrived together with an earlier one are returned
+        first, without touching the socket.
 
-        response_json = self.connection_read(header_rx_packet_header[0])
-        return json_rpc.json_rpc_parse_response(self.request_id, response_json)
+        Args:
+            progress: Optional callback receiving received and total
+            payload bytes. The total is known from the frame header,
+            before the payload is parsed.
+
+        Returns:
+            Bytes of the payload without trailing NUL, or None when the
+            connection was closed by the mainframe.
+
+        Raises:
+            OSError: When socket not connected
+            ValueError: When the frame has an invalid API version header
+        """
+
+        total_size = None
+        while not self._received_frames:
+            recv_size = min(
+                max(self._decoder.bytes_needed(), RECV_BUFFER_SIZE),
+                MAX_RECV_SIZE,
+            )
+            try:
+                packet = self.sock.recv(recv_size)
+            except AttributeError as no_socket:
+                raise OSError("Socket not Connected") from no_socket
+            if not packet:
+                return None
+            self._received_frames.extend(self._decoder.feed(packet))
+            if progress and not self._received_frames:
+                frame_progress = self._decoder.frame_progress()
+                if frame_progress:
+                    total_size = frame_progress[1]
+                    progress(*frame_progress)
+        payload = self._received_frames.popleft()
+        if progress:
+            total_size = total_size or len(payload)
+            progress(total_size, total_size)
+        return payload
 
     def connection_read(self, length: int) -> bytes:
         """Read message in bytes.
@@ -180,12 +979,19 @@ class ConnectionHandler:
                 # return None
         return message
 
-    def connection_write(self, message: bytes, length: int) -> int:
+    def connection_write(
+        self,
+        message: bytes,
+        length: int,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> int:
         """Writes message in bytes.
 
         Args:
             message: Message to write.
             length: Message length.
+            progress: Optional callback receiving written and total
+            bytes.
 
         Returns:
             Integer representing bytes written.
@@ -197,21 +1003,26 @@ class ConnectionHandler:
 
         written_bytes = 0
         sent_bytes = 0
+        message_view = memoryview(message)
 
         while written_bytes < length:
             try:
-                sent_bytes = self.sock.send(message[written_bytes:])
+                sent_bytes = self.sock.send(message_view[written_bytes:])
             except AttributeError as no_socket:
                 raise OSError("Socket not Connected") from no_socket
             except socket.gaierror as no_socket:
                 raise OSError("Socket not Connected") from no_socket
             except RuntimeError as un_specific_error:
                 raise RuntimeError from un_specific_error
+            except socket.timeout:
+                raise
             except Exception as any_exception:
                 raise Exception from any_exception
             if sent_bytes == 0:
                 raise RuntimeError("Socket Connection Broken")
             written_bytes = written_bytes + sent_bytes
             sent_bytes = 0
+            if progress:
+                progress(written_bytes, length)
 
         return written_bytes
@@ -36,6 +36,7 @@ def connect(
     ip_address: int,
     port_num: int,
     client_api_version: int,
+    timeout: float | None = None,
 ) -> str:
     """Interface to connect to the mainframe.
 
@@ -44,6 +45,7 @@ def connect(
         ip_address: Mainframe ip address.
         port_num: Mainframe port number.
         client_api_version: Client supported API version.
+        timeout: Optional socket timeout in seconds.
 
     Returns:
         String value representing connect request status.
@@ -57,7 +59,9 @@ def connect(
     ):
         return "NullPtrArgument"
 
-    return_var = con_handle.connection_establish(ip_address, port_num)
+    return_var = con_handle.connection_establish(
+        ip_address, port_num, timeout
+    )
     if return_var != GHSReturnValue["OK"]:
         return to_string(return_var, GHSReturnValue)
 
@@ -79,6 +83,38 @@ def connect(
     return to_string(response_json[RETURN_KEY], GHSReturnValue)
 
 
+def connect_proxy(
+    con_handle: ConnectionHandler,
+    socket_path: str,
+    client_api_version: int,
+    timeout: float | None = None,
+) -> str:
+    """Interface to connect to a mainframe through a session proxy.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        socket_path: Path of the proxy's Unix socket.
+        client_api_version: Client supported API version.
+        timeout: Optional socket timeout in seconds.
+
+    Returns:
+        String value representing connect request status.
+    """
+
+    if not con_handle or not socket_path or not client_api_version:
+        return "NullPtrArgument"
+
+    return_var = con_handle.connection_establish_unix(socket_path, timeout)
+    if return_var != GHSReturnValue["OK"]:
+        return to_string(return_var, GHSReturnValue)
+
+    connect_param_dict = {"ClientAPIVersion": client_api_version}
+    response_json = con_handle.send_request_wait_response(
+        "Connect", connect_param_dict
+    )
+    return to_string(response_json[RETURN_KEY], GHSReturnValue)
+
+
 def get_current_access(con_handle: ConnectionHandler) -> str:
     """Interface to get current access permission.
 
@@ -0,0 +1,295 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Forecast of the time until the mainframe disk is full.
+
+Usage::
+
+    forecast = gen.ghs_disk_forecast(reserve=2.0)
+    status, seconds = forecast.recording_time()
+    gen.ghs_start_recording()
+    while True:
+        status, seconds = forecast.time_to_full()
+        ...
+
+The write rate is estimated from the recording setup: the sample rate
+of every enabled recorder, the type of every channel with storage
+enabled and the high and low rate storage flags. The setup is read with
+the pipelined recorder and channel tables. While recording, a few
+DiskSpace samples measure the actual rate. The ratio between measured
+and estimated rate is kept, so later forecasts of the same setup are
+calibrated before the first sample. Between samples the available space
+is extrapolated, DiskSpace is only polled again when the last sample is
+older than the repoll interval or half the forecast time to full.
+"""
+
+import collections
+import time
+from typing import Callable
+
+from .channel_table import (
+    ChannelTable,
+    RecorderTable,
+    get_channel_table,
+    get_recorder_table,
+)
+from .connection import ConnectionHandler
+from .mainframe_api import get_disk_space
+
+# Assumed bytes stored per sample of a channel type, the calibration
+# against DiskSpace samples corrects for the actual file format.
+BYTES_PER_SAMPLE = {"Analog": 2.0, "Event": 0.125, "TimerCounter": 4.0}
+# Assumed low rate data size relative to the high rate data
+LOW_RATE_FRACTION = 0.001
+BYTES_PER_GB = 1e9
+# Longest time in seconds between DiskSpace polls while forecasting
+DEFAULT_REPOLL_INTERVAL = 60.0
+# DiskSpace samples used to measure the write rate
+DEFAULT_SAMPLES = 3
+
+
+def estimate_write_rate(
+    recorders: RecorderTable, channels: ChannelTable
+) -> float:
+    """Estimate the disk write rate of a recording setup.
+
+    Args:
+        recorders: Recorder table with sample rates and storage flags.
+        channels: Channel table with channel types and storage enabled
+        states.
+
+    Returns:
+        Estimated write rate in GB per second.
+    """
+
+    sample_bytes = collections.Counter()
+    for row in channels.rows():
+        if row["storage_enabled"] != "Disable":
+            sample_bytes[row["slot_id"]] += BYTES_PER_SAMPLE.get(
+                row["channel_type"], 0.0
+            )
+
+    rate = 0.0
+    for row in recorders.rows():
+        if row["recorder_enabled"] == "Disable" or not row["sample_rate"]:
+            continue
+        fraction = 0.0
+        if row["high_rate_storage"] != "Disable":
+            fraction += 1.0
+        if row["low_rate_storage"] != "Disable":
+            fraction += LOW_RATE_FRACTION
+        rate += row["sample_rate"] * sample_bytes[row["slot_id"]] * fraction
+    return rate / BYTES_PER_GB
+
+
+class DiskForecast:
+    """Time to full forecast of the mainframe disk.
+
+    Attributes:
+        reserve: Disk space in GB counted as full.
+        repoll_interval: Longest time in seconds between DiskSpace
+        polls.
+        estimated_rate: Write rate in GB per second estimated from the
+        setup, None before estimate().
+        scale: Measured divided by estimated write rate.
+    """
+
+    def __init__(
+        self,
+        con_handle: ConnectionHandler,
+        reserve: float = 0.0,
+        repoll_interval: float = DEFAULT_REPOLL_INTERVAL,
+        samples: int = DEFAULT_SAMPLES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._con_handle = con_handle
+        self.reserve = reserve
+        self.repoll_interval = repoll_interval
+        self.estimated_rate = None
+        self.scale = 1.0
+        self._clock = clock
+        self._samples = collections.deque(maxlen=max(samples, 2))
+        self._next_poll = None
+
+    @property
+    def rate(self) -> float | None:
+        """Write rate in GB per second.
+
+        The rate measured from the DiskSpace samples when there are at
+        least two, else the calibrated estimate.
+        """
+
+        measured = self._measured_rate()
+        if measured is not None:
+            return measured
+        if self.estimated_rate is None:
+            return None
+        return self.estimated_rate * self.scale
+
+    def estimate(
+        self,
+        recorders: RecorderTable | None = None,
+        channels: ChannelTable | None = None,
+    ) -> str:
+        """Estimate the write rate from the recording setup.
+
+        Call again after changing sample rates or storage settings.
+
+        Args:
+            recorders: Recorder table read before, read if None.
+            channels: Channel table read before, read if None.
+
+        Returns:
+            String value representing request status.
+        """
+
+        if recorders is None:
+            status, recorders = get_recorder_table(self._con_handle)
+            if status != "OK":
+                return status
+        if channels is None:
+            status, channels = get_channel_table(
+                self._con_handle, recorders=recorders, analog_settings=False
+            )
+            if status != "OK":
+                return status
+        self.estimated_rate = estimate_write_rate(recorders, channels)
+        return "OK"
+
+    def reset(self) -> None:
+        """Forget the DiskSpace samples, e.g. before a new recording.
+
+        The calibration scale is kept.
+        """
+
+        self._samples.clear()
+        self._next_poll = None
+
+    def sample(self) -> str:
+        """Poll DiskSpace and calibrate the estimate with the result.
+
+        Returns:
+            String value representing request status.
+        """
+
+        disk_space = get_disk_space(self._con_handle)
+        if disk_space.status != "OK" or disk_space.available is None:
+            return disk_space.status
+        now = self._clock()
+        self._samples.append((now, disk_space.available))
+
+        measured = self._measured_rate()
+        if measured is not None and self.estimated_rate:
+            self.scale = measured / self.estimated_rate
+
+        interval = self.repoll_interval
+        time_to_full = self._time_to_full(now)
+        if time_to_full is not None:
+            interval = min(interval, time_to_full / 2)
+        self._next_poll = now + interval
+        return "OK"
+
+    def available(self) -> float | None:
+        """Available disk space in GB extrapolated from the last sample."""
+
+        if not self._samples:
+            return None
+        last_time, last_available = self._samples[-1]
+        rate = self.rate or 0.0
+        return last_available - rate * (self._clock() - last_time)
+
+    def time_to_full(self) -> tuple[str, float | None]:
+        """Forecast the time until the disk is full while recording.
+
+        DiskSpace is polled when no sample was taken yet or the next
+        poll is due.
+
+        Returns:
+            Tuple with status and the time in seconds, inf when nothing
+            is written, None while the write rate is not known.
+        """
+
+        if self._next_poll is None or self._clock() >= self._next_poll:
+            status = self.sample()
+            if status != "OK":
+                return status, None
+        return "OK", self._time_to_full(self._clock())
+
+    def recording_time(self) -> tuple[str, float | None]:
+        """Forecast how long the current setup can record.
+
+        The write rate is estimated first when that was not done yet.
+        The available space is read once and not kept as a sample.
+
+        Returns:
+            Tuple with status and the time in seconds, inf when nothing
+            is written.
+        """
+
+        if self.estimated_rate is None:
+            status = self.estimate()
+            if status != "OK":
+                return status, None
+        disk_space = get_disk_space(self._con_handle)
+        if disk_space.status != "OK" or disk_space.available is None:
+            return disk_space.status, None
+        return "OK", _seconds_left(
+            disk_space.available - self.reserve,
+            self.estimated_rate * self.scale,
+        )
+
+    def _measured_rate(self) -> float | None:
+        """Least squares slope of the DiskSpace samples in GB/s."""
+
+        if len(self._samples) < 2:
+            return None
+        count = len(self._samples)
+        mean_time = sum(t for t, _ in self._samples) / count
+        mean_space = sum(space for _, space in self._samples) / count
+        variance = sum((t - mean_time) ** 2 for t, _ in self._samples)
+        if variance == 0:
+            return None
+        covariance = sum(
+            (t - mean_time) * (space - mean_space)
+            for t, space in self._samples
+        )
+        return max(-covariance / variance, 0.0)
+
+    def _time_to_full(self, now: float) -> float | None:
+        """Forecast time to full at now, None without sample or rate."""
+
+        if not self._samples or self.rate is None:
+            return None
+        last_time, last_available = self._samples[-1]
+        return _seconds_left(
+            last_available - self.reserve, self.rate, now - last_time
+        )
+
+
+def _seconds_left(space: float, rate: float, elapsed: float = 0.0) -> float:
+    """Seconds until space GB is written at rate GB/s."""
+
+    if rate <= 0:
+        return float("inf")
+    return max(space / rate - elapsed, 0.0)
@@ -0,0 +1,400 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""TCP proxy injecting network faults between a client and a mainframe.
+
+Usage::
+
+    ghs-fault-proxy 10.0.0.1 --listen 127.0.0.1:8006 --latency 0.04 \
+        --jitter 0.01 --segment-size 64 --reset-probability 0.001
+
+Clients connect to the listen address instead of the mainframe. Every
+chunk of bytes is forwarded after a one-way latency drawn from the
+configured distribution, optionally split into small segments so the
+receiver sees partial frames, paced to a bandwidth limit, stalled, or
+the connection is reset. Chunks keep their order, so latency does not
+limit throughput just like on a long network path. The proxy works on
+the byte stream and so works for any server, e.g. the session proxy or
+ghs-wire-replay.
+"""
+
+import argparse
+import queue
+import random
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from .connection import RECV_BUFFER_SIZE
+from .fleet import parse_address
+
+DEFAULT_LISTEN = "127.0.0.1:8006"
+DISTRIBUTIONS = ("uniform", "normal", "exponential")
+
+
+class FaultProfile(NamedTuple):
+    """Faults injected into one direction of the proxied connections.
+
+    Times are in seconds. jitter is the spread of the latency: half
+    width of the uniform, standard deviation of the normal or mean of
+    the exponential distribution added to latency. Probabilities apply
+    per forwarded chunk. Resets happen at the first chunk past
+    reset_after bytes of a connection.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    distribution: str = "uniform"
+    bandwidth: float | None = None
+    segment_size: int | None = None
+    stall_probability: float = 0.0
+    stall_time: float = 0.0
+    reset_probability: float = 0.0
+    reset_after: int | None = None
+
+
+def sample_latency(profile: FaultProfile, rng: random.Random) -> float:
+    """Draw a one-way latency of a profile, never negative."""
+
+    if not profile.jitter:
+        return max(profile.latency, 0.0)
+    if profile.distribution == "normal":
+        latency = rng.gauss(profile.latency, profile.jitter)
+    elif profile.distribution == "exponential":
+        latency = profile.latency + rng.expovariate(1 / profile.jitter)
+    else:
+        latency = profile.latency + rng.uniform(
+            -profile.jitter, profile.jitter
+        )
+    return max(latency, 0.0)
+
+
+class _ProxiedConnection:
+    """A client connection and its server connection."""
+
+    def __init__(self, client: socket.socket, upstream: socket.socket):
+        self.client = client
+        self.upstream = upstream
+        self.is_reset = False
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Abort both connections with a TCP reset."""
+
+        with self._lock:
+            if self.is_reset:
+                return
+            self.is_reset = True
+            for sock in (self.client, self.upstream):
+                try:
+                    sock.setsockopt(
+                        socket.SOL_SOCKET,
+                        socket.SO_LINGER,
+                        struct.pack("ii", 1, 0),
+                    )
+                    # Wake up the thread reading from the socket
+                    sock.shutdown(socket.SHUT_RD)
+                except OSError:
+                    pass
+                sock.close()
+
+
+def _forward(
+    source: socket.socket,
+    destination: socket.socket,
+    profile: FaultProfile,
+    rng: random.Random,
+    connection: _ProxiedConnection,
+    on_reset: Callable[[], None],
+) -> None:
+    """Forward one direction until it closes or is reset.
+
+    The reading side timestamps the chunks, a writer thread sends each
+    chunk once its latency passed.
+    """
+
+    chunks = queue.Queue()
+    writer = threading.Thread(
+        target=_write,
+        args=(chunks, destination, profile, rng, connection, on_reset),
+        daemon=True,
+    )
+    writer.start()
+    last_due = 0.0
+    try:
+        while True:
+            try:
+                data = source.recv(RECV_BUFFER_SIZE)
+            except OSError:
+                return
+            if not data:
+                return
+            last_due = max(
+                time.perf_counter() + sample_latency(profile, rng), last_due
+            )
+            chunks.put((last_due, data))
+    finally:
+        chunks.put(None)
+        writer.join()
+
+
+def _write(
+    chunks: queue.Queue,
+    destination: socket.socket,
+    profile: FaultProfile,
+    rng: random.Random,
+    connection: _ProxiedConnection,
+    on_reset: Callable[[], None],
+) -> None:
+    forwarded = 0
+    next_send = 0.0
+    while True:
+        item = chunks.get()
+        if item is None:
+            break
+        if connection.is_reset:
+            continue
+        due, data = item
+        if (
+            profile.stall_probability
+            and rng.random() < profile.stall_probability
+        ):
+            due += profile.stall_time
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        forwarded += len(data)
+        if (
+            profile.reset_probability
+            and rng.random() < profile.reset_probability
+        ) or (
+            profile.reset_after is not None and forwarded > profile.reset_after
+        ):
+            on_reset()
+            connection.reset()
+            continue
+
+        segment_size = profile.segment_size or len(data)
+        try:
+            for offset in range(0, len(data), segment_size):
+                segment = data[offset : offset + segment_size]
+                if profile.bandwidth:
+                    next_send = max(next_send, time.perf_counter())
+                    delay = next_send - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_send += len(segment) / profile.bandwidth
+                destination.sendall(segment)
+        except OSError:
+            continue
+    if not connection.is_reset:
+        try:
+            destination.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+class _ProxyHandler(socketserver.BaseRequestHandler):
+    """Proxies one client connection."""
+
+    def handle(self):
+        try:
+            upstream = socket.create_connection(self.server.target)
+        except OSError:
+            return
+        upstream.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = _ProxiedConnection(self.request, upstream)
+        rng = random.Random(self.server.next_seed())
+        self.server.count("connections")
+        downstream = threading.Thread(
+            target=_forward,
+            args=(
+                upstream,
+                self.request,
+                self.server.downstream,
+                random.Random(rng.random()),
+                connection,
+                lambda: self.server.count("resets"),
+            ),
+            daemon=True,
+        )
+        downstream.start()
+        _forward(
+            self.request,
+            upstream,
+            self.server.upstream,
+            rng,
+            connection,
+            lambda: self.server.count("resets"),
+        )
+        downstream.join()
+        if not connection.is_reset:
+            upstream.close()
+
+
+class FaultProxy(socketserver.ThreadingTCPServer):
+    """TCP proxy injecting faults into the connections to a target.
+
+    Attributes:
+        target: Host and port connections are forwarded to.
+        upstream: FaultProfile of the client to server direction.
+        downstream: FaultProfile of the server to client direction.
+        connections: Number of proxied connections.
+        resets: Number of injected resets.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        target: tuple[str, int],
+        upstream: FaultProfile = FaultProfile(),
+        downstream: FaultProfile = FaultProfile(),
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        seed: int | None = None,
+    ) -> None:
+        self.target = target
+        self.upstream = upstream
+        self.downstream = downstream
+        self.connections = 0
+        self.resets = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        super().__init__(address, _ProxyHandler)
+
+    @property
+    def port(self) -> int:
+        """Port the proxy listens on."""
+
+        return self.server_address[1]
+
+    def next_seed(self) -> float:
+        """Seed of the next connection, reproducible with a seed."""
+
+        with self._lock:
+            return self._rng.random()
+
+    def count(self, name: str) -> None:
+        """Increment a counter attribute."""
+
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    parser = argparse.ArgumentParser(
+        prog="ghs-fault-proxy",
+        description="Forward mainframe connections with injected faults.",
+    )
+    parser.add_argument("target", help="mainframe address as host[:port]")
+    parser.add_argument(
+        "--listen",
+        default=DEFAULT_LISTEN,
+        help=f"address to listen on, default {DEFAULT_LISTEN}",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="one-way latency in s"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="latency spread in s"
+    )
+    parser.add_argument(
+        "--distribution",
+        choices=DISTRIBUTIONS,
+        default="uniform",
+        help="latency jitter distribution",
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, help="bytes per second per direction"
+    )
+    parser.add_argument(
+        "--segment-size", type=int, help="largest segment written in bytes"
+    )
+    parser.add_argument(
+        "--stall-probability",
+        type=float,
+        default=0.0,
+        help="probability of a stall per chunk",
+    )
+    parser.add_argument(
+        "--stall-time", type=float, default=1.0, help="stall length in s"
+    )
+    parser.add_argument(
+        "--reset-probability",
+        type=float,
+        default=0.0,
+        help="probability of a connection reset per chunk",
+    )
+    parser.add_argument(
+        "--reset-after",
+        type=int,
+        help="reset connections after this many bytes per direction",
+    )
+    parser.add_argument("--seed", type=int, help="random seed")
+    args = parser.parse_args(argv)
+
+    profile = FaultProfile(
+        args.latency,
+        args.jitter,
+        args.distribution,
+        args.bandwidth,
+        args.segment_size,
+        args.stall_probability,
+        args.stall_time,
+        args.reset_probability,
+        args.reset_after,
+    )
+    try:
+        server = FaultProxy(
+            parse_address(args.target),
+            profile,
+            profile,
+            parse_address(args.listen),
+            args.seed,
+        )
+    except (OSError, ValueError) as error:
+        print(f"ghs-fault-proxy: {error}", file=sys.stderr)
+        return 2
+    print(f"Forwarding {args.listen} to {args.target}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{server.connections} connections, {server.resets} resets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
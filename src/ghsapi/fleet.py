@@ -0,0 +1,263 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Helpers to run API calls on many mainframes concurrently."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from .circuit_breaker import HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers
+from .ghsapi import GHS
+from .ghsapi_states import GHSAccess
+
+DEFAULT_PORT = 8006
+DEFAULT_MAX_WORKERS = 16
+# A sweep connects once per mainframe, one failed connect opens its
+# circuit breaker
+FLEET_FAILURE_THRESHOLD = 1
+# Seconds later sweeps skip a mainframe that was unreachable
+DEFAULT_RETRY_AFTER = 300.0
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """Split a 'host[:port]' mainframe address.
+
+    Args:
+        address: Host name or IP address with optional port number.
+
+    Returns:
+        Tuple with host and port number.
+    """
+
+    host, separator, port = address.rpartition(":")
+    if not separator:
+        return address, DEFAULT_PORT
+    return host, int(port)
+
+
+def read_addresses(
+    addresses: list[str], hosts_file: str | None = None
+) -> list[str]:
+    """Combine mainframe addresses with those listed in a hosts file.
+
+    Args:
+        addresses: Mainframe addresses as 'host[:port]'.
+        hosts_file: Optional file with one address per line, lines
+        starting with '#' are ignored.
+
+    Returns:
+        List of unique addresses in order of appearance.
+    """
+
+    addresses = list(addresses)
+    if hosts_file:
+        with open(hosts_file, "r", encoding="utf-8") as hosts:
+            addresses += [
+                line.strip()
+                for line in hosts
+                if line.strip() and not line.startswith("#")
+            ]
+    return list(dict.fromkeys(addresses))
+
+
+def _connect_guarded(
+    gen: GHS,
+    address: str,
+    timeout: float | None,
+    breaker: CircuitBreaker,
+) -> str:
+    """Connect unless the circuit breaker of the mainframe is open."""
+
+    state = breaker.allow()
+    if state == OPEN:
+        return "NoConnection"
+    host, port = parse_address(address)
+    return_var = gen.ghs_connect(host, port, timeout)
+    if return_var == "OK" and state == HALF_OPEN:
+        access = gen.ghs_get_current_access()
+        if access not in GHSAccess:
+            gen.ghs_disconnect()
+            return_var = access
+    breaker.record(return_var)
+    if return_var == "OK":
+        gen.ghs_circuit_breaker(breaker=breaker)
+    return return_var
+
+
+@contextmanager
+def connected(
+    address: str,
+    timeout: float | None = None,
+    breakers: CircuitBreakers | None = None,
+) -> Iterator[tuple[str, GHS]]:
+    """Connect to a mainframe for the duration of a with block.
+
+    Args:
+        address: Mainframe address as 'host[:port]'.
+        timeout: Optional socket timeout in seconds.
+        breakers: Optional circuit breakers by address. While the
+        breaker of the mainframe is open, NoConnection is returned
+        without connecting, and requests fail at once when it opens
+        during the with block.
+
+    Yields:
+        Tuple with connect status and the GHS object.
+    """
+
+    gen = GHS()
+    if breakers is None:
+        host, port = parse_address(address)
+        return_var = gen.ghs_connect(host, port, timeout)
+    else:
+        return_var = _connect_guarded(
+            gen, address, timeout, breakers.get(address)
+        )
+    try:
+        yield return_var, gen
+    finally:
+        if return_var == "OK":
+            gen.ghs_disconnect()
+        # Also closes the socket left open by a failed Connect request
+        gen._con_handle.connection_close()
+
+
+def load_progress(progress_file: str | None) -> dict[str, dict]:
+    """Read successful results recorded by an earlier run.
+
+    Args:
+        progress_file: Path of the progress file, may not exist yet.
+
+    Returns:
+        Dict of results with status OK by mainframe address.
+    """
+
+    completed = {}
+    if not progress_file:
+        return completed
+    try:
+        with open(progress_file, "r", encoding="utf-8") as progress:
+            for line in progress:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                if result.get("status") == "OK":
+                    completed[result["address"]] = result
+    except FileNotFoundError:
+        pass
+    return completed
+
+
+def run_on_fleet(
+    addresses: list[str],
+    task: Callable[[str], dict],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    progress_file: str | None = None,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Run a task for every mainframe address with bounded concurrency.
+
+    Every result is appended to the progress file as soon as it is
+    available. Addresses that already succeeded according to the
+    progress file are not run again, so an interrupted run can be
+    resumed.
+
+    Args:
+        addresses: Mainframe addresses as 'host[:port]'.
+        task: Callable taking an address and returning a result dict
+        with at least a 'status' key.
+        max_workers: Maximum number of mainframes handled at once.
+        progress_file: Optional path of a JSON lines progress file.
+        on_result: Optional callback receiving each new result.
+
+    Returns:
+        List of result dicts in the order of addresses.
+    """
+
+    completed = load_progress(progress_file)
+    results = {
+        address: dict(completed[address], resumed=True)
+        for address in addresses
+        if address in completed
+    }
+    pending = [address for address in addresses if address not in results]
+    write_lock = threading.Lock()
+
+    def run_task(address: str) -> dict:
+        start = time.perf_counter()
+        try:
+            result = task(address)
+        except Exception as any_exception:
+            result = {"status": "NOK", "error": repr(any_exception)}
+        result["address"] = address
+        result["elapsed"] = time.perf_counter() - start
+        return result
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [pool.submit(run_task, address) for address in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["address"]] = result
+                if progress_file:
+                    with write_lock, open(
+                        progress_file, "a", encoding="utf-8"
+                    ) as progress:
+                        progress.write(json.dumps(result) + "\n")
+                if on_result:
+                    on_result(result)
+
+    return [results[address] for address in addresses]
+
+
+def summarize(results: list[dict]) -> str:
+    """Format a summary report of fleet results.
+
+    Args:
+        results: Result dicts as returned by run_on_fleet.
+
+    Returns:
+        Multi-line report with counts per status and failed mainframes.
+    """
+
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    lines = [
+        f"{len(results)} mainframes: "
+        + ", ".join(f"{status} {count}" for status, count in counts.items())
+    ]
+    resumed = sum(1 for result in results if result.get("resumed"))
+    if resumed:
+        lines.append(f"{resumed} completed in an earlier run")
+    for result in results:
+        if result["status"] != "OK":
+            detail = result.get("error", "")
+            lines.append(
+                f"  {result['address']}: {result['status']} {detail}".rstrip()
+            )
+    return "\n".join(lines)
@@ -0,0 +1,324 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Audit the settings of many mainframes against a golden profile.
+
+Usage::
+
+    ghs-fleet-audit --profile golden.json 10.0.0.1 10.0.0.2:8006
+    ghs-fleet-audit --profile golden.json --hosts-file hall.txt
+
+A profile is a JSON document with the expected recorder and channel
+settings, named like the columns of the recorder and channel tables.
+Rule keys select what a rule applies to: '*' every recorder or channel,
+'A' the recorder in slot A or its channels, 'A:3' channel 3 of slot A.
+More specific rules override less specific ones::
+
+    {
+        "recorders": {"*": {"sample_rate": 100000.0}},
+        "channels": {
+            "*": {"filter_type": "Bessel", "storage_enabled": "Enable"},
+            "A:1": {"span": 20.0, "units": "V"}
+        }
+    }
+
+Analog settings are only checked on analog channels.
+"""
+
+import argparse
+import json
+import math
+import sys
+
+from .channel_table import (
+    ANALOG_COLUMNS,
+    ChannelTable,
+    RecorderTable,
+)
+from .circuit_breaker import CircuitBreakers
+from .fleet import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_RETRY_AFTER,
+    FLEET_FAILURE_THRESHOLD,
+    connected,
+    read_addresses,
+    run_on_fleet,
+    summarize,
+)
+
+DEFAULT_TIMEOUT = 30.0
+REL_TOLERANCE = 1e-6
+
+_ANALOG_SETTINGS = frozenset(column[0] for column in ANALOG_COLUMNS)
+
+
+def load_profile(path: str) -> dict:
+    """Read and check a golden profile.
+
+    Args:
+        path: Path of the JSON profile.
+
+    Returns:
+        Profile dict with 'recorders' and 'channels' rules.
+
+    Raises:
+        ValueError: When the profile names an unknown setting.
+    """
+
+    with open(path, "r", encoding="utf-8") as profile_file:
+        profile = json.load(profile_file)
+    profile.setdefault("recorders", {})
+    profile.setdefault("channels", {})
+    for section, table in (
+        ("recorders", RecorderTable),
+        ("channels", ChannelTable),
+    ):
+        for key, settings in profile[section].items():
+            unknown = set(settings) - set(table.COLUMNS)
+            if unknown:
+                raise ValueError(
+                    f"unknown {section} setting in rule {key!r}: "
+                    + ", ".join(sorted(unknown))
+                )
+    return profile
+
+
+def _expected(
+    rules: dict, slot_id: str, channel_index: int | None = None
+) -> dict:
+    """Merge the rules that apply to a recorder or channel."""
+
+    expected = dict(rules.get("*", {}))
+    expected.update(rules.get(slot_id, {}))
+    if channel_index is not None:
+        expected.update(rules.get(f"{slot_id}:{channel_index}", {}))
+    return expected
+
+
+def _matches(expected, actual) -> bool:
+    """Compare a setting, numbers within a relative tolerance."""
+
+    if (
+        isinstance(expected, (int, float))
+        and isinstance(actual, (int, float))
+        and not isinstance(expected, bool)
+    ):
+        return math.isclose(expected, actual, rel_tol=REL_TOLERANCE)
+    return expected == actual
+
+
+def compare_settings(
+    profile: dict, recorders: RecorderTable, channels: ChannelTable
+) -> list[dict]:
+    """Compare recorder and channel tables with a golden profile.
+
+    Args:
+        profile: Profile as returned by load_profile.
+        recorders: Recorder table of one mainframe.
+        channels: Channel table of the same mainframe.
+
+    Returns:
+        List of differences with slot_id, channel_index (None for
+        recorder settings), setting, expected and actual value.
+    """
+
+    differences = []
+    for row in recorders.rows():
+        expected = _expected(profile["recorders"], row["slot_id"])
+        for setting, value in expected.items():
+            if not _matches(value, row[setting]):
+                differences.append(
+                    {
+                        "slot_id": row["slot_id"],
+                        "channel_index": None,
+                        "setting": setting,
+                        "expected": value,
+                        "actual": row[setting],
+                    }
+                )
+
+    for row in channels.rows():
+        expected = _expected(
+            profile["channels"], row["slot_id"], row["channel_index"]
+        )
+        for setting, value in expected.items():
+            if setting in _ANALOG_SETTINGS and row["channel_type"] != "Analog":
+                continue
+            if not _matches(value, row[setting]):
+                differences.append(
+                    {
+                        "slot_id": row["slot_id"],
+                        "channel_index": row["channel_index"],
+                        "setting": setting,
+                        "expected": value,
+                        "actual": row[setting],
+                    }
+                )
+    return differences
+
+
+def audit_mainframe(
+    address: str,
+    profile: dict,
+    timeout: float | None = None,
+    breakers: CircuitBreakers | None = None,
+) -> dict:
+    """Read the settings of one mainframe and compare them.
+
+    All settings are read once, with pipelined requests, and every rule
+    of the profile is checked against that snapshot.
+
+    Args:
+        address: Mainframe address as 'host[:port]'.
+        profile: Profile as returned by load_profile.
+        timeout: Optional socket timeout in seconds.
+        breakers: Optional circuit breakers by address.
+
+    Returns:
+        Result dict with status and list of differences.
+    """
+
+    with connected(address, timeout, breakers) as (return_var, gen):
+        if return_var != "OK":
+            return {"status": return_var}
+        return_var, recorders = gen.ghs_get_recorder_table()
+        if return_var != "OK":
+            return {"status": return_var}
+        return_var, channels = gen.ghs_get_channel_table(recorders=recorders)
+        if return_var != "OK":
+            return {"status": return_var}
+    return {
+        "status": "OK",
+        "channels": len(channels),
+        "differences": compare_settings(profile, recorders, channels),
+    }
+
+
+def format_differences(results: list[dict]) -> str:
+    """Format the differences of audit results, one per line.
+
+    Args:
+        results: Result dicts as returned by run_on_fleet.
+
+    Returns:
+        Multi-line diff report.
+    """
+
+    lines = []
+    for result in results:
+        for difference in result.get("differences", []):
+            location = difference["slot_id"]
+            if difference["channel_index"] is not None:
+                location += f":{difference['channel_index']}"
+            lines.append(
+                f"{result['address']} {location} {difference['setting']}: "
+                f"expected {difference['expected']!r}, "
+                f"found {difference['actual']!r}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    parser = argparse.ArgumentParser(
+        prog="ghs-fleet-audit",
+        description="Compare settings of many mainframes to a profile.",
+    )
+    parser.add_argument(
+        "addresses", nargs="*", help="mainframe addresses as host[:port]"
+    )
+    parser.add_argument("--hosts-file", help="file with one address per line")
+    parser.add_argument(
+        "--profile", required=True, help="golden profile JSON file"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="mainframes handled at once",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="socket timeout per mainframe in seconds",
+    )
+    parser.add_argument("--report", help="write the results as JSON")
+    parser.add_argument(
+        "--breaker-state",
+        help="file keeping unreachable mainframes between runs",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=DEFAULT_RETRY_AFTER,
+        help="seconds to skip a mainframe that was unreachable",
+    )
+    args = parser.parse_args(argv)
+
+    addresses = read_addresses(args.addresses, args.hosts_file)
+    if not addresses:
+        parser.error("no mainframe addresses given")
+    try:
+        profile = load_profile(args.profile)
+    except ValueError as profile_error:
+        parser.error(str(profile_error))
+
+    breakers = CircuitBreakers(
+        FLEET_FAILURE_THRESHOLD, args.retry_after, path=args.breaker_state
+    )
+    try:
+        results = run_on_fleet(
+            addresses,
+            lambda address: audit_mainframe(
+                address, profile, args.timeout, breakers
+            ),
+            args.workers,
+        )
+    finally:
+        breakers.save()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report:
+            json.dump(results, report, indent=2)
+
+    differences = format_differences(results)
+    if differences:
+        print(differences)
+    print(summarize(results))
+    mismatched = sum(1 for result in results if result.get("differences"))
+    if mismatched:
+        print(f"{mismatched} mainframes differ from the profile")
+    return (
+        0
+        if all(
+            result["status"] == "OK" and not result.get("differences")
+            for result in results
+        )
+        else 1
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
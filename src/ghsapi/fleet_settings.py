@@ -0,0 +1,212 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Back up and restore the settings of many mainframes concurrently.
+
+Usage::
+
+    ghs-fleet-settings backup --store DIR 10.0.0.1 10.0.0.2:8006
+    ghs-fleet-settings restore --store DIR --digest HASH 10.0.0.1
+    ghs-fleet-settings restore --store DIR --hosts-file hall.txt
+"""
+
+import argparse
+import sys
+
+from .circuit_breaker import CircuitBreakers
+from .fleet import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_RETRY_AFTER,
+    FLEET_FAILURE_THRESHOLD,
+    connected,
+    read_addresses,
+    run_on_fleet,
+    summarize,
+)
+from .settings_store import SettingsStore
+
+DEFAULT_TIMEOUT = 30.0
+
+
+def backup_mainframe(
+    address: str,
+    store: SettingsStore,
+    timeout: float | None = None,
+    breakers: CircuitBreakers | None = None,
+) -> dict:
+    """Archive the current settings of one mainframe.
+
+    Args:
+        address: Mainframe address as 'host[:port]'.
+        store: Settings store to archive to.
+        timeout: Optional socket timeout in seconds.
+        breakers: Optional circuit breakers by address.
+
+    Returns:
+        Result dict with status and content hash.
+    """
+
+    with connected(address, timeout, breakers) as (return_var, gen):
+        if return_var != "OK":
+            return {"status": return_var}
+        return_var, digest = gen.ghs_archive_current_settings(store)
+        return {"status": return_var, "digest": digest}
+
+
+def restore_mainframe(
+    address: str,
+    store: SettingsStore,
+    digest: str | None = None,
+    timeout: float | None = None,
+    breakers: CircuitBreakers | None = None,
+) -> dict:
+    """Apply stored settings to one mainframe.
+
+    Args:
+        address: Mainframe address as 'host[:port]'.
+        store: Settings store holding the blob.
+        digest: Content hash of the blob. When None, the latest snapshot
+        of the mainframe's serial number is used.
+        timeout: Optional socket timeout in seconds.
+        breakers: Optional circuit breakers by address.
+
+    Returns:
+        Result dict with status and content hash.
+    """
+
+    with connected(address, timeout, breakers) as (return_var, gen):
+        if return_var != "OK":
+            return {"status": return_var}
+        if digest is None:
+            return_var, _, _, serial_number, _ = gen.ghs_get_mainframe_info()
+            if return_var != "OK":
+                return {"status": return_var}
+            snapshot = store.latest(serial_number)
+            if snapshot is None:
+                return {"status": "NOK", "error": "no snapshot stored"}
+            digest = snapshot["digest"]
+        return_var = gen.ghs_restore_settings(store, digest)
+        return {"status": return_var, "digest": digest}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "addresses", nargs="*", help="mainframe addresses as host[:port]"
+    )
+    common.add_argument("--hosts-file", help="file with one address per line")
+    common.add_argument("--store", required=True, help="settings store path")
+    common.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="mainframes handled at once",
+    )
+    common.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="socket timeout per mainframe in seconds",
+    )
+    common.add_argument(
+        "--progress", help="progress file, resumes an interrupted run"
+    )
+    common.add_argument(
+        "--breaker-state",
+        help="file keeping unreachable mainframes between runs, "
+        "default the progress file with suffix .breakers",
+    )
+    common.add_argument(
+        "--retry-after",
+        type=float,
+        default=DEFAULT_RETRY_AFTER,
+        help="seconds to skip a mainframe that was unreachable",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="ghs-fleet-settings",
+        description="Back up or restore settings of many mainframes.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "backup", parents=[common], help="archive current settings"
+    )
+    restore = commands.add_parser(
+        "restore", parents=[common], help="apply stored settings"
+    )
+    restore.add_argument(
+        "--digest", help="content hash to restore, default latest snapshot"
+    )
+    restore.add_argument("--blob", help="settings blob file to restore")
+    args = parser.parse_args(argv)
+
+    addresses = read_addresses(args.addresses, args.hosts_file)
+    if not addresses:
+        parser.error("no mainframe addresses given")
+
+    store = SettingsStore(args.store)
+    digest = getattr(args, "digest", None)
+    if getattr(args, "blob", None):
+        with open(args.blob, "rb") as blob_file:
+            digest = store.put(blob_file.read())
+
+    breaker_state = args.breaker_state
+    if not breaker_state and args.progress:
+        breaker_state = args.progress + ".breakers"
+    breakers = CircuitBreakers(
+        FLEET_FAILURE_THRESHOLD, args.retry_after, path=breaker_state
+    )
+    if args.command == "backup":
+
+        def task(address: str) -> dict:
+            return backup_mainframe(address, store, args.timeout, breakers)
+
+    else:
+
+        def task(address: str) -> dict:
+            return restore_mainframe(
+                address, store, digest, args.timeout, breakers
+            )
+
+    def report(result: dict):
+        print(
+            f"{result['address']}: {result['status']} "
+            f"({result['elapsed']:.2f} s)",
+            flush=True,
+        )
+
+    try:
+        results = run_on_fleet(
+            addresses, task, args.workers, args.progress, report
+        )
+    finally:
+        breakers.save()
+    print(summarize(results))
+    return 0 if all(result["status"] == "OK" for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Adaptive flow control of the requests sent to a mainframe.
+
+Usage::
+
+    limiter = gen.ghs_flow_control(max_limit=64, rate=500.0)
+    gen.ghs_set_span_and_offset_bulk("A", range(1, 65), 10.0, 1.0)
+    print(limiter.limit)
+
+The limiter caps the number of pipelined requests in flight on the
+connection. The cap grows by one for every window of responses that
+arrive in time, and halves when a response is late or reports an
+overload status, like TCP congestion avoidance. A response counts as
+late when the smoothed latency exceeds the lowest latency seen times the
+tolerance: once the mainframe cannot keep up, requests queue and the
+latency grows, so the cap settles where the round trip is filled
+without building a queue. An optional token bucket caps the request rate
+on top.
+"""
+
+import threading
+import time
+from typing import Callable
+
+from .connection import PIPELINE_WINDOW, ConnectionHandler
+from .ghsapi_states import RETURN_KEY, GHSReturnValue
+
+DEFAULT_MAX_LIMIT = 128
+DEFAULT_TOLERANCE = 2.0
+# Latency below this many seconds above the lowest latency is never late
+DEFAULT_LATENCY_SLACK = 0.002
+# Weight of a new latency in the smoothed latency
+SMOOTHING = 0.2
+
+OVERLOAD_STATUSES = frozenset(
+    [GHSReturnValue["MainframeTimeout"], GHSReturnValue["SystemNotIdle"]]
+)
+
+
+class TokenBucket:
+    """Rate cap allowing bursts up to the bucket size.
+
+    Attributes:
+        rate: Tokens added per second.
+        burst: Largest number of tokens in the bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(burst if burst is not None else rate, 1.0)
+        self._tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, waiting until they are available.
+
+        Returns:
+            Seconds waited.
+        """
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self.rate, self.burst
+            )
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class AIMDLimiter:
+    """Additive increase, multiplicative decrease limit of the requests
+    in flight.
+
+    Attributes:
+        limit: Current number of requests allowed in flight.
+        min_limit: Lowest limit.
+        max_limit: Highest limit.
+        tolerance: Factor over the lowest latency that counts as late.
+        backoff: Factor applied to the limit on a late response.
+        bucket: Optional TokenBucket capping the request rate.
+        min_latency: Lowest latency seen in seconds.
+        latency: Smoothed latency in seconds.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        tolerance: float = DEFAULT_TOLERANCE,
+        backoff: float = 0.5,
+        bucket: TokenBucket | None = None,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = min(max(initial_limit, min_limit), max_limit)
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.bucket = bucket
+        self.min_latency = None
+        self.latency = None
+        self._credit = 0
+        self._since_decrease = 0
+        self._lock = threading.Lock()
+
+    def before_send(self) -> None:
+        """Wait for the rate cap before a request is sent."""
+
+        if self.bucket is not None:
+            self.bucket.acquire()
+
+    def on_response(self, latency: float, response_json: dict) -> None:
+        """Adapt the limit to the latency and status of a response."""
+
+        with self._lock:
+            overload = response_json.get(RETURN_KEY) in OVERLOAD_STATUSES
+            if not overload:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if self.latency is None:
+                    self.latency = latency
+                else:
+                    self.latency += SMOOTHING * (latency - self.latency)
+            late = self.latency is not None and self.latency > (
+                self.min_latency * self.tolerance + DEFAULT_LATENCY_SLACK
+            )
+
+            self._since_decrease += 1
+            if overload or late:
+                # Back off once per window, the responses of the same
+                # window saw the same queue
+                if self._since_decrease >= self.limit:
+                    self.limit = max(
+                        int(self.limit * self.backoff), self.min_limit
+                    )
+                    self._since_decrease = 0
+                    self._credit = 0
+                    # Forget the queue the smoothed latency still holds
+                    self.latency = self.min_latency
+                return
+
+            self._credit += 1
+            if self._credit >= self.limit:
+                self._credit = 0
+                self.limit = min(self.limit + 1, self.max_limit)
+
+
+def enable_flow_control(
+    con_handle: ConnectionHandler,
+    max_limit: int = PIPELINE_WINDOW,
+    rate: float | None = None,
+    burst: float | None = None,
+    initial_limit: int = 4,
+) -> AIMDLimiter:
+    """Attach an adaptive limiter to a connection.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        max_limit: Highest number of requests in flight.
+        rate: Optional highest number of requests per second.
+        burst: Requests allowed at once above the rate, rate if None.
+        initial_limit: Requests in flight at the start, e.g. the limit
+        learned on an earlier connection to the same mainframe model.
+
+    Returns:
+        The limiter, detach it with disable_flow_control().
+    """
+
+    bucket = TokenBucket(rate, burst) if rate else None
+    con_handle.limiter = AIMDLimiter(
+        initial_limit, max_limit=max_limit, bucket=bucket
+    )
+    return con_handle.limiter
+
+
+def disable_flow_control(con_handle: ConnectionHandler) -> None:
+    """Detach the limiter of a connection."""
+
+    con_handle.limiter = None
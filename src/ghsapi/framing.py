@@ -0,0 +1,161 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""GEN DAQ message framing.
+
+Every JSON-RPC message exchanged with the mainframe is preceded by an
+8 byte header holding the payload length and the API version header,
+both as big endian unsigned integers. The payload itself is a NUL
+terminated JSON document.
+"""
+
+from struct import Struct
+
+API_VERSION_HEADER = 1195638785
+HEADER_SIZE = 8
+
+_HEADER = Struct("!II")
+
+
+def encode_frame(
+    payload: bytes, api_version_header: int = API_VERSION_HEADER
+) -> bytes:
+    """Prefix a payload with the frame header.
+
+    Args:
+        payload: NUL terminated JSON-RPC message.
+        api_version_header: API version header of the client.
+
+    Returns:
+        Bytes of the header followed by the payload.
+    """
+
+    return _HEADER.pack(len(payload), api_version_header) + payload
+
+
+class FrameDecoder:
+    """Incremental decoder for GEN DAQ frames.
+
+    Bytes are fed in chunks of arbitrary size as they arrive from the
+    transport. Partial frames are kept until complete, and several
+    frames arriving in one chunk are all returned. The trailing NUL of
+    each payload is stripped while copying it out of the receive
+    buffer.
+
+    Attributes:
+        api_version_header: Expected API version header.
+    """
+
+    def __init__(self, api_version_header: int = API_VERSION_HEADER):
+        self.api_version_header = api_version_header
+        self._buffer = bytearray()
+        self._payload_size = None
+        self._invalid_version = None
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Add received bytes and collect all completed payloads.
+
+        Payloads completed before an invalid header in the same chunk
+        are returned first, the error is then raised by the next call
+        and the bytes passed with it are dropped.
+
+        Args:
+            data: Bytes received from the transport.
+
+        Returns:
+            List of completed payloads without trailing NUL.
+
+        Raises:
+            ValueError: When a frame has an invalid API version header.
+        """
+
+        if self._invalid_version is not None:
+            invalid_version = self._invalid_version
+            self.reset()
+            raise ValueError(f"Invalid API version header: {invalid_version}")
+
+        self._buffer += data
+        payloads = []
+        offset = 0
+        buffered = len(self._buffer)
+        invalid_version = None
+
+        with memoryview(self._buffer) as view:
+            while True:
+                if self._payload_size is None:
+                    if buffered - offset < HEADER_SIZE:
+                        break
+                    payload_size, version = _HEADER.unpack_from(view, offset)
+                    if version != self.api_version_header:
+                        invalid_version = version
+                        break
+                    self._payload_size = payload_size
+                    offset += HEADER_SIZE
+
+                if buffered - offset < self._payload_size:
+                    break
+
+                end = offset + self._payload_size
+                if self._payload_size and view[end - 1] == 0:
+                    payloads.append(bytes(view[offset : end - 1]))
+                else:
+                    payloads.append(bytes(view[offset:end]))
+                offset = end
+                self._payload_size = None
+
+        if invalid_version is not None:
+            self.reset()
+            if payloads:
+                self._invalid_version = invalid_version
+                return payloads
+            raise ValueError(f"Invalid API version header: {invalid_version}")
+        if offset:
+            del self._buffer[:offset]
+        return payloads
+
+    def bytes_needed(self) -> int:
+        """Number of bytes still missing to complete the next frame."""
+
+        if self._payload_size is None:
+            return HEADER_SIZE - len(self._buffer)
+        return self._payload_size - len(self._buffer)
+
+    def frame_progress(self) -> tuple[int, int] | None:
+        """Received and total payload size of the frame being decoded.
+
+        Returns:
+            Tuple with received and total payload bytes, or None while
+            the header of the next frame is incomplete.
+        """
+
+        if self._payload_size is None:
+            return None
+        return len(self._buffer), self._payload_size
+
+    def reset(self):
+        """Drop any partially received frame and a pending error."""
+
+        self._buffer = bytearray()
+        self._payload_size = None
+        self._invalid_version = None
@@ -32,13 +32,11 @@ Package Contents:
     Acquisition control: Acquisition control related API functions.
 """
 
-from . import acquisition_api as _acquisition
-from . import channel_api as _channel
-from . import connection_api as _connection
-from . import mainframe_api as _mainframe
-from . import manage_mainframe_settings as _manage_mainframe_settings
-from . import manage_recordings_api as _manage_recordings
-from . import recorder_api as _recorder
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, BinaryIO, Callable, Sequence
+
 from .connection import ConnectionHandler
 from .ghsapi_states import (
     RETURN_KEY,
@@ -52,6 +50,41 @@ from .ghsapi_states import (
     GHSUserMode,
 )
 
+if TYPE_CHECKING:
+    from .access_monitor import AccessMonitor
+    from .channel_table import ChannelTable, RecorderTable
+    from .circuit_breaker import CircuitBreaker
+    from .disk_forecast import DiskForecast
+    from .flow_control import AIMDLimiter
+    from .ghsapi_results import (
+        AcquisitionStartTime,
+        AutoRange,
+        BulkSetResult,
+        ChannelCalInfo,
+        CurrentSettings,
+        DiskSpace,
+        Excitation,
+        FilterTypeAndFrequency,
+        HighLowRateStorage,
+        MainframeInfo,
+        RecorderInfo,
+        RecordingName,
+        ScheduledCommand,
+        SpanAndOffset,
+        TechnicalUnits,
+        TimerCounterRange,
+        TriggerSettings,
+    )
+    from .recording_session import RecordingSession
+    from .settings_store import SettingsStore
+    from .setup_transaction import SetupTransaction
+    from .wire_capture import WireCapture
+    from .write_staging import WriteStaging
+
+
+# Domain modules are imported on first use through the package
+_package = sys.modules[__package__]
+
 CLIENT_API_VERSION = 4
 
 
@@ -66,32 +99,67 @@ class GHS:
         self._con_handle = ConnectionHandler()
 
     # Connection related API functions.
-    def ghs_connect(self, ip_address: int, port_num: int) -> str:
+    def ghs_connect(
+        self, ip_address: int, port_num: int, timeout: float | None = None
+    ) -> str:
         """Establishes a connection to the mainframe.
 
         Args:
             ip_address: IP address needs to be an IPV4 address.
             port_num: TCP port number (currently defined as 8006).
+            timeout: Optional timeout in seconds for connecting and for
+            each request. Requests that time out return
+            MainframeTimeout.
+
+        Returns:
+            * GHSReturnValue - Connect return status.
+        """
+
+        return _package.connection_api.connect(
+            self._con_handle,
+            ip_address,
+            port_num,
+            CLIENT_API_VERSION,
+            timeout,
+        )
+
+    def ghs_connect_proxy(
+        self, socket_path: str, timeout: float | None = None
+    ) -> str:
+        """Connects to a mainframe through a local session proxy.
+
+        *The proxy (ghs-session-proxy) keeps the mainframe connected, so
+        connecting only costs a local socket hop. Only available where
+        Unix sockets are supported.*
+
+        Args:
+            socket_path: Path of the proxy's Unix socket for the
+              mainframe.
+            timeout: Optional timeout in seconds for connecting and for
+              each request.
 
         Returns:
             * GHSReturnValue - Connect return status.
         """
 
-        return _connection.connect(
-            self._con_handle, ip_address, port_num, CLIENT_API_VERSION
+        return _package.connection_api.connect_proxy(
+            self._con_handle, socket_path, CLIENT_API_VERSION, timeout
         )
 
     def ghs_disconnect(self) -> str:
         """Disconnects from a connected mainframe.
 
         *Results in error when the handle is not valid and / or
-        mainframe is not connected.*
+        mainframe is not connected. Also disconnects the spare
+        connections of hedging.*
 
         Returns:
             * GHSReturnValue - Disconnect return status.
         """
 
-        return _connection.disconnect(self._con_handle)
+        if self._con_handle.hedge is not None:
+            _package.hedging.disable_hedging(self._con_handle)
+        return _package.connection_api.disconnect(self._con_handle)
 
     def ghs_get_client_api_version(self) -> int:
         """Client's API version.
@@ -121,7 +189,225 @@ class GHS:
             * GHSAccess - Access permission.
         """
 
-        return _connection.get_current_access(self._con_handle)
+        return _package.connection_api.get_current_access(self._con_handle)
+
+    def ghs_monitor_access(
+        self,
+        poll_interval: float = 1.0,
+        block_writes: bool = False,
+        block_timeout: float | None = None,
+    ) -> AccessMonitor:
+        """Monitors the access permission in the background.
+
+        *The access is polled every poll_interval seconds and also
+        learned from the responses to other requests. While it is
+        ReadOnly, functions that need write access return
+        WriteAccessBlocked without a round trip, or with block_writes
+        wait until write access returns. Stop the monitor with its
+        stop() method.*
+
+        Args:
+            poll_interval: Seconds between access polls.
+            block_writes: Wait for write access instead of failing.
+            block_timeout: Maximum seconds to wait, None for no limit.
+
+        Returns:
+            * AccessMonitor - Started monitor, its access attribute holds
+              the last known GHSAccess
+        """
+
+        return _package.access_monitor.AccessMonitor(
+            self._con_handle, poll_interval, block_writes, block_timeout
+        ).start()
+
+    def ghs_capture_wire(self, path: str) -> WireCapture:
+        """Capture the requests and responses of this connection.
+
+        *Use as context manager. Every request and response payload is
+        written to the file with its time, gzip compressed when the path
+        ends in .gz. Serve the capture with ghs-wire-replay to replay
+        the session with the original or scaled latencies.*
+
+        Args:
+            path: Path of the capture file
+
+        Returns:
+            * WireCapture - Context manager, capturing inside the with
+              block
+        """
+
+        return _package.wire_capture.WireCapture(self._con_handle, path)
+
+    def ghs_flow_control(
+        self,
+        max_limit: int = 32,
+        rate: float | None = None,
+        initial_limit: int = 4,
+    ) -> AIMDLimiter:
+        """Adapt the number of pipelined requests in flight.
+
+        *The limit grows by one per window of timely responses and
+        halves when the latency rises over twice the lowest latency or
+        a response reports MainframeTimeout or SystemNotIdle. Bulk
+        requests then settle at the fastest rate the mainframe keeps up
+        with. An optional rate caps the requests per second.*
+
+        Args:
+            max_limit: Highest number of requests in flight
+            rate: Optional highest number of requests per second
+            initial_limit: Requests in flight at the start
+
+        Returns:
+            * AIMDLimiter - Limiter, its limit attribute holds the
+              current limit
+        """
+
+        return _package.flow_control.enable_flow_control(
+            self._con_handle, max_limit, rate, initial_limit=initial_limit
+        )
+
+    def ghs_disable_flow_control(self) -> None:
+        """Stop adapting the number of pipelined requests in flight."""
+
+        _package.flow_control.disable_flow_control(self._con_handle)
+
+    def ghs_enable_hedging(
+        self,
+        pool_size: int = 1,
+        percentile: float = 95.0,
+        timeout: float | None = None,
+    ) -> str:
+        """Resend slow read-only requests on a spare connection.
+
+        *Opens pool_size extra connections to the mainframe. A read-only
+        request that has not returned within the given percentile of
+        the latencies of its method is sent once more on a spare
+        connection and the first answer is used. Requests that may
+        change the mainframe state are never resent. Needs a TCP
+        connection.*
+
+        Args:
+            pool_size: Number of spare connections
+            percentile: Latency percentile after which a request is
+            resent
+            timeout: Optional socket timeout in seconds of the spares
+
+        Returns:
+            * GHSReturnValue - API return values
+        """
+
+        return _package.hedging.enable_hedging(
+            self._con_handle,
+            CLIENT_API_VERSION,
+            pool_size,
+            percentile,
+            timeout,
+        )
+
+    def ghs_disable_hedging(self) -> None:
+        """Stop hedging and disconnect the spare connections."""
+
+        _package.hedging.disable_hedging(self._con_handle)
+
+    def ghs_circuit_breaker(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        breaker: CircuitBreaker | None = None,
+    ) -> CircuitBreaker:
+        """Fail requests at once while the mainframe is unreachable.
+
+        *After failure_threshold consecutive NoConnection,
+        ConnectionFailed or MainframeTimeout results, requests return
+        NoConnection without waiting for the socket timeout. After
+        reset_timeout seconds the next request first probes the
+        mainframe with GetCurrentAccess and is sent when the probe is
+        answered.*
+
+        Args:
+            failure_threshold: Consecutive failures that open the
+            breaker
+            reset_timeout: Seconds before the mainframe is probed again
+            breaker: Optional breaker to share, e.g. one of a
+            circuit_breaker.CircuitBreakers registry
+
+        Returns:
+            * CircuitBreaker - Breaker, its state attribute holds
+              closed, open or half_open
+        """
+
+        if breaker is None:
+            breaker = _package.circuit_breaker.CircuitBreaker(
+                failure_threshold, reset_timeout
+            )
+        return _package.circuit_breaker.enable_circuit_breaker(
+            self._con_handle, breaker
+        )
+
+    def ghs_disable_circuit_breaker(self) -> None:
+        """Stop failing requests while the mainframe is unreachable."""
+
+        _package.circuit_breaker.disable_circuit_breaker(self._con_handle)
+
+    def ghs_latency_stats(self) -> dict[str, dict]:
+        """Latency of the requests per priority class.
+
+        *Acquisition control requests (start, stop, pause and resume of
+        preview and recording, trigger and digital output) are sent
+        before other waiting requests, and between the requests of a
+        pipelined batch. Single requests are class normal, pipelined
+        batches class bulk and count as one request. With hedging
+        enabled the latency of the read-only requests as seen by the
+        caller is added as class hedged.*
+
+        Returns:
+            * dict - Per class control, normal and bulk a dict with
+              count, mean, p50, p99 and max latency in seconds, class
+              hedged also with the number of resent requests and the
+              number answered by a spare connection
+        """
+
+        summaries = {
+            name: stats.summary()
+            for name, stats in self._con_handle.latency_stats.items()
+        }
+        if self._con_handle.hedge is not None:
+            summaries["hedged"] = self._con_handle.hedge.summary()
+        return summaries
+
+    def ghs_staged_writes(self) -> WriteStaging:
+        """Stage setter calls and send only their final values.
+
+        *Use as context manager. Inside the with block setters return OK
+        at once and a later call to the same setter for the same slot
+        and channel replaces the earlier one. Leaving the block sends
+        the remaining calls pipelined, an exception drops them. Any
+        other request inside the block first sends the staged calls.*
+
+        Returns:
+            * WriteStaging - Context manager, its result attribute holds
+              the StagedWritesResult after the with block
+        """
+
+        return _package.write_staging.WriteStaging(self._con_handle)
+
+    def ghs_setup_transaction(self) -> SetupTransaction:
+        """Apply setter calls all or nothing.
+
+        *Use as context manager. The current settings are read when the
+        block starts and the setters are staged as with
+        ghs_staged_writes(). When any write fails, or the block raises
+        after writes were sent, the settings read at the start are
+        applied again with one SetCurrentSettings request.*
+
+        *The system needs to be idle before calling this function.*
+
+        Returns:
+            * SetupTransaction - Context manager, its result attribute
+              holds the TransactionResult after the with block
+        """
+
+        return _package.setup_transaction.SetupTransaction(self._con_handle)
 
     # Acquisition control related API functions.
     def ghs_start_preview(self) -> str:
@@ -133,7 +419,7 @@ class GHS:
             * GHSReturnValue - Start preview status.
         """
 
-        return _acquisition.start_preview(self._con_handle)
+        return _package.acquisition_api.start_preview(self._con_handle)
 
     def ghs_stop_preview(self) -> str:
         """Stops preview mode.
@@ -145,7 +431,7 @@ class GHS:
             * GHSReturnValue - Stop preview status.
         """
 
-        return _acquisition.stop_preview(self._con_handle)
+        return _package.acquisition_api.stop_preview(self._con_handle)
 
     def ghs_start_recording(self) -> str:
         """Start recording on local storage.
@@ -159,7 +445,7 @@ class GHS:
             * GHSReturnValue - Start recording status.
         """
 
-        return _acquisition.start_recording(self._con_handle)
+        return _package.acquisition_api.start_recording(self._con_handle)
 
     def ghs_pause_recording(self) -> str:
         """Pauses a started recording.
@@ -170,7 +456,7 @@ class GHS:
             * GHSReturnValue - Pause recording status.
         """
 
-        return _acquisition.pause_recording(self._con_handle)
+        return _package.acquisition_api.pause_recording(self._con_handle)
 
     def ghs_resume_recording(self) -> str:
         """Resumes a paused recording.
@@ -181,7 +467,7 @@ class GHS:
             * GHSReturnValue - Resume recording status.
         """
 
-        return _acquisition.resume_recording(self._con_handle)
+        return _package.acquisition_api.resume_recording(self._con_handle)
 
     def ghs_stop_recording(self) -> str:
         """Stops a started recording.
@@ -192,7 +478,7 @@ class GHS:
             * GHSReturnValue - Stop recording status.
         """
 
-        return _acquisition.stop_recording(self._con_handle)
+        return _package.acquisition_api.stop_recording(self._con_handle)
 
     def ghs_trigger(self) -> str:
         """Issues a trigger.
@@ -203,7 +489,45 @@ class GHS:
             * GHSReturnValue - Trigger status.
         """
 
-        return _acquisition.trigger(self._con_handle)
+        return _package.acquisition_api.trigger(self._con_handle)
+
+    def ghs_start_recording_at(self, at: float) -> ScheduledCommand:
+        """Starts recording at a wall-clock time.
+
+        *The one-way latency to the mainframe is estimated from idle
+        probes sent while waiting, and the request is sent that much
+        before the given time. Blocks until the request is answered.*
+
+        Args:
+            at: Wall-clock time as seconds since the epoch, like
+            time.time()
+
+        Returns:
+            * ScheduledCommand - Start recording status, target and
+              estimated arrival time, estimated latency, send error
+              and estimated arrival error in seconds
+        """
+
+        return _package.acquisition_api.start_recording_at(
+            self._con_handle, at
+        )
+
+    def ghs_trigger_at(self, at: float) -> ScheduledCommand:
+        """Issues a trigger at a wall-clock time.
+
+        *Sent like ghs_start_recording_at().*
+
+        Args:
+            at: Wall-clock time as seconds since the epoch, like
+            time.time()
+
+        Returns:
+            * ScheduledCommand - Trigger status, target and estimated
+              arrival time, estimated latency, send error and estimated
+              arrival error in seconds
+        """
+
+        return _package.acquisition_api.trigger_at(self._con_handle, at)
 
     def ghs_get_acquisition_state(self) -> tuple[str, str | None]:
         """Returns the Acquisition State of the Mainframe.
@@ -213,11 +537,11 @@ class GHS:
             * GHSAcquisitionState - acquisition state of the mainframe.
         """
 
-        return _acquisition.get_acquisition_state(self._con_handle)
+        return _package.acquisition_api.get_acquisition_state(self._con_handle)
 
     def ghs_get_acquisition_start_time(
         self,
-    ) -> tuple[str, int | None, int | None, float | None]:
+    ) -> AcquisitionStartTime:
         """Retrieves the absolute time of the start of acquisition.
 
         Returns:
@@ -227,7 +551,9 @@ class GHS:
             * seconds -The number of seconds since midnight.
         """
 
-        return _acquisition.get_acquisition_start_time(self._con_handle)
+        return _package.acquisition_api.get_acquisition_start_time(
+            self._con_handle
+        )
 
     def ghs_get_acquisition_time(self) -> tuple[str, float | None]:
         """Retrieves the current acquisition time relative to the start
@@ -238,7 +564,7 @@ class GHS:
             * acquisition_time - The acquisition time in seconds.
         """
 
-        return _acquisition.get_acquisition_time(self._con_handle)
+        return _package.acquisition_api.get_acquisition_time(self._con_handle)
 
     # Mainframe APIs
 
@@ -253,9 +579,9 @@ class GHS:
             * GHSReturnValue - Identify API status.
         """
 
-        return _mainframe.identity(self._con_handle, identity_flag)
+        return _package.mainframe_api.identity(self._con_handle, identity_flag)
 
-    def ghs_get_disk_space(self) -> tuple[str, float | None, float | None]:
+    def ghs_get_disk_space(self) -> DiskSpace:
         """Get total and available mainframe internal disk space.
 
         Returns:
@@ -264,7 +590,33 @@ class GHS:
             * available - Available internal disk space in GB
         """
 
-        return _mainframe.get_disk_space(self._con_handle)
+        return _package.mainframe_api.get_disk_space(self._con_handle)
+
+    def ghs_disk_forecast(
+        self, reserve: float = 0.0, repoll_interval: float = 60.0
+    ) -> DiskForecast:
+        """Forecast when the mainframe disk is full.
+
+        *The write rate is estimated from the sample rates, the channel
+        types with storage enabled and the high and low rate storage
+        flags. recording_time() answers how long the setup can record
+        before starting. While recording, time_to_full() calibrates the
+        estimate with a few DiskSpace samples and extrapolates between
+        them, polling again at most every repoll_interval seconds.*
+
+        Args:
+            reserve: Disk space in GB counted as full
+            repoll_interval: Longest time in seconds between DiskSpace
+              polls
+
+        Returns:
+            * DiskForecast - Forecast, its methods return the status and
+              the time in seconds
+        """
+
+        return _package.disk_forecast.DiskForecast(
+            self._con_handle, reserve, repoll_interval
+        )
 
     def ghs_get_sync_status(self) -> tuple[str, str | None]:
         """Determine the mainframe sync status.
@@ -274,7 +626,7 @@ class GHS:
             * GHSSyncStatus - Sync status
         """
 
-        return _mainframe.get_sync_status(self._con_handle)
+        return _package.mainframe_api.get_sync_status(self._con_handle)
 
     def ghs_get_slot_count(self) -> tuple[str, int | None]:
         """Retrieve the number of slots in the mainframe.
@@ -284,7 +636,7 @@ class GHS:
             * slot_count - The number of slots in the mainframe
         """
 
-        return _mainframe.get_slot_count(self._con_handle)
+        return _package.mainframe_api.get_slot_count(self._con_handle)
 
     def ghs_get_user_mode(self) -> tuple[str, str | None]:
         """Retrieve the user mode.
@@ -294,7 +646,7 @@ class GHS:
             * GHSUserMode - The user mode
         """
 
-        return _mainframe.get_user_mode(self._con_handle)
+        return _package.mainframe_api.get_user_mode(self._con_handle)
 
     def ghs_set_user_mode(self, user_mode: str | int) -> str:
         """Set the user mode.
@@ -308,11 +660,13 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _mainframe.set_user_mode(self._con_handle, user_mode)
+        return _package.mainframe_api.set_user_mode(
+            self._con_handle, user_mode
+        )
 
     def ghs_get_mainframe_info(
         self,
-    ) -> tuple[str, str | None, str | None, str | None, str | None]:
+    ) -> MainframeInfo:
         """Determine type, name, serial number and firmware version
         information for the connected mainframe.
 
@@ -327,7 +681,7 @@ class GHS:
             * firmware_version - The firmware version of the mainframe
         """
 
-        return _mainframe.get_mainframe_info(self._con_handle)
+        return _package.mainframe_api.get_mainframe_info(self._con_handle)
 
     # Manage recordings APIs
 
@@ -340,7 +694,9 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _manage_recordings.delete_all_recordings(self._con_handle)
+        return _package.manage_recordings_api.delete_all_recordings(
+            self._con_handle
+        )
 
     def ghs_delete_last_recording(self) -> str:
         """Deletes the most recent recording from local mainframe
@@ -352,9 +708,11 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _manage_recordings.delete_last_recording(self._con_handle)
+        return _package.manage_recordings_api.delete_last_recording(
+            self._con_handle
+        )
 
-    def ghs_get_recording_name(self) -> tuple[str, str | None, int | None]:
+    def ghs_get_recording_name(self) -> RecordingName:
         """Retrieve the recording base name and recording index of the
         last recording file.
 
@@ -366,7 +724,9 @@ class GHS:
             * recording_index - The index of the recording file
         """
 
-        return _manage_recordings.get_recording_name(self._con_handle)
+        return _package.manage_recordings_api.get_recording_name(
+            self._con_handle
+        )
 
     def ghs_get_storage_location(self) -> tuple[str, str | None]:
         """Retrieve the storage location.
@@ -376,11 +736,13 @@ class GHS:
             * GHSStorageLocation - The storage location
         """
 
-        return _manage_recordings.get_storage_location(self._con_handle)
+        return _package.manage_recordings_api.get_storage_location(
+            self._con_handle
+        )
 
     def ghs_get_high_low_rate_storage_enabled(
         self, source: str | int, slot_id: str
-    ) -> tuple[str, str | None, str | None]:
+    ) -> HighLowRateStorage:
         """Retrieve storage enabled status of high and low rate data
         for the specified recording data source.
 
@@ -394,8 +756,10 @@ class GHS:
             * GHSEnableDisable - Flag to indicate if low rate data is stored
         """
 
-        return _manage_recordings.get_high_low_rate_storage_enabled(
-            self._con_handle, source, slot_id
+        return (
+            _package.manage_recordings_api.get_high_low_rate_storage_enabled(
+                self._con_handle, source, slot_id
+            )
         )
 
     def ghs_set_high_low_rate_storage_enabled(
@@ -418,12 +782,14 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _manage_recordings.set_high_low_rate_storage_enabled(
-            self._con_handle,
-            source,
-            slot_id,
-            high_rate_enabled,
-            low_rate_enabled,
+        return (
+            _package.manage_recordings_api.set_high_low_rate_storage_enabled(
+                self._con_handle,
+                source,
+                slot_id,
+                high_rate_enabled,
+                low_rate_enabled,
+            )
         )
 
     def ghs_set_recording_name(
@@ -443,10 +809,38 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _manage_recordings.set_recording_name(
+        return _package.manage_recordings_api.set_recording_name(
             self._con_handle, recording_name, recording_index
         )
 
+    def ghs_recording_session(
+        self,
+        base_name: str | None = None,
+        min_free_space: float = 1.0,
+    ) -> RecordingSession:
+        """Start and stop numbered recordings with preflight checks.
+
+        *Use as context manager, each with block records once. Before
+        the start the mainframe needs to be idle and, when storing on a
+        local disk, have min_free_space GB available. These checks are
+        read in one pipelined batch. The recording index continues from
+        the last recording. Leaving the block stops the recording and
+        waits until the data is saved.*
+
+        Args:
+            base_name: Base name of the recordings, None keeps the base
+            name of the last recording
+            min_free_space: Disk space in GB needed to start a recording
+
+        Returns:
+            * RecordingSession - Context manager, its status attribute
+              holds the status of the last start, stop or wait
+        """
+
+        return _package.recording_session.RecordingSession(
+            self._con_handle, base_name, min_free_space
+        )
+
     def ghs_set_storage_location(self, storage_location: str | int) -> str:
         """Set the storage location.
 
@@ -459,13 +853,15 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _manage_recordings.set_storage_location(
+        return _package.manage_recordings_api.set_storage_location(
             self._con_handle, storage_location
         )
 
     # Manage recordings APIs
 
-    def ghs_apply_persisted_settings(self) -> str:
+    def ghs_apply_persisted_settings(
+        self, skip_if_unchanged: bool = False
+    ) -> str:
         """A mainframe might contain persisted settings (being applied upon
         boot). This method re-applies these settings. In Perception this
         maps on the 'Configured boot' feature.
@@ -474,12 +870,21 @@ class GHS:
         This function overwrites any previously set settings and / or
         persisted settings.*
 
+        *With skip_if_unchanged the request is skipped when the current
+        settings are known to equal the persisted settings, which is the
+        case after settings were persisted or applied through this
+        connection and no setter was called since.*
+
+        Args:
+            skip_if_unchanged: Skip applying settings that are already
+            active.
+
         Returns:
             API status.
         """
 
-        return _manage_mainframe_settings.apply_persisted_settings(
-            self._con_handle
+        return _package.manage_mainframe_settings.apply_persisted_settings(
+            self._con_handle, skip_if_unchanged
         )
 
     def ghs_persist_current_settings(self) -> str:
@@ -492,11 +897,11 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _manage_mainframe_settings.persist_current_settings(
+        return _package.manage_mainframe_settings.persist_current_settings(
             self._con_handle
         )
 
-    def ghs_get_current_settings(self) -> tuple[str, bytes | None, int | None]:
+    def ghs_get_current_settings(self) -> CurrentSettings:
         """Retrieves the current mainframe settings as a blob.
 
         *As this blob can be of variable size, it is upon the caller to
@@ -509,28 +914,118 @@ class GHS:
             * blob_size - Size of the settings blob
         """
 
-        return _manage_mainframe_settings.get_current_settings(
+        return _package.manage_mainframe_settings.get_current_settings(
             self._con_handle
         )
 
-    def ghs_set_current_settings(self, blob: bytes, blob_size: int) -> str:
+    def ghs_set_current_settings(
+        self, blob: bytes, blob_size: int, skip_if_unchanged: bool = False
+    ) -> str:
         """Persists the current mainframe settings.
 
         *The persisted mainframe settings are applied upon a mainframe
         boot.*
 
+        *With skip_if_unchanged the content hash of the blob is compared
+        to the hash of the current settings, and nothing is applied when
+        they match. The hash of the current settings is cached per
+        connection and cleared by every setter call; changes made by
+        other connected clients are not detected.*
+
         Args:
             blob: Settings blob.
             blob_size: Size of the settings blob.
+            skip_if_unchanged: Skip applying settings that are already
+            active.
+
+        Returns:
+            * GHSReturnValue - API return status
+        """
+
+        return _package.manage_mainframe_settings.set_current_settings(
+            self._con_handle, blob, blob_size, None, skip_if_unchanged
+        )
+
+    def ghs_save_current_settings(
+        self,
+        file_obj: BinaryIO,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> tuple[str, int | None]:
+        """Streams the current mainframe settings blob to a file.
+
+        *The blob is written in chunks, the total size is reported to
+        the progress callback as soon as the response header arrives.*
+
+        Args:
+            file_obj: Binary file-like object to write the blob to.
+            progress: Optional callback receiving received and total
+            bytes.
+
+        Returns:
+            * GHSReturnValue - API return status
+            * blob_size - Size of the settings blob
+        """
+
+        return _package.manage_mainframe_settings.save_current_settings(
+            self._con_handle, file_obj, progress
+        )
+
+    def ghs_load_current_settings(
+        self,
+        source: BinaryIO | bytes | bytearray | memoryview,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> str:
+        """Applies a settings blob read from a file or buffer.
+
+        *The system needs to be idle before calling this function.*
+
+        Args:
+            source: Binary file-like object or buffer holding the blob.
+            progress: Optional callback receiving sent and total bytes.
 
         Returns:
             * GHSReturnValue - API return status
         """
 
-        return _manage_mainframe_settings.set_current_settings(
-            self._con_handle, blob, blob_size
+        return _package.manage_mainframe_settings.load_current_settings(
+            self._con_handle, source, progress
         )
 
+    def ghs_archive_current_settings(
+        self, store: SettingsStore
+    ) -> tuple[str, str | None]:
+        """Stores the current mainframe settings in a settings store.
+
+        *Identical blobs are stored only once. The snapshot is recorded
+        with the mainframe serial number and the current time.*
+
+        Args:
+            store: Settings store to archive to.
+
+        Returns:
+            * GHSReturnValue - API return status
+            * digest - Content hash of the settings blob
+        """
+
+        return store.archive(self._con_handle)
+
+    def ghs_restore_settings(self, store: SettingsStore, digest: str) -> str:
+        """Applies settings from a settings store.
+
+        *The settings are only applied when the content hash of the
+        current mainframe settings differs. The system needs to be idle
+        before calling this function.*
+
+        Args:
+            store: Settings store holding the blob.
+            digest: Content hash of the settings blob.
+
+        Returns:
+            * GHSReturnValue - API return status
+        """
+
+        return store.restore(self._con_handle, digest)
+
     # Recorder APIs
 
     def ghs_get_channel_count(self, slot_id: str) -> tuple[str, int | None]:
@@ -547,7 +1042,9 @@ class GHS:
             * channel_count - The number of channels for the recorder
         """
 
-        return _recorder.get_channel_count(self._con_handle, slot_id)
+        return _package.recorder_api.get_channel_count(
+            self._con_handle, slot_id
+        )
 
     def ghs_get_digital_output(
         self, slot_id: str, digital_output: str | int
@@ -567,7 +1064,7 @@ class GHS:
             * GHSDigitalOutMode - The digital output mode for that output
         """
 
-        return _recorder.get_digital_output(
+        return _package.recorder_api.get_digital_output(
             self._con_handle, slot_id, digital_output
         )
 
@@ -585,11 +1082,11 @@ class GHS:
             * GHSEnableDisable - The recorder enabled status
         """
 
-        return _recorder.get_recorder_enabled(self._con_handle, slot_id)
+        return _package.recorder_api.get_recorder_enabled(
+            self._con_handle, slot_id
+        )
 
-    def ghs_get_recorder_info(
-        self, slot_id: str
-    ) -> tuple[str, str | None, str | None, str | None, str | None]:
+    def ghs_get_recorder_info(self, slot_id: str) -> RecorderInfo:
         """Determine type, name, serial number and firmware version
         information for a recorder.
 
@@ -610,7 +1107,9 @@ class GHS:
             * firmware_version - The firmware version of the recorder
         """
 
-        return _recorder.get_recorder_info(self._con_handle, slot_id)
+        return _package.recorder_api.get_recorder_info(
+            self._con_handle, slot_id
+        )
 
     def ghs_get_sample_rate(self, slot_id: str) -> tuple[str, float | None]:
         """Determine the sample rate for a recorder.
@@ -626,7 +1125,7 @@ class GHS:
             * sample_rate - in samples per second
         """
 
-        return _recorder.get_sample_rate(self._con_handle, slot_id)
+        return _package.recorder_api.get_sample_rate(self._con_handle, slot_id)
 
     def ghs_set_digital_output(
         self,
@@ -650,7 +1149,7 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _recorder.set_digital_output(
+        return _package.recorder_api.set_digital_output(
             self._con_handle, slot_id, digital_output, digital_output_mode
         )
 
@@ -675,7 +1174,7 @@ class GHS:
             * GHSReturnValue - API return status
         """
 
-        return _recorder.set_recorder_enabled(
+        return _package.recorder_api.set_recorder_enabled(
             self._con_handle, slot_id, enabled
         )
 
@@ -703,7 +1202,7 @@ class GHS:
         Returns:
             * GHSReturnValue - API return status
         """
-        return _recorder.set_sample_rate(
+        return _package.recorder_api.set_sample_rate(
             self._con_handle, slot_id, sample_rate
         )
 
@@ -728,7 +1227,7 @@ class GHS:
             * GHSChannelType - Type of the channel
         """
 
-        return _channel.get_channel_type(
+        return _package.channel_api.get_channel_type(
             self._con_handle, slot_id, channel_index
         )
 
@@ -755,7 +1254,7 @@ class GHS:
             * channel_name - The name of the channel
         """
 
-        return _channel.get_channel_name(
+        return _package.channel_api.get_channel_name(
             self._con_handle, slot_id, channel_index, channel_type
         )
 
@@ -784,7 +1283,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_channel_name(
+        return _package.channel_api.set_channel_name(
             self._con_handle, slot_id, channel_index, channel_type, channel_name
         )
 
@@ -809,7 +1308,7 @@ class GHS:
             * GHSEnableDisable - The storage enabled status for the channel
         """
 
-        return _channel.get_channel_storage_enabled(
+        return _package.channel_api.get_channel_storage_enabled(
             self._con_handle, slot_id, channel_index, channel_type
         )
 
@@ -838,7 +1337,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_channel_storage_enabled(
+        return _package.channel_api.set_channel_storage_enabled(
             self._con_handle, slot_id, channel_index, channel_type, enabled
         )
 
@@ -866,17 +1365,68 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.cmd_zeroing(
+        return _package.channel_api.cmd_zeroing(
             self._con_handle, slot_id, channel_index, channel_type, ezeroing
         )
 
+    def ghs_get_recorder_table(
+        self, slot_ids: list[str] | None = None
+    ) -> tuple[str, RecorderTable | None]:
+        """Read the settings of all recorders into a columnar table.
+
+        *Channel count, recorder enabled, sample rate and high and low
+        rate storage enabled per recorder. The requests are pipelined.*
+
+        *Read - This method can be called by multiple connected clients at same
+        time.*
+
+        Args:
+            slot_ids: Slots to read, all slots of the mainframe if None
+
+        Returns:
+            * GHSReturnValue - API return values
+            * RecorderTable - Recorder settings, convert with to_numpy(),
+              to_arrow() or to_columnar()
+        """
+
+        return _package.channel_table.get_recorder_table(
+            self._con_handle, slot_ids
+        )
+
+    def ghs_get_channel_table(
+        self,
+        slot_ids: list[str] | None = None,
+        recorders: RecorderTable | None = None,
+    ) -> tuple[str, ChannelTable | None]:
+        """Read the settings of all channels into a columnar table.
+
+        *The requests are pipelined, one batch each for the channel
+        counts, the channel types, the storage enabled states and the
+        analog settings.*
+
+        *Read - This method can be called by multiple connected clients at same
+        time.*
+
+        Args:
+            slot_ids: Slots to read, all slots of the mainframe if None
+            recorders: Recorder table read before, saves reading the
+              channel counts again
+
+        Returns:
+            * GHSReturnValue - API return values
+            * ChannelTable - Channel settings, convert with to_numpy(),
+              to_arrow() or to_columnar()
+        """
+
+        return _package.channel_table.get_channel_table(
+            self._con_handle, slot_ids, recorders=recorders
+        )
+
     ## Analog Module
 
     def ghs_get_trigger_settings(
         self, slot_id: str, channel_index: int
-    ) -> tuple[
-        str, str | None, float | None, float | None, float | None, str | None
-    ]:
+    ) -> TriggerSettings:
         """Determine the trigger settings for an analog channel.
 
         *Read - This method can be called by multiple connected clients at same
@@ -895,7 +1445,7 @@ class GHS:
             * direction - The trigger direction
         """
 
-        return _channel.get_trigger_settings(
+        return _package.channel_api.get_trigger_settings(
             self._con_handle, slot_id, channel_index
         )
 
@@ -937,7 +1487,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_trigger_settings(
+        return _package.channel_api.set_trigger_settings(
             self._con_handle,
             slot_id,
             channel_index,
@@ -948,6 +1498,51 @@ class GHS:
             direction,
         )
 
+    def ghs_set_trigger_settings_bulk(
+        self,
+        slot_id: str,
+        channel_indices: Sequence[int],
+        trigger_modes: Sequence[str | int] | str | int,
+        primary_levels: Sequence[float] | float,
+        secondary_levels: Sequence[float] | float,
+        hysteresis: Sequence[float] | float,
+        directions: Sequence[str | int] | str | int,
+    ) -> BulkSetResult:
+        """Set the trigger settings for many analog channels of a recorder.
+
+        *Each argument takes one value per channel or one value for all
+        channels. All values are validated before any request is sent,
+        the requests are pipelined.*
+
+        *ReadWrite - This method will only process requests from the
+        connected client with the most privileges order (Privileges
+        order: 1- Perception, 2- GenDaq, 3- Other)*
+
+        Args:
+            slot_id: The slot containing the recorder
+            channel_indices: List or NumPy array of one-based channel indices
+            trigger_modes: Trigger modes
+            primary_levels: The desired primary trigger levels
+            secondary_levels: The desired secondary trigger levels
+            hysteresis: The desired trigger hysteresis
+            directions: The desired trigger directions
+
+        Returns:
+            * GHSReturnValue - API return values, first failure if any
+            * List of GHSReturnValue - Status per channel
+        """
+
+        return _package.channel_bulk_api.set_trigger_settings_bulk(
+            self._con_handle,
+            slot_id,
+            channel_indices,
+            trigger_modes,
+            primary_levels,
+            secondary_levels,
+            hysteresis,
+            directions,
+        )
+
     def ghs_get_signal_coupling(
         self, slot_id: str, channel_index: int
     ) -> tuple[str, str | None]:
@@ -965,7 +1560,7 @@ class GHS:
             * GHSSignalCoupling - The signal coupling
         """
 
-        return _channel.get_signal_coupling(
+        return _package.channel_api.get_signal_coupling(
             self._con_handle, slot_id, channel_index
         )
 
@@ -993,7 +1588,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_signal_coupling(
+        return _package.channel_api.set_signal_coupling(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1017,7 +1612,7 @@ class GHS:
             * GHSInputCoupling - The input coupling
         """
 
-        return _channel.get_input_coupling(
+        return _package.channel_api.get_input_coupling(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1045,7 +1640,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_input_coupling(
+        return _package.channel_api.set_input_coupling(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1054,7 +1649,7 @@ class GHS:
 
     def ghs_get_span_and_offset(
         self, slot_id: str, channel_index: int
-    ) -> tuple[str, float | None, float | None]:
+    ) -> SpanAndOffset:
         """Determine the span and offset for an analog channel.
 
         *Read - This method can be called by multiple connected clients at same
@@ -1070,7 +1665,7 @@ class GHS:
             * offset - The offset in user units
         """
 
-        return _channel.get_span_and_offset(
+        return _package.channel_api.get_span_and_offset(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1097,7 +1692,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_span_and_offset(
+        return _package.channel_api.set_span_and_offset(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1105,9 +1700,40 @@ class GHS:
             offset,
         )
 
+    def ghs_set_span_and_offset_bulk(
+        self,
+        slot_id: str,
+        channel_indices: Sequence[int],
+        spans: Sequence[float] | float,
+        offsets: Sequence[float] | float,
+    ) -> BulkSetResult:
+        """Set Span and offset for many analog channels of a recorder.
+
+        *All values are validated before any request is sent, the
+        requests are pipelined.*
+
+        *ReadWrite - This method will only process requests from the
+        connected client with the most privileges order (Privileges
+        order: 1- Perception, 2- GenDaq, 3- Other)*
+
+        Args:
+            slot_id: The slot containing the recorder
+            channel_indices: List or NumPy array of one-based channel indices
+            spans: Span per channel in user units, or one span for all
+            offsets: Offset per channel in user units, or one offset for all
+
+        Returns:
+            * GHSReturnValue - API return values, first failure if any
+            * List of GHSReturnValue - Status per channel
+        """
+
+        return _package.channel_bulk_api.set_span_and_offset_bulk(
+            self._con_handle, slot_id, channel_indices, spans, offsets
+        )
+
     def ghs_get_filter_type_and_frequency(
         self, slot_id: str, channel_index: int
-    ) -> tuple[str, str | None, float | None]:
+    ) -> FilterTypeAndFrequency:
         """Determine the filter type and frequency for an analog channel.
 
         *Read - This method can be called by multiple connected clients at same
@@ -1123,7 +1749,7 @@ class GHS:
             * frequency - The filter frequency in Hz
         """
 
-        return _channel.get_filter_type_and_frequency(
+        return _package.channel_api.get_filter_type_and_frequency(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1157,7 +1783,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_filter_type_and_frequency(
+        return _package.channel_api.set_filter_type_and_frequency(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1167,7 +1793,7 @@ class GHS:
 
     def ghs_get_excitation(
         self, slot_id: str, channel_index: int
-    ) -> tuple[str, str | None, float | None]:
+    ) -> Excitation:
         """Determine the excitation type and value for an analog channel.
 
         *Read - This method can be called by multiple connected clients at same
@@ -1183,7 +1809,7 @@ class GHS:
             * excitation_value - The excitation value in user units (voltage or current).
         """
 
-        return _channel.get_excitation(
+        return _package.channel_api.get_excitation(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1216,7 +1842,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_excitation(
+        return _package.channel_api.set_excitation(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1241,7 +1867,7 @@ class GHS:
             * GHSAmplifierMode - The amplifier mode
         """
 
-        return _channel.get_amplifier_mode(
+        return _package.channel_api.get_amplifier_mode(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1271,7 +1897,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_amplifier_mode(
+        return _package.channel_api.set_amplifier_mode(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1280,7 +1906,7 @@ class GHS:
 
     def ghs_get_technical_units(
         self, slot_id: str, channel_index: int
-    ) -> tuple[str, str | None, float | None, float | None]:
+    ) -> TechnicalUnits:
         """Determine the technical units, unit multiplier and unit offset for
         an analog channel.
 
@@ -1300,7 +1926,7 @@ class GHS:
             * offset - The technical units offset value.
         """
 
-        return _channel.get_technical_units(
+        return _package.channel_api.get_technical_units(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1332,7 +1958,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_technical_units(
+        return _package.channel_api.set_technical_units(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1343,7 +1969,7 @@ class GHS:
 
     def ghs_get_auto_range(
         self, slot_id: str, channel_index: int
-    ) -> tuple[str, str | None, float | None]:
+    ) -> AutoRange:
         """Determine the auto range enable and time settings.
 
         *Read - This method can be called by multiple connected clients at same
@@ -1359,7 +1985,7 @@ class GHS:
             * auto_range_time - The time for auto range in seconds.
         """
 
-        return _channel.get_auto_range(
+        return _package.channel_api.get_auto_range(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1386,7 +2012,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_auto_range(
+        return _package.channel_api.set_auto_range(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1418,7 +2044,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.cmd_auto_range_now(
+        return _package.channel_api.cmd_auto_range_now(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1427,15 +2053,7 @@ class GHS:
 
     def ghs_get_channel_cal_info(
         self, slot_id: str, channel_index: int
-    ) -> tuple[
-        str,
-        str | None,
-        str | None,
-        str | None,
-        str | None,
-        str | None,
-        str | None,
-    ]:
+    ) -> ChannelCalInfo:
         """Retrieve calibration information for an analog channel.
 
         *The calibrationDateTime, verificationDateTime,
@@ -1459,7 +2077,7 @@ class GHS:
             * power_verification_lab - The laboratory that verified the power calibration for this analog channel (if applicable).
         """
 
-        return _channel.get_channel_cal_info(
+        return _package.channel_api.get_channel_cal_info(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1482,7 +2100,7 @@ class GHS:
             * gate_time - The gate time in seconds
         """
 
-        return _channel.get_timer_counter_gate_time(
+        return _package.channel_api.get_timer_counter_gate_time(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1513,7 +2131,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_timer_counter_gate_time(
+        return _package.channel_api.set_timer_counter_gate_time(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1537,7 +2155,7 @@ class GHS:
             * GHSTimerCounterMode - The timer/counter mode
         """
 
-        return _channel.get_timer_counter_mode(
+        return _package.channel_api.get_timer_counter_mode(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1567,7 +2185,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_timer_counter_mode(
+        return _package.channel_api.set_timer_counter_mode(
             self._con_handle,
             slot_id,
             channel_index,
@@ -1576,7 +2194,7 @@ class GHS:
 
     def ghs_get_timer_counter_range(
         self, slot_id: str, channel_index: int
-    ) -> tuple[str, float | None, float | None]:
+    ) -> TimerCounterRange:
         """Determine the range for a timer/counter channel.
 
         *Read - This method can be called by multiple connected clients at same
@@ -1592,7 +2210,7 @@ class GHS:
             * upper_value - The upper range value.
         """
 
-        return _channel.get_timer_counter_range(
+        return _package.channel_api.get_timer_counter_range(
             self._con_handle, slot_id, channel_index
         )
 
@@ -1625,7 +2243,7 @@ class GHS:
             * GHSReturnValue - API return values
         """
 
-        return _channel.set_timer_counter_range(
+        return _package.channel_api.set_timer_counter_range(
             self._con_handle,
             slot_id,
             channel_index,
@@ -0,0 +1,216 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""GHS API result types.
+
+Getters returning more than one value return these named tuples. They
+compare equal to plain tuples and unpack like them, while the fields can
+also be read by name. Named tuples store no per-instance dict.
+"""
+
+from typing import NamedTuple
+
+
+class AcquisitionStartTime(NamedTuple):
+    """Absolute time of the start of acquisition."""
+
+    status: str
+    year: int | None = None
+    day: int | None = None
+    seconds: float | None = None
+
+
+class TriggerSettings(NamedTuple):
+    """Trigger settings of an analog channel."""
+
+    status: str
+    trigger_mode: str | None = None
+    primary_level: float | None = None
+    secondary_level: float | None = None
+    hysteresis: float | None = None
+    direction: str | None = None
+
+
+class SpanAndOffset(NamedTuple):
+    """Span and offset of an analog channel."""
+
+    status: str
+    span: float | None = None
+    offset: float | None = None
+
+
+class FilterTypeAndFrequency(NamedTuple):
+    """Filter type and frequency of an analog channel."""
+
+    status: str
+    filter_type: str | None = None
+    frequency: float | None = None
+
+
+class Excitation(NamedTuple):
+    """Excitation of an analog channel."""
+
+    status: str
+    excitation_type: str | None = None
+    excitation_value: float | None = None
+
+
+class TechnicalUnits(NamedTuple):
+    """Technical units of an analog channel."""
+
+    status: str
+    units: str | None = None
+    multiplier: float | None = None
+    offset: float | None = None
+
+
+class AutoRange(NamedTuple):
+    """Auto range settings of an analog channel."""
+
+    status: str
+    auto_range_enabled: str | None = None
+    auto_range_time: float | None = None
+
+
+class ChannelCalInfo(NamedTuple):
+    """Calibration information of an analog channel."""
+
+    status: str
+    calibration_date_time: str | None = None
+    verification_date_time: str | None = None
+    power_verification_date_time: str | None = None
+    calibration_lab: str | None = None
+    verification_lab: str | None = None
+    power_verification_lab: str | None = None
+
+
+class TimerCounterRange(NamedTuple):
+    """Range of a timer/counter channel."""
+
+    status: str
+    lower_value: float | None = None
+    upper_value: float | None = None
+
+
+class MainframeInfo(NamedTuple):
+    """Type, name, serial number and firmware version of a mainframe."""
+
+    status: str
+    mainframe_type: str | None = None
+    mainframe_name: str | None = None
+    serial_number: str | None = None
+    firmware_version: str | None = None
+
+
+class DiskSpace(NamedTuple):
+    """Total and available mainframe internal disk space in GB."""
+
+    status: str
+    total: float | None = None
+    available: float | None = None
+
+
+class RecordingName(NamedTuple):
+    """Base name and index of the last recording file."""
+
+    status: str
+    recording_base_name: str | None = None
+    recording_index: int | None = None
+
+
+class HighLowRateStorage(NamedTuple):
+    """Storage enabled status of high and low rate data."""
+
+    status: str
+    high_rate_enabled: str | None = None
+    low_rate_enabled: str | None = None
+
+
+class RecorderInfo(NamedTuple):
+    """Type, name, serial number and firmware version of a recorder."""
+
+    status: str
+    recorder_type: str | None = None
+    recorder_name: str | None = None
+    serial_number: str | None = None
+    firmware_version: str | None = None
+
+
+class CurrentSettings(NamedTuple):
+    """Current mainframe settings blob."""
+
+    status: str
+    blob: str | bytes | None = None
+    blob_size: int | None = None
+
+
+class BulkSetResult(NamedTuple):
+    """Overall and per channel status of a bulk setter."""
+
+    status: str
+    channel_statuses: list[str] | None = None
+
+
+class StagedWritesResult(NamedTuple):
+    """Outcome of committing staged setter calls."""
+
+    status: str
+    staged_calls: int = 0
+    sent_calls: int = 0
+    statuses: list[str] | None = None
+
+
+class TransactionResult(NamedTuple):
+    """Outcome of a setup transaction."""
+
+    status: str
+    rolled_back: bool = False
+    rollback_status: str | None = None
+    statuses: list[str] | None = None
+
+
+class RecordingPreflight(NamedTuple):
+    """Checks made before starting a recording."""
+
+    status: str
+    acquisition_state: str | None = None
+    storage_location: str | None = None
+    available_space: float | None = None
+    recording_base_name: str | None = None
+    recording_index: int | None = None
+
+
+class ScheduledCommand(NamedTuple):
+    """Outcome of a command sent at a wall-clock time.
+
+    Times are seconds since the epoch, errors and latency seconds, an
+    error is positive when late.
+    """
+
+    status: str
+    target_time: float | None = None
+    arrival_time: float | None = None
+    latency: float | None = None
+    send_error: float | None = None
+    arrival_error: float | None = None
@@ -257,17 +257,138 @@ GHSChannelType = {
     "TimerCounter": 3
 }
 
+# Methods that only read mainframe state
+READ_ONLY_METHODS = frozenset(
+    [
+        "DiskSpace",
+        "GetAcquisitionStartTime",
+        "GetAcquisitionState",
+        "GetAcquisitionTime",
+        "GetAmplifierMode",
+        "GetAutoRange",
+        "GetChannelCalibrationInformation",
+        "GetChannelCount",
+        "GetChannelName",
+        "GetChannelStorageEnabled",
+        "GetChannelType",
+        "GetCurrentAccess",
+        "GetCurrentSettings",
+        "GetDigitalOutput",
+        "GetExcitation",
+        "GetFilterTypeAndFrequency",
+        "GetHighLowRateStorageEnabled",
+        "GetInputCoupling",
+        "GetMainframeInformation",
+        "GetRecorderEnabled",
+        "GetRecorderInformation",
+        "GetRecordingName",
+        "GetSampleRate",
+        "GetSignalCoupling",
+        "GetSlotCount",
+        "GetSpanAndOffset",
+        "GetStorageLocation",
+        "GetSyncStatus",
+        "GetTechnicalUnits",
+        "GetTimerCounterGateTime",
+        "GetTimerCounterMode",
+        "GetTimerCounterRange",
+        "GetTriggerSettings",
+        "GetUserMode",
+    ]
+)
+
+# Read-only methods answered alike on every connection to a mainframe,
+# so that a spare connection may answer them. The access is granted per
+# connection.
+HEDGEABLE_METHODS = READ_ONLY_METHODS - frozenset(["GetCurrentAccess"])
+
+# Methods that leave the current mainframe settings unchanged
+SETTINGS_PRESERVING_METHODS = READ_ONLY_METHODS | frozenset(
+    ["Connect", "Disconnect", "Identify", "PersistCurrentSettings"]
+)
+
+# Methods that do not need write access
+WRITE_ACCESS_FREE_METHODS = READ_ONLY_METHODS | frozenset(
+    ["Connect", "Disconnect", "Identify"]
+)
+
+# Setters whose effect only depends on the last value written, so that
+# repeated writes to the same target can be coalesced
+STAGEABLE_METHODS = frozenset(
+    [
+        "SetAmplifierMode",
+        "SetAutoRange",
+        "SetChannelName",
+        "SetChannelStorageEnabled",
+        "SetExcitation",
+        "SetFilterTypeAndFrequency",
+        "SetHighLowRateStorageEnabled",
+        "SetInputCoupling",
+        "SetRecorderEnabled",
+        "SetRecordingName",
+        "SetSampleRate",
+        "SetSignalCoupling",
+        "SetSpanAndOffset",
+        "SetStorageLocation",
+        "SetTechnicalUnits",
+        "SetTimerCounterGateTime",
+        "SetTimerCounterMode",
+        "SetTimerCounterRange",
+        "SetTriggerSettings",
+    ]
+)
+
+# Request parameters that select the target of a setter
+TARGET_PARAMS = ("SlotId", "ChannelIndex", "ChannelType", "Source")
+
+# Acquisition control methods, sent before queued requests
+CONTROL_METHODS = frozenset(
+    [
+        "PauseRecording",
+        "ResumeRecording",
+        "SetDigitalOutput",
+        "StartPreview",
+        "StartRecording",
+        "StopPreview",
+        "StopRecording",
+        "Trigger",
+    ]
+)
+
+
+_INVERSE_DICTS = {}
+
+
 def to_string(value: int, ghs_dict: dict) -> str:
     """Get status key by value from dictionary."""
 
-    for string_val, return_val in ghs_dict.items():
-        if value == return_val:
-            return string_val
+    # Reverse lookup tables are built once per dictionary. The cache
+    # keeps a reference to the dictionary so its id stays unique.
+    cached = _INVERSE_DICTS.get(id(ghs_dict))
+    if cached is None or cached[0] is not ghs_dict:
+        inverse_dict = {}
+        for string_val, return_val in ghs_dict.items():
+            inverse_dict.setdefault(return_val, string_val)
+        cached = (ghs_dict, inverse_dict)
+        _INVERSE_DICTS[id(ghs_dict)] = cached
+    inverse_dict = cached[1]
+    try:
+        return inverse_dict[value]
+    except (KeyError, TypeError):
+        pass
     if ghs_dict == "GHSChannelType":
         return "Invalid"
     return "Reserved"
 
 
+def optional_to_string(value: int | None, ghs_dict: dict) -> str | None:
+    """Get status key by value from dictionary, None for no value."""
+
+    if value is None:
+        return None
+    return to_string(value, ghs_dict)
+
+
 def from_string(key: str, ghs_dict: dict) -> int:
     """Get status value by key from dictionary."""
 
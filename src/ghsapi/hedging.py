@@ -0,0 +1,359 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Hedged read-only requests over pooled connections.
+
+A stalled TCP connection delays every request queued behind it, so a
+few stalls of some hundred milliseconds dominate the tail latency of
+simple getters. With hedging a read-only request that has not returned
+within a high percentile of the latencies of its method is sent once
+more on a spare connection to the same mainframe, and the first answer
+is used. The late answer is read and dropped, so both connections stay
+in sync. Requests that may change the mainframe state are never sent
+twice, and GetCurrentAccess is not hedged since the access is granted
+per connection.
+
+    status = hedging.enable_hedging(con_handle, CLIENT_API_VERSION)
+    ...
+    print(con_handle.hedge.hedged_calls, con_handle.hedge.hedge_wins)
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+
+from . import connection_api
+from .connection import ConnectionHandler
+from .ghsapi_states import HEDGEABLE_METHODS, RETURN_KEY, GHSReturnValue
+from .scheduling import LatencyStats
+
+DEFAULT_PERCENTILE = 95.0
+# Latencies of a method needed before its requests are hedged
+DEFAULT_MIN_SAMPLES = 20
+# Shortest wait in seconds before a request is hedged
+DEFAULT_MIN_DELAY = 0.005
+DEFAULT_MAX_WORKERS = 8
+
+# Statuses of an answer from a broken connection, the other answer wins
+CONNECTION_ERRORS = frozenset(
+    [
+        GHSReturnValue["NoConnection"],
+        GHSReturnValue["ConnectionFailed"],
+        GHSReturnValue["MainframeTimeout"],
+    ]
+)
+
+
+class ConnectionPool:
+    """Spare connections handed out round robin.
+
+    Attributes:
+        connections: The spare connection handles.
+    """
+
+    def __init__(self, connections: list[ConnectionHandler]) -> None:
+        self.connections = connections
+        self._next = itertools.cycle(range(len(connections)))
+        self._lock = threading.Lock()
+
+    def get(self) -> ConnectionHandler | None:
+        """Next connected spare connection, None if there is none."""
+
+        with self._lock:
+            for _ in self.connections:
+                spare = self.connections[next(self._next)]
+                if spare.sock:
+                    return spare
+        return None
+
+    def close(self) -> None:
+        """Disconnect all spare connections."""
+
+        for spare in self.connections:
+            if spare.sock:
+                connection_api.disconnect(spare)
+        self.connections = []
+
+
+def open_pool(
+    ip_address: str,
+    port_num: int,
+    size: int,
+    client_api_version: int,
+    timeout: float | None = None,
+) -> tuple[str, ConnectionPool | None]:
+    """Connect the spare connections of a pool.
+
+    Args:
+        ip_address: Mainframe ip address.
+        port_num: Mainframe port number.
+        size: Number of spare connections.
+        client_api_version: Client supported API version.
+        timeout: Optional socket timeout in seconds.
+
+    Returns:
+        Tuple with status of the first failed connect or OK and the
+        pool, None on failure.
+    """
+
+    connections = []
+    for _ in range(size):
+        spare = ConnectionHandler()
+        return_var = connection_api.connect(
+            spare, ip_address, port_num, client_api_version, timeout
+        )
+        if return_var != "OK":
+            ConnectionPool(connections).close()
+            return return_var, None
+        connections.append(spare)
+    return "OK", ConnectionPool(connections)
+
+
+class Hedger:
+    """Sends slow read-only requests once more on a spare connection.
+
+    Attributes:
+        pool: Spare connections for the hedged requests.
+        percentile: Percentile of the latencies of a method after which
+        its requests are hedged.
+        min_delay: Shortest wait in seconds before hedging.
+        min_samples: Latencies of a method needed before hedging.
+        stats: Latencies as seen by the callers of hedged methods.
+        hedged_calls: Number of requests sent a second time.
+        hedge_wins: Number of hedged requests answered by the spare.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        percentile: float = DEFAULT_PERCENTILE,
+        min_delay: float = DEFAULT_MIN_DELAY,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        self.pool = pool
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.stats = LatencyStats()
+        self.hedged_calls = 0
+        self.hedge_wins = 0
+        self._methods = {}
+        self._lock = threading.Lock()
+        # Separate workers, so hedges never queue behind stalled
+        # primaries
+        self._primaries = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="ghs-primary"
+        )
+        self._hedges = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="ghs-hedge"
+        )
+
+    def _method_stats(self, method_name: str) -> LatencyStats:
+        with self._lock:
+            return self._methods.setdefault(method_name, LatencyStats())
+
+    def threshold(self, method_name: str) -> float | None:
+        """Seconds after which a request is hedged, None while learning."""
+
+        stats = self._method_stats(method_name)
+        latency = stats.percentile(self.percentile)
+        if stats.count < self.min_samples or latency is None:
+            return None
+        return max(latency, self.min_delay)
+
+    def _primary(
+        self,
+        con_handle: ConnectionHandler,
+        method_name: str,
+        method_param: dict | None,
+        priority: int,
+    ) -> dict:
+        """Send on the own connection, learning the method latency."""
+
+        started_at = time.perf_counter()
+        response_json = con_handle.send_request_direct(
+            method_name, method_param, priority
+        )
+        self._method_stats(method_name).add(time.perf_counter() - started_at)
+        return response_json
+
+    def request(
+        self,
+        con_handle: ConnectionHandler,
+        method_name: str,
+        method_param: dict | None,
+        priority: int,
+    ) -> dict:
+        """Send a read-only request, hedged when it is slow.
+
+        Methods outside HEDGEABLE_METHODS, whose answer depends on the
+        connection, are always sent on the own connection.
+
+        Args:
+            con_handle: Connection the request belongs to.
+            method_name: Read-only method name.
+            method_param: Method parameters.
+            priority: Priority class value.
+
+        Returns:
+            Dict representing the first usable response.
+        """
+
+        if method_name not in HEDGEABLE_METHODS:
+            return con_handle.send_request_direct(
+                method_name, method_param, priority
+            )
+        started_at = time.perf_counter()
+        threshold = self.threshold(method_name)
+        if threshold is None:
+            response_json = self._primary(
+                con_handle, method_name, method_param, priority
+            )
+            self.stats.add(time.perf_counter() - started_at)
+            return response_json
+
+        primary = self._primaries.submit(
+            self._primary, con_handle, method_name, method_param, priority
+        )
+        try:
+            response_json = primary.result(threshold)
+        except FutureTimeoutError:
+            response_json = self._hedge(
+                con_handle, primary, method_name, method_param, priority
+            )
+        self.stats.add(time.perf_counter() - started_at)
+        return response_json
+
+    def _hedge(
+        self,
+        con_handle: ConnectionHandler,
+        primary: Future,
+        method_name: str,
+        method_param: dict | None,
+        priority: int,
+    ) -> dict:
+        """Race the slow primary against the request on a spare.
+
+        A primary still waiting for a worker is cancelled, the request
+        then goes to the spare alone and to the own connection only when
+        the spare fails.
+        """
+
+        spare = self.pool.get()
+        if spare is None:
+            return primary.result()
+        with self._lock:
+            self.hedged_calls += 1
+        hedge = self._hedges.submit(
+            spare.send_request_wait_response,
+            method_name,
+            method_param,
+            priority=priority,
+        )
+        if primary.cancel():
+            response_json = hedge.result()
+            if response_json[RETURN_KEY] in CONNECTION_ERRORS:
+                return self._primary(
+                    con_handle, method_name, method_param, priority
+                )
+            with self._lock:
+                self.hedge_wins += 1
+            return response_json
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                response_json = future.result()
+                if pending and response_json[RETURN_KEY] in CONNECTION_ERRORS:
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return response_json
+        return response_json
+
+    def summary(self) -> dict:
+        """Latency summary with the hedged and won request counts."""
+
+        summary = self.stats.summary()
+        summary["hedged"] = self.hedged_calls
+        summary["hedge_wins"] = self.hedge_wins
+        return summary
+
+    def close(self) -> None:
+        """Disconnect the spare connections and stop the workers."""
+
+        self._primaries.shutdown(wait=False)
+        self._hedges.shutdown(wait=False)
+        self.pool.close()
+
+
+def enable_hedging(
+    con_handle: ConnectionHandler,
+    client_api_version: int,
+    pool_size: int = 1,
+    percentile: float = DEFAULT_PERCENTILE,
+    timeout: float | None = None,
+) -> str:
+    """Hedge the slow read-only requests of a connection.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection,
+        connected over TCP.
+        client_api_version: Client supported API version.
+        pool_size: Number of spare connections to the mainframe.
+        percentile: Percentile of the latencies of a method after which
+        its requests are hedged.
+        timeout: Optional socket timeout in seconds of the spares.
+
+    Returns:
+        String value representing request status.
+    """
+
+    if not con_handle.sock or not con_handle.port_num or pool_size < 1:
+        return "NullPtrArgument"
+
+    disable_hedging(con_handle)
+    return_var, pool = open_pool(
+        con_handle.ip_address,
+        con_handle.port_num,
+        pool_size,
+        client_api_version,
+        timeout,
+    )
+    if pool is not None:
+        con_handle.hedge = Hedger(pool, percentile)
+    return return_var
+
+
+def disable_hedging(con_handle: ConnectionHandler) -> None:
+    """Stop hedging and disconnect the spare connections."""
+
+    hedge, con_handle.hedge = con_handle.hedge, None
+    if hedge is not None:
+        hedge.close()
@@ -60,6 +60,20 @@ def json_rpc_create_request(
     return request_json.encode("utf-8")
 
 
+def json_rpc_create_response(request_id: int, response: dict) -> bytes:
+    """``Create`` ``JSON-RPC`` server response from a parsed response"""
+
+    if set(response) == {RETURN_KEY}:
+        result = response[RETURN_KEY]
+    else:
+        result = response
+    json_obj = OrderedDict(
+        [("jsonrpc", "2.0"), ("result", result), ("id", request_id)]
+    )
+    response_json = json.dumps(json_obj, separators=(",", ":")) + "\0"
+    return response_json.encode("utf-8")
+
+
 def json_rpc_check_errors(request_id: int, response_dict: dict) -> int:
     """Check for errors in JSON-RPC response"""
 
@@ -94,7 +108,13 @@ def json_rpc_parse_response(
 ) -> dict:
     """``Parse`` ``JSON-RPC`` response"""
 
-    parsed_json = json.loads(response_json[:-1])
+    if not response_json:
+        return {RETURN_KEY: GHSReturnValue["NOK"]}
+    # Payloads read through the frame decoder are already stripped of
+    # the trailing NUL
+    if response_json[-1] == 0:
+        response_json = response_json[:-1]
+    parsed_json = json.loads(response_json)
     # Check if retrevied JSON has any error code in it
     return_var = json_rpc_check_errors(request_id, parsed_json)
     if return_var != GHSReturnValue["OK"]:
@@ -0,0 +1,340 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Load generator measuring how many clients a mainframe serves.
+
+Usage::
+
+    ghs-load-test 10.0.0.1 --clients 16 --duration 30 \
+        --call ghs_get_acquisition_state=5 \
+        --call ghs_get_sample_rate:A=2 --call ghs_get_disk_space
+
+Every virtual client is a thread with its own connection, calling the
+GHS methods of the mix at random in proportion to their weights, with an
+optional pause between calls like a polling monitor. The report lists
+the achieved calls per second, the latency percentiles per method and
+the returned statuses, so runs with a growing number of clients show
+where control latency starts to degrade.
+"""
+
+import argparse
+import collections
+import random
+import sys
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from .fleet import parse_address
+from .ghsapi import GHS
+from .scheduling import percentile
+
+DEFAULT_MIX = [
+    "ghs_get_acquisition_state=4",
+    "ghs_get_disk_space=1",
+    "ghs_get_sync_status=1",
+    "ghs_get_current_access=1",
+]
+PERCENTILES = (50, 90, 99)
+
+
+class Call(NamedTuple):
+    """A GHS method with arguments and weight in the mix."""
+
+    name: str
+    args: tuple = ()
+    weight: float = 1.0
+
+
+def _parse_value(text: str) -> int | float | str:
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_call(spec: str) -> Call:
+    """Parse a call given as 'name[:arg,...][=weight]'.
+
+    Arguments are passed as int or float when they parse as such, else
+    as string.
+
+    Raises:
+        ValueError: The name is no GHS method or the weight no number.
+    """
+
+    call, _, weight = spec.partition("=")
+    name, _, args = call.partition(":")
+    if not name.startswith("ghs_") or not callable(getattr(GHS, name, None)):
+        raise ValueError(f"unknown GHS method {name!r}")
+    return Call(
+        name,
+        tuple(_parse_value(arg) for arg in args.split(",") if arg),
+        float(weight) if weight else 1.0,
+    )
+
+
+class LoadReport:
+    """Calls, latencies and statuses of a load test.
+
+    Attributes:
+        clients: Number of virtual clients.
+        elapsed: Length of the test in seconds.
+        latencies: Latencies in seconds per method name.
+        statuses: Number of calls per returned status.
+        connect_failures: Number of clients that could not connect.
+    """
+
+    def __init__(self, clients: int) -> None:
+        self.clients = clients
+        self.elapsed = 0.0
+        self.latencies = collections.defaultdict(list)
+        self.statuses = collections.Counter()
+        self.connect_failures = 0
+
+    @property
+    def calls(self) -> int:
+        """Number of calls made."""
+
+        return sum(len(values) for values in self.latencies.values())
+
+    @property
+    def rate(self) -> float:
+        """Achieved calls per second over all clients."""
+
+        return self.calls / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other: "LoadReport") -> None:
+        """Add the calls of another report."""
+
+        for name, values in other.latencies.items():
+            self.latencies[name].extend(values)
+        self.statuses.update(other.statuses)
+        self.connect_failures += other.connect_failures
+
+    def format(self) -> str:
+        """Return the report as text."""
+
+        lines = [
+            f"{self.clients} clients, {self.calls} calls in "
+            f"{self.elapsed:.1f} s, {self.rate:.1f} calls/s",
+            "method"
+            + "".join(f"  p{p:<4}" for p in PERCENTILES)
+            + "  max     (ms)",
+        ]
+        for name, values in sorted(self.latencies.items()):
+            lines.append(
+                name
+                + "".join(
+                    f"  {percentile(values, p) * 1000:<6.2f}"
+                    for p in PERCENTILES
+                )
+                + f"  {max(values) * 1000:.2f}"
+            )
+        lines.append(
+            "statuses: "
+            + ", ".join(
+                f"{status} {count}"
+                for status, count in self.statuses.most_common()
+            )
+        )
+        if self.connect_failures:
+            lines.append(f"{self.connect_failures} clients failed to connect")
+        return "\n".join(lines)
+
+
+def _status(result) -> str:
+    return result if isinstance(result, str) else result[0]
+
+
+def _virtual_client(
+    connect: Callable[[GHS], str],
+    mix: list[Call],
+    seed: int,
+    start: threading.Barrier,
+    stop: threading.Event,
+    interval: float,
+    max_calls: int | None,
+    report: LoadReport,
+) -> None:
+    gen = GHS()
+    try:
+        connected = connect(gen) == "OK"
+    except Exception as any_exception:
+        # Reported like a status, the client must still reach the start
+        report.statuses[type(any_exception).__name__] += 1
+        connected = False
+    if not connected:
+        report.connect_failures += 1
+    start.wait()
+    if not connected:
+        return
+
+    rng = random.Random(seed)
+    weights = [call.weight for call in mix]
+    calls = 0
+    try:
+        while not stop.is_set() and (max_calls is None or calls < max_calls):
+            call = rng.choices(mix, weights)[0]
+            method = getattr(gen, call.name)
+            begin = time.perf_counter()
+            try:
+                status = _status(method(*call.args))
+            except Exception as any_exception:
+                status = type(any_exception).__name__
+            report.latencies[call.name].append(time.perf_counter() - begin)
+            report.statuses[status] += 1
+            calls += 1
+            if interval:
+                stop.wait(interval)
+    finally:
+        gen.ghs_disconnect()
+
+
+def run_load(
+    connect: Callable[[GHS], str],
+    mix: list[Call],
+    clients: int,
+    duration: float | None = None,
+    calls: int | None = None,
+    interval: float = 0.0,
+    seed: int | None = None,
+) -> LoadReport:
+    """Run virtual clients calling a mix of GHS methods.
+
+    All clients connect first and start calling together. The test ends
+    after duration seconds or when every client made its calls.
+
+    Args:
+        connect: Connects a GHS instance, e.g. with ghs_connect(), and
+        returns the status.
+        mix: Calls to choose from.
+        clients: Number of virtual clients.
+        duration: Longest test length in seconds.
+        calls: Number of calls per client.
+        interval: Pause in seconds after each call of a client.
+        seed: Random seed for reproducible call sequences.
+
+    Returns:
+        The merged report of all clients.
+    """
+
+    rng = random.Random(seed)
+    start = threading.Barrier(clients + 1)
+    stop = threading.Event()
+    reports = [LoadReport(1) for _ in range(clients)]
+    threads = [
+        threading.Thread(
+            target=_virtual_client,
+            args=(
+                connect,
+                mix,
+                rng.random(),
+                start,
+                stop,
+                interval,
+                calls,
+                report,
+            ),
+            daemon=True,
+        )
+        for report in reports
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    deadline = None if duration is None else began + duration
+    for thread in threads:
+        timeout = None
+        if deadline is not None:
+            timeout = max(deadline - time.perf_counter(), 0.0)
+        thread.join(timeout)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    report = LoadReport(clients)
+    report.elapsed = time.perf_counter() - began
+    for client_report in reports:
+        report.merge(client_report)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    parser = argparse.ArgumentParser(
+        prog="ghs-load-test",
+        description="Measure mainframe throughput with virtual clients.",
+    )
+    parser.add_argument("address", help="mainframe address as host[:port]")
+    parser.add_argument(
+        "--clients", type=int, default=1, help="number of virtual clients"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="test length in s"
+    )
+    parser.add_argument("--calls", type=int, help="calls per client")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.0,
+        help="pause after each call of a client in s",
+    )
+    parser.add_argument(
+        "--call",
+        action="append",
+        metavar="NAME[:ARG,...][=WEIGHT]",
+        help="GHS method in the mix, may be repeated",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=10.0, help="request timeout in s"
+    )
+    parser.add_argument("--seed", type=int, help="random seed")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = [parse_call(spec) for spec in args.call or DEFAULT_MIX]
+    except ValueError as error:
+        parser.error(str(error))
+    host, port = parse_address(args.address)
+
+    report = run_load(
+        lambda gen: gen.ghs_connect(host, port, args.timeout),
+        mix,
+        args.clients,
+        args.duration,
+        args.calls,
+        args.interval,
+        args.seed,
+    )
+    print(report.format())
+    return 1 if report.connect_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
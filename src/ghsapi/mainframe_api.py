@@ -25,6 +25,7 @@
 """Mainframe module interface."""
 
 from .connection import ConnectionHandler
+from .ghsapi_results import DiskSpace, MainframeInfo
 from .ghsapi_states import (
     RETURN_KEY,
     GHSReturnValue,
@@ -37,7 +38,7 @@ from .ghsapi_states import (
 
 def get_mainframe_info(
     con_handle: ConnectionHandler,
-) -> tuple[str, str | None, str | None, str | None, str | None]:
+) -> MainframeInfo:
     """Interface to determine type, name, serial number and firmware
     version information for the connected mainframe.
 
@@ -55,36 +56,21 @@ def get_mainframe_info(
         "GetMainframeInformation", None
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "MainframeType",
-                "MainframeName",
-                "SerialNumber",
-                "FirmwareVersion",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-            None,
-            None,
-        )
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["MainframeType"],
-        response_json["MainframeName"],
-        response_json["SerialNumber"],
-        response_json["FirmwareVersion"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return MainframeInfo(status)
+    return MainframeInfo(
+        status,
+        response_json.get("MainframeType"),
+        response_json.get("MainframeName"),
+        response_json.get("SerialNumber"),
+        response_json.get("FirmwareVersion"),
     )
 
 
 def get_disk_space(
     con_handle: ConnectionHandler,
-) -> tuple[str, float | None, float | None]:
+) -> DiskSpace:
     """Interface to get total and available mainframe internal disk
     space.
 
@@ -98,24 +84,13 @@ def get_disk_space(
 
     response_json = con_handle.send_request_wait_response("DiskSpace", None)
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "TotalSize",
-                "AvailableSize",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["TotalSize"],
-        response_json["AvailableSize"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return DiskSpace(status)
+    return DiskSpace(
+        status,
+        response_json.get("TotalSize"),
+        response_json.get("AvailableSize"),
     )
 
 
@@ -24,11 +24,53 @@
 
 """Manage mainframe settings module interface."""
 
+import hashlib
+from typing import BinaryIO, Callable
+
 from .connection import ConnectionHandler
+from .ghsapi_results import CurrentSettings
 from .ghsapi_states import RETURN_KEY, GHSReturnValue, to_string
 
+SETTINGS_CHUNK_SIZE = 1048576
+
+
+def settings_digest(blob: str | bytes) -> str:
+    """Content hash of a settings blob.
+
+    Args:
+        blob: Settings blob as returned by get_current_settings.
+
+    Returns:
+        Hexadecimal SHA-256 digest of the blob.
+    """
+
+    if isinstance(blob, str):
+        blob = blob.encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def current_settings_digest(con_handle: ConnectionHandler) -> str | None:
+    """Content hash of the current mainframe settings.
+
+    The hash cached on the connection is used when available, otherwise
+    the settings are fetched. Changes made by other connected clients
+    are not detected by the cache.
 
-def apply_persisted_settings(con_handle: ConnectionHandler) -> str:
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+
+    Returns:
+        Hexadecimal digest, or None when the settings could not be read.
+    """
+
+    if con_handle.settings_digest is None:
+        get_current_settings(con_handle)
+    return con_handle.settings_digest
+
+
+def apply_persisted_settings(
+    con_handle: ConnectionHandler, skip_if_unchanged: bool = False
+) -> str:
     """A mainframe might contain persisted settings (being applied upon
     boot). This method re-applies these settings. In Perception this
     maps on the 'Configured boot' feature.
@@ -37,16 +79,35 @@ def apply_persisted_settings(con_handle: ConnectionHandler) -> str:
     This function overwrites any previously set settings and / or
     persisted settings.
 
+    With skip_if_unchanged the request is skipped when the current
+    settings are known to equal the persisted settings. This is known
+    after settings were persisted or applied through this connection.
+
     Args:
         con_handle: A unique identifier per mainframe connection.
+        skip_if_unchanged: Skip applying settings that are already
+        active.
 
     Returns:
        String value representing request status.
     """
 
+    persisted_digest = con_handle.persisted_settings_digest
+    if (
+        skip_if_unchanged
+        and persisted_digest is not None
+        and current_settings_digest(con_handle) == persisted_digest
+    ):
+        return "OK"
+
     response_json = con_handle.send_request_wait_response(
         "ApplyPersistedSettings", None
     )
+    if response_json[RETURN_KEY] == GHSReturnValue["OK"]:
+        if persisted_digest is None and skip_if_unchanged:
+            persisted_digest = current_settings_digest(con_handle)
+            con_handle.persisted_settings_digest = persisted_digest
+        con_handle.settings_digest = persisted_digest
     return to_string(response_json[RETURN_KEY], GHSReturnValue)
 
 
@@ -65,12 +126,15 @@ def persist_current_settings(con_handle: ConnectionHandler) -> str:
     response_json = con_handle.send_request_wait_response(
         "PersistCurrentSettings", None
     )
+    if response_json[RETURN_KEY] == GHSReturnValue["OK"]:
+        con_handle.persisted_settings_digest = con_handle.settings_digest
     return to_string(response_json[RETURN_KEY], GHSReturnValue)
 
 
 def get_current_settings(
     con_handle: ConnectionHandler,
-) -> tuple[str, bytes | None, int | None]:
+    progress: Callable[[int, int], None] | None = None,
+) -> CurrentSettings:
     """Retrieves the current mainframe settings as a blob.
 
     As this blob can be of variable size, it is upon the caller to
@@ -79,38 +143,32 @@ def get_current_settings(
 
     Args:
         con_handle: A unique identifier per mainframe connection.
+        progress: Optional callback receiving received and total bytes
+        of the response.
 
     Returns:
         Tuple with status, base name and index of the recording file.
     """
 
     response_json = con_handle.send_request_wait_response(
-        "GetCurrentSettings", None
+        "GetCurrentSettings", None, progress
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "Size",
-                "Blob",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["Blob"],
-        response_json["Size"],
-    )
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return CurrentSettings(status)
+    blob = response_json.get("Blob")
+    if blob is not None:
+        con_handle.settings_digest = settings_digest(blob)
+    return CurrentSettings(status, blob, response_json.get("Size"))
 
 
 def set_current_settings(
-    con_handle: ConnectionHandler, blob: bytes, blob_size: int
+    con_handle: ConnectionHandler,
+    blob: bytes,
+    blob_size: int,
+    progress: Callable[[int, int], None] | None = None,
+    skip_if_unchanged: bool = False,
 ) -> str:
     """Applies the mainframe settings contained in the input argument.
 
@@ -119,10 +177,18 @@ def set_current_settings(
 
     The system needs to be idle before calling this function.
 
+    With skip_if_unchanged the content hash of the blob is compared to
+    the hash of the current settings first, and the request is skipped
+    when they match.
+
     Args:
         con_handle: A unique identifier per mainframe connection.
         blob: Settings blob.
         blob_size: Size of the settings blob.
+        progress: Optional callback receiving sent and total bytes of
+        the request.
+        skip_if_unchanged: Skip applying settings that are already
+        active.
 
     Returns:
         String value representing request status.
@@ -131,9 +197,99 @@ def set_current_settings(
     if not blob or not blob_size:
         return "NullPtrArgument"
 
+    digest = settings_digest(blob)
+    if skip_if_unchanged and current_settings_digest(con_handle) == digest:
+        return "OK"
+
     current_settings_dict = {"Blob": blob, "Size": blob_size}
     response_json = con_handle.send_request_wait_response(
-        "SetCurrentSettings", current_settings_dict
+        "SetCurrentSettings", current_settings_dict, progress
     )
+    if response_json[RETURN_KEY] == GHSReturnValue["OK"]:
+        con_handle.settings_digest = digest
 
     return to_string(response_json[RETURN_KEY], GHSReturnValue)
+
+
+def save_current_settings(
+    con_handle: ConnectionHandler,
+    file_obj: BinaryIO,
+    progress: Callable[[int, int], None] | None = None,
+    chunk_size: int = SETTINGS_CHUNK_SIZE,
+) -> tuple[str, int | None]:
+    """Streams the current mainframe settings blob to a file-like
+    object.
+
+    The blob is written in chunks of chunk_size bytes, so no encoded
+    copy of the whole blob is made.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        file_obj: Binary file-like object to write the blob to.
+        progress: Optional callback receiving received and total bytes
+        of the response.
+        chunk_size: Number of bytes written per call.
+
+    Returns:
+        Tuple with status and size of the settings blob.
+    """
+
+    if file_obj is None or chunk_size <= 0:
+        return "NullPtrArgument", None
+
+    return_var, blob, blob_size = get_current_settings(con_handle, progress)
+    if return_var != "OK" or blob is None:
+        return return_var, None
+
+    if isinstance(blob, str):
+        for offset in range(0, len(blob), chunk_size):
+            file_obj.write(blob[offset : offset + chunk_size].encode("utf-8"))
+    else:
+        with memoryview(blob) as blob_view:
+            for offset in range(0, len(blob_view), chunk_size):
+                file_obj.write(blob_view[offset : offset + chunk_size])
+    return return_var, blob_size
+
+
+def load_current_settings(
+    con_handle: ConnectionHandler,
+    source: BinaryIO | bytes | bytearray | memoryview,
+    progress: Callable[[int, int], None] | None = None,
+    skip_if_unchanged: bool = False,
+) -> str:
+    """Applies a settings blob read from a file-like object or buffer.
+
+    Buffers are decoded in place without an intermediate bytes copy.
+
+    The system needs to be idle before calling this function.
+
+    Args:
+        con_handle: A unique identifier per mainframe connection.
+        source: Binary file-like object or buffer holding the blob.
+        progress: Optional callback receiving sent and total bytes of
+        the request.
+        skip_if_unchanged: Skip applying settings that are already
+        active.
+
+    Returns:
+        String value representing request status.
+    """
+
+    if source is None:
+        return "NullPtrArgument"
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        blob_bytes = source
+    else:
+        blob_bytes = source.read()
+
+    with memoryview(blob_bytes) as blob_view:
+        blob_size = blob_view.nbytes
+        try:
+            blob = str(blob_view, "utf-8")
+        except UnicodeDecodeError:
+            return "InvalidUTF8Character"
+
+    return set_current_settings(
+        con_handle, blob, blob_size, progress, skip_if_unchanged
+    )
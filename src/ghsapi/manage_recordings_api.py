@@ -25,6 +25,7 @@
 """Manage recordings module interface."""
 
 from .connection import ConnectionHandler
+from .ghsapi_results import HighLowRateStorage, RecordingName
 from .ghsapi_states import (
     RETURN_KEY,
     GHSEnableDisable,
@@ -32,6 +33,7 @@ from .ghsapi_states import (
     GHSReturnValue,
     GHSStorageLocation,
     from_string,
+    optional_to_string,
     to_string,
 )
 
@@ -75,7 +77,7 @@ def delete_last_recording(con_handle: ConnectionHandler) -> str:
 
 def get_recording_name(
     con_handle: ConnectionHandler,
-) -> tuple[str, str | None, int | None]:
+) -> RecordingName:
     """Interface to get recording base name and recording index of the
     last recording file.
 
@@ -92,24 +94,13 @@ def get_recording_name(
         "GetRecordingName", None
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "RecordingIndex",
-                "RecordingName",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["RecordingName"],
-        response_json["RecordingIndex"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return RecordingName(status)
+    return RecordingName(
+        status,
+        response_json.get("RecordingName"),
+        response_json.get("RecordingIndex"),
     )
 
 
@@ -218,7 +209,7 @@ def get_high_low_rate_storage_enabled(
     con_handle: ConnectionHandler,
     source: str | int,
     slot_id: str,
-) -> tuple[str, str | None, str | None]:
+) -> HighLowRateStorage:
     """Interface to retrieve storage enabled status of high and low
     rate data for the specified recording data source.
 
@@ -254,24 +245,17 @@ def get_high_low_rate_storage_enabled(
         "GetHighLowRateStorageEnabled", source_slot_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "HighRateEnable",
-                "LowRateEnable",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-        )
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        to_string(response_json["HighRateEnable"], GHSEnableDisable),
-        to_string(response_json["LowRateEnable"], GHSEnableDisable),
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return HighLowRateStorage(status)
+    return HighLowRateStorage(
+        status,
+        optional_to_string(
+            response_json.get("HighRateEnable"), GHSEnableDisable
+        ),
+        optional_to_string(
+            response_json.get("LowRateEnable"), GHSEnableDisable
+        ),
     )
 
 
@@ -25,6 +25,7 @@
 """Recorder module interface."""
 
 from .connection import ConnectionHandler
+from .ghsapi_results import RecorderInfo
 from .ghsapi_states import (
     RETURN_KEY,
     GHSDigitalOutMode,
@@ -168,7 +169,7 @@ def get_recorder_enabled(
 
 def get_recorder_info(
     con_handle: ConnectionHandler, slot_id: str
-) -> tuple[str, str | None, str | None, str | None, str | None]:
+) -> RecorderInfo:
     """Determine type, name, serial number and firmware version
     information for a recorder.
 
@@ -188,7 +189,7 @@ def get_recorder_info(
     """
 
     if not slot_id:
-        return "NullPtrArgument", None, None, None, None
+        return RecorderInfo("NullPtrArgument")
 
     recorder_info_dict = {
         "SlotId": slot_id,
@@ -198,31 +199,15 @@ def get_recorder_info(
         "GetRecorderInformation", recorder_info_dict
     )
 
-    if (
-        not any(
-            key in response_json
-            for key in [
-                "RecorderType",
-                "RecorderName",
-                "SerialNumber",
-                "FirmwareVersion",
-            ]
-        )
-    ) or (response_json[RETURN_KEY] != GHSReturnValue["OK"]):
-        return (
-            to_string(response_json[RETURN_KEY], GHSReturnValue),
-            None,
-            None,
-            None,
-            None,
-        )
-
-    return (
-        to_string(response_json[RETURN_KEY], GHSReturnValue),
-        response_json["RecorderType"],
-        response_json["RecorderName"],
-        response_json["SerialNumber"],
-        response_json["FirmwareVersion"],
+    status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+    if status != "OK":
+        return RecorderInfo(status)
+    return RecorderInfo(
+        status,
+        response_json.get("RecorderType"),
+        response_json.get("RecorderName"),
+        response_json.get("SerialNumber"),
+        response_json.get("FirmwareVersion"),
     )
 
 
@@ -0,0 +1,269 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Recording lifecycle with preflight checks and automatic naming.
+
+Usage::
+
+    session = gen.ghs_recording_session("run", min_free_space=5.0)
+    for _ in range(1000):
+        with session:
+            gen.ghs_trigger()
+        if session.status != "OK":
+            break
+
+Starting a recording takes three round trips. The acquisition state,
+disk space, storage location and last recording name are read with one
+pipelined batch, then the next recording name is set and the recording
+is started once the name is accepted. Stopping polls the acquisition
+state with a growing interval until the mainframe is idle again, so
+short recordings are noticed quickly without flooding the mainframe
+during long saves.
+"""
+
+import time
+
+from .connection import ConnectionHandler
+from .ghsapi_results import RecordingPreflight
+from .ghsapi_states import (
+    RETURN_KEY,
+    GHSAcquisitionState,
+    GHSReturnValue,
+    GHSStorageLocation,
+    optional_to_string,
+    to_string,
+)
+
+# Disk space in GB that needs to be available to start a recording
+DEFAULT_MIN_FREE_SPACE = 1.0
+# First and longest interval in seconds between acquisition state polls
+MIN_POLL_INTERVAL = 0.01
+MAX_POLL_INTERVAL = 0.5
+
+_PREFLIGHT_REQUESTS = [
+    ("GetAcquisitionState", None),
+    ("DiskSpace", None),
+    ("GetStorageLocation", None),
+    ("GetRecordingName", None),
+]
+
+
+class RecordingSession:
+    """Starts and stops numbered recordings on one mainframe.
+
+    Leaving the with block stops the recording and waits until the data
+    is saved, the recording is not started when a preflight check
+    fails.
+
+    Attributes:
+        base_name: Base name of the recordings, None keeps the base name
+        of the last recording.
+        min_free_space: Disk space in GB needed to start a recording.
+        status: Status of the last start, stop or wait.
+        preflight_result: RecordingPreflight of the last start.
+        recording_index: Index of the last started recording.
+    """
+
+    def __init__(
+        self,
+        con_handle: ConnectionHandler,
+        base_name: str | None = None,
+        min_free_space: float = DEFAULT_MIN_FREE_SPACE,
+    ) -> None:
+        self._con_handle = con_handle
+        self.base_name = base_name
+        self.min_free_space = min_free_space
+        self.status = None
+        self.preflight_result = None
+        self.recording_index = None
+        self._recording = False
+
+    def __enter__(self) -> "RecordingSession":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if self._recording:
+            self.stop()
+        return False
+
+    def preflight(self) -> RecordingPreflight:
+        """Check whether a recording can be started.
+
+        The mainframe needs to be idle and have a storage location. A
+        local disk needs at least min_free_space GB available, the disk
+        space of remote storage is not checked.
+
+        Returns:
+            Tuple with status, acquisition state, storage location,
+            available disk space and the name of the last recording.
+        """
+
+        responses = self._con_handle.send_requests_pipelined(
+            _PREFLIGHT_REQUESTS
+        )
+        state_json, disk_json, storage_json, name_json = responses
+        for response_json in (state_json, storage_json, name_json):
+            if response_json[RETURN_KEY] != GHSReturnValue["OK"]:
+                return RecordingPreflight(
+                    to_string(response_json[RETURN_KEY], GHSReturnValue)
+                )
+        acquisition_state = optional_to_string(
+            state_json.get("GHSAcquisitionState"), GHSAcquisitionState
+        )
+        storage_location = optional_to_string(
+            storage_json.get("StorageLocation"), GHSStorageLocation
+        )
+        available_space = disk_json.get("AvailableSize")
+
+        if acquisition_state != "Idle":
+            status = "SystemNotIdle"
+        elif storage_location in (None, "Reserved"):
+            status = "IncompatibleStorage"
+        elif storage_location == "Remote":
+            # DiskSpace reports the local disk only
+            status = "OK"
+        elif disk_json[RETURN_KEY] != GHSReturnValue["OK"]:
+            status = to_string(disk_json[RETURN_KEY], GHSReturnValue)
+        elif available_space is None or available_space < self.min_free_space:
+            status = "InsufficientDiskSpace"
+        else:
+            status = "OK"
+        return RecordingPreflight(
+            status,
+            acquisition_state,
+            storage_location,
+            available_space,
+            name_json.get("RecordingName"),
+            name_json.get("RecordingIndex"),
+        )
+
+    def start(self) -> str:
+        """Run the preflight checks and start the next recording.
+
+        The recording index continues from the last recording, it starts
+        at 1 when the base name differs from the last recording.
+
+        Returns:
+            String value representing request status.
+        """
+
+        self.preflight_result = self.preflight()
+        if self.preflight_result.status != "OK":
+            self.status = self.preflight_result.status
+            return self.status
+
+        base_name = self.base_name or self.preflight_result.recording_base_name
+        if (
+            base_name != self.preflight_result.recording_base_name
+            or self.preflight_result.recording_index is None
+        ):
+            recording_index = 1
+        else:
+            recording_index = self.preflight_result.recording_index + 1
+
+        # Started only once the name is accepted, a recording started
+        # under the previous name would keep its data when stopped.
+        name_json = self._con_handle.send_request_wait_response(
+            "SetRecordingName",
+            {
+                "RecordingBaseName": base_name,
+                "RecordingIndex": recording_index,
+            },
+        )
+        if name_json[RETURN_KEY] != GHSReturnValue["OK"]:
+            self.status = to_string(name_json[RETURN_KEY], GHSReturnValue)
+            return self.status
+
+        start_json = self._con_handle.send_request_wait_response(
+            "StartRecording", None
+        )
+        self.status = to_string(start_json[RETURN_KEY], GHSReturnValue)
+        if start_json[RETURN_KEY] == GHSReturnValue["OK"]:
+            self.recording_index = recording_index
+            self._recording = True
+        return self.status
+
+    def stop(self, wait: bool = True, timeout: float | None = None) -> str:
+        """Stop the recording.
+
+        Args:
+            wait: Wait until the recorded data is saved.
+            timeout: Longest time to wait in seconds, None waits
+            without limit.
+
+        Returns:
+            String value representing request status.
+        """
+
+        response_json = self._con_handle.send_request_wait_response(
+            "StopRecording", None
+        )
+        self._recording = False
+        self.status = to_string(response_json[RETURN_KEY], GHSReturnValue)
+        if self.status == "OK" and wait:
+            return self.wait_until_idle(timeout)
+        return self.status
+
+    def wait_until_idle(self, timeout: float | None = None) -> str:
+        """Wait until the mainframe is idle.
+
+        The acquisition state is polled, the interval between polls
+        doubles from MIN_POLL_INTERVAL up to MAX_POLL_INTERVAL.
+
+        Args:
+            timeout: Longest time to wait in seconds, None waits
+            without limit.
+
+        Returns:
+            OK when the mainframe is idle, MainframeTimeout when the
+            timeout expired, else the failed request status.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = MIN_POLL_INTERVAL
+        while True:
+            response_json = self._con_handle.send_request_wait_response(
+                "GetAcquisitionState", None
+            )
+            if response_json[RETURN_KEY] != GHSReturnValue["OK"]:
+                self.status = to_string(
+                    response_json[RETURN_KEY], GHSReturnValue
+                )
+                return self.status
+            if (
+                response_json.get("GHSAcquisitionState")
+                == GHSAcquisitionState["Idle"]
+            ):
+                self.status = "OK"
+                return self.status
+            delay = interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.status = "MainframeTimeout"
+                    return self.status
+                delay = min(delay, remaining)
+            time.sleep(delay)
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
@@ -0,0 +1,173 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Priority scheduling of the requests on a connection.
+
+Requests of all threads share one connection. The connection is handed
+to the waiting request with the most urgent priority first, and to
+waiters of the same priority in arrival order. Pipelined batches check
+for more urgent waiters between requests: they stop sending, read the
+responses still in flight and let the waiter go first. A Trigger sent
+while a large inventory is read so waits at most for one window of
+responses.
+"""
+
+import collections
+import heapq
+import itertools
+import threading
+
+# Priority classes, lower values go first
+PRIORITY_CLASSES = {"control": 0, "normal": 1, "bulk": 2}
+CONTROL = PRIORITY_CLASSES["control"]
+NORMAL = PRIORITY_CLASSES["normal"]
+BULK = PRIORITY_CLASSES["bulk"]
+
+# Latency samples kept per priority class for the percentiles
+LATENCY_SAMPLES = 1024
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """Nearest rank percentile of unsorted values, None when empty."""
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(len(ordered) * percent / 100.0 + 0.5), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class PriorityLock:
+    """Reentrant lock granted in priority order.
+
+    Used as context manager it is acquired with NORMAL priority.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._owner = None
+        self._count = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def __enter__(self) -> "PriorityLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+
+    def acquire(self, priority: int = NORMAL) -> bool:
+        """Wait until no more urgent or earlier waiter is left."""
+
+        me = threading.get_ident()
+        with self._condition:
+            if self._owner == me:
+                self._count += 1
+                return True
+            entry = (priority, next(self._sequence), me)
+            heapq.heappush(self._waiters, entry)
+            while self._owner is not None or self._waiters[0] is not entry:
+                self._condition.wait()
+            heapq.heappop(self._waiters)
+            self._owner = me
+            self._count = 1
+            return True
+
+    def release(self) -> None:
+        """Release the lock, waking up the waiters.
+
+        Raises:
+            RuntimeError: The lock is not held by this thread.
+        """
+
+        with self._condition:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+            self._count -= 1
+            if not self._count:
+                self._owner = None
+                self._condition.notify_all()
+
+    def urgent_waiting(self, priority: int) -> bool:
+        """True when a more urgent request waits for the lock."""
+
+        waiters = self._waiters
+        return bool(waiters) and waiters[0][0] < priority
+
+    def yield_to_urgent(self, priority: int) -> None:
+        """Let more urgent waiters go first, then take the lock back.
+
+        Does nothing when the lock is held more than once, the holder
+        then expects the connection to stay its own.
+        """
+
+        if self._count != 1 or not self.urgent_waiting(priority):
+            return
+        self.release()
+        self.acquire(priority)
+
+
+class LatencyStats:
+    """Latencies of the requests of one priority class.
+
+    Attributes:
+        count: Number of requests.
+        total: Sum of the latencies in seconds.
+        maximum: Longest latency in seconds.
+    """
+
+    def __init__(self, samples: int = LATENCY_SAMPLES) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self._recent = collections.deque(maxlen=samples)
+        self._lock = threading.Lock()
+
+    def add(self, latency: float) -> None:
+        """Record the latency of a request in seconds."""
+
+        with self._lock:
+            self.count += 1
+            self.total += latency
+            self.maximum = max(self.maximum, latency)
+            self._recent.append(latency)
+
+    def percentile(self, percent: float) -> float | None:
+        """Nearest rank percentile of the recent latencies."""
+
+        with self._lock:
+            recent = list(self._recent)
+        return percentile(recent, percent)
+
+    def summary(self) -> dict:
+        """Count, mean, median, 99th percentile and maximum latency."""
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.maximum if self.count else None,
+        }
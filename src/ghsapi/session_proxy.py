@@ -0,0 +1,352 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Local proxy keeping mainframe sessions warm for short-lived clients.
+
+Usage::
+
+    ghs-session-proxy --socket-dir /run/ghs 10.0.0.1 10.0.0.2:8006
+
+The proxy keeps one connection per mainframe open and listens on a Unix
+socket per mainframe, e.g. /run/ghs/10.0.0.1_8006.sock, speaking the
+same framing and JSON-RPC protocol as the mainframe. Clients connect
+with GHS.ghs_connect_proxy() and use the API as usual; Connect and
+Disconnect are answered by the proxy, all other requests of all clients
+share the warm session one at a time.
+
+Answers to read-only requests are cached for a short time and shared
+between clients. Any other request clears the cache of its mainframe.
+Changes made by other clients of the mainframe, e.g. Perception, are
+seen once the cached answer expires.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+
+from . import json_rpc
+from .connection import RECV_BUFFER_SIZE, ConnectionHandler
+from .connection_api import connect, disconnect
+from .fleet import parse_address
+from .framing import FrameDecoder, encode_frame
+from .ghsapi import CLIENT_API_VERSION
+from .ghsapi_states import READ_ONLY_METHODS, RETURN_KEY, GHSReturnValue
+
+if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+    raise ImportError("the session proxy requires Unix domain sockets")
+
+DEFAULT_CACHE_TTL = 1.0
+DEFAULT_TIMEOUT = 30.0
+
+# Read-only methods whose answers change without any request
+UNCACHED_METHODS = frozenset(
+    [
+        "DiskSpace",
+        "GetAcquisitionStartTime",
+        "GetAcquisitionState",
+        "GetAcquisitionTime",
+        "GetCurrentAccess",
+        "GetSyncStatus",
+    ]
+)
+
+_CONNECTION_ERRORS = (
+    GHSReturnValue["NoConnection"],
+    GHSReturnValue["MainframeTimeout"],
+)
+
+
+def socket_path(socket_dir: str, address: str) -> str:
+    """Path of the proxy socket for a mainframe.
+
+    Args:
+        socket_dir: Directory holding the proxy sockets.
+        address: Mainframe address as 'host[:port]'.
+
+    Returns:
+        Path of the Unix socket.
+    """
+
+    host, port = parse_address(address)
+    return os.path.join(socket_dir, f"{host}_{port}.sock")
+
+
+class MainframeSession:
+    """Warm connection to one mainframe shared by proxy clients.
+
+    The connection is made on the first request and made again after
+    it was lost.
+
+    Attributes:
+        address: Mainframe address as 'host[:port]'.
+        timeout: Socket timeout in seconds, None for no timeout.
+        cache_ttl: Seconds a cached read-only answer is used, 0 to
+        disable the cache.
+        cache_hits: Number of requests answered from the cache.
+        forwarded: Number of requests sent to the mainframe.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.address = address
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.forwarded = 0
+        self._con_handle = None
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def request(self, method_name: str, method_param: dict | None) -> dict:
+        """Answer a client request.
+
+        Args:
+            method_name: Request method name.
+            method_param: Request method parameter.
+
+        Returns:
+            Dict representing the response.
+        """
+
+        if method_name == "Connect":
+            if (method_param or {}).get(
+                "ClientAPIVersion"
+            ) != CLIENT_API_VERSION:
+                return {RETURN_KEY: GHSReturnValue["APIMismatch"]}
+            with self._lock:
+                return self._connect() or {RETURN_KEY: GHSReturnValue["OK"]}
+        if method_name == "Disconnect":
+            return {RETURN_KEY: GHSReturnValue["OK"]}
+
+        cacheable = (
+            self.cache_ttl > 0
+            and method_name in READ_ONLY_METHODS
+            and method_name not in UNCACHED_METHODS
+        )
+        key = (method_name, json.dumps(method_param, sort_keys=True))
+        with self._lock:
+            if cacheable:
+                cached = self._cache.get(key)
+                if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                    self.cache_hits += 1
+                    return cached[1]
+
+            response_json = self._forward(method_name, method_param)
+            if (
+                response_json[RETURN_KEY] in _CONNECTION_ERRORS
+                and method_name in READ_ONLY_METHODS
+            ):
+                response_json = self._forward(method_name, method_param)
+
+            if method_name not in READ_ONLY_METHODS:
+                self._cache.clear()
+            elif (
+                cacheable and response_json[RETURN_KEY] == GHSReturnValue["OK"]
+            ):
+                self._cache[key] = (time.monotonic(), response_json)
+            return response_json
+
+    def close(self) -> None:
+        """Disconnect from the mainframe."""
+
+        with self._lock:
+            if self._con_handle is not None:
+                disconnect(self._con_handle)
+                self._drop()
+
+    def _connect(self) -> dict | None:
+        """Connect when not connected, return the failure response."""
+
+        if self._con_handle is not None:
+            return None
+        con_handle = ConnectionHandler()
+        host, port = parse_address(self.address)
+        status = connect(
+            con_handle, host, port, CLIENT_API_VERSION, self.timeout
+        )
+        if status != "OK":
+            con_handle.connection_close()
+            return {RETURN_KEY: GHSReturnValue[status]}
+        self._con_handle = con_handle
+        return None
+
+    def _drop(self) -> None:
+        """Close a lost connection and forget the cached answers."""
+
+        self._con_handle.connection_close()
+        self._con_handle = None
+        self._cache.clear()
+
+    def _forward(self, method_name: str, method_param: dict | None) -> dict:
+        """Send a request on the warm connection."""
+
+        error_json = self._connect()
+        if error_json:
+            return error_json
+        self.forwarded += 1
+        response_json = self._con_handle.send_request_wait_response(
+            method_name, method_param
+        )
+        if response_json[RETURN_KEY] in _CONNECTION_ERRORS:
+            self._drop()
+        return response_json
+
+
+class _ClientHandler(socketserver.BaseRequestHandler):
+    """Serves the requests of one proxy client in order."""
+
+    def handle(self):
+        decoder = FrameDecoder()
+        while True:
+            try:
+                data = self.request.recv(RECV_BUFFER_SIZE)
+                if not data:
+                    return
+                payloads = decoder.feed(data)
+            except (OSError, ValueError):
+                return
+            for payload in payloads:
+                try:
+                    request = json.loads(payload)
+                    request_id = request["id"]
+                    method_name = request["method"]
+                except (ValueError, KeyError, TypeError):
+                    return
+                response_json = self.server.session.request(
+                    method_name, request.get("params")
+                )
+                self.request.sendall(
+                    encode_frame(
+                        json_rpc.json_rpc_create_response(
+                            request_id, response_json
+                        )
+                    )
+                )
+
+
+class SessionProxyServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server forwarding to one mainframe session."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, session: MainframeSession) -> None:
+        if os.path.exists(path):
+            os.unlink(path)
+        self.session = session
+        super().__init__(path, _ClientHandler)
+        os.chmod(path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def serve(
+    addresses: list[str],
+    socket_dir: str,
+    timeout: float | None = DEFAULT_TIMEOUT,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+) -> list[SessionProxyServer]:
+    """Start one proxy server per mainframe in background threads.
+
+    Args:
+        addresses: Mainframe addresses as 'host[:port]'.
+        socket_dir: Directory for the proxy sockets, created if needed.
+        timeout: Socket timeout in seconds for the mainframe sessions.
+        cache_ttl: Seconds a cached read-only answer is used.
+
+    Returns:
+        List of running servers, stop them with shutdown().
+    """
+
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    servers = []
+    for address in addresses:
+        server = SessionProxyServer(
+            socket_path(socket_dir, address),
+            MainframeSession(address, timeout, cache_ttl),
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    parser = argparse.ArgumentParser(
+        prog="ghs-session-proxy",
+        description="Keep mainframe sessions warm for local clients.",
+    )
+    parser.add_argument(
+        "addresses", nargs="+", help="mainframe addresses as host[:port]"
+    )
+    parser.add_argument(
+        "--socket-dir", required=True, help="directory for the sockets"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="socket timeout per mainframe in seconds",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help="seconds read-only answers are shared, 0 disables the cache",
+    )
+    args = parser.parse_args(argv)
+
+    servers = serve(
+        args.addresses, args.socket_dir, args.timeout, args.cache_ttl
+    )
+    for server in servers:
+        print(f"{server.session.address}: {server.server_address}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+            server.session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
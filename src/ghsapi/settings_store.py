@@ -0,0 +1,230 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Local content addressed store of mainframe settings blobs.
+
+Blobs are stored once per content hash, compressed with zlib. Every
+archived snapshot is recorded in an append-only index together with the
+mainframe serial number and the time it was taken.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+
+from . import mainframe_api as _mainframe
+from . import manage_mainframe_settings as _settings
+from .connection import ConnectionHandler
+
+INDEX_FILE = "index.jsonl"
+OBJECTS_DIR = "objects"
+# Hexadecimal SHA-256 digest as returned by settings_digest
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+class SettingsStore:
+    """Deduplicating archive of mainframe settings.
+
+    Attributes:
+        root: Directory holding the store.
+        compression_level: zlib compression level for new blobs.
+    """
+
+    def __init__(self, root: str, compression_level: int = 6):
+        self.root = root
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._snapshots = []
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+
+        index_path = os.path.join(root, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as index_file:
+                for line in index_file:
+                    if line.strip():
+                        self._snapshots.append(json.loads(line))
+
+    def __contains__(self, digest: str) -> bool:
+        try:
+            return os.path.exists(self._object_path(digest))
+        except ValueError:
+            return False
+
+    def _object_path(self, digest: str) -> str:
+        """Path of a blob, raises ValueError for a malformed digest."""
+
+        if not isinstance(digest, str) or not _DIGEST.fullmatch(digest):
+            raise ValueError(f"Invalid settings digest: {digest!r}")
+        return os.path.join(self.root, OBJECTS_DIR, digest[:2], digest)
+
+    def put(
+        self,
+        blob: str | bytes,
+        serial_number: str | None = None,
+        timestamp: float | None = None,
+    ) -> str:
+        """Store a settings blob and record a snapshot of it.
+
+        The blob content is only written when no identical blob is
+        stored yet.
+
+        Args:
+            blob: Settings blob.
+            serial_number: Serial number of the mainframe.
+            timestamp: Time of the snapshot, defaults to now.
+
+        Returns:
+            Content hash of the blob.
+        """
+
+        if isinstance(blob, str):
+            blob = blob.encode("utf-8")
+        digest = _settings.settings_digest(blob)
+        snapshot = {
+            "digest": digest,
+            "size": len(blob),
+            "serial_number": serial_number,
+            "timestamp": time.time() if timestamp is None else timestamp,
+        }
+
+        with self._lock:
+            object_path = self._object_path(digest)
+            if not os.path.exists(object_path):
+                object_dir = os.path.dirname(object_path)
+                os.makedirs(object_dir, exist_ok=True)
+                file_desc, temp_path = tempfile.mkstemp(dir=object_dir)
+                with os.fdopen(file_desc, "wb") as object_file:
+                    object_file.write(
+                        zlib.compress(blob, self.compression_level)
+                    )
+                os.replace(temp_path, object_path)
+
+            with open(
+                os.path.join(self.root, INDEX_FILE), "a", encoding="utf-8"
+            ) as index_file:
+                index_file.write(json.dumps(snapshot) + "\n")
+            self._snapshots.append(snapshot)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Read a stored settings blob.
+
+        Args:
+            digest: Content hash of the blob.
+
+        Returns:
+            Bytes of the settings blob.
+
+        Raises:
+            KeyError: When no blob with this hash is stored.
+            ValueError: When the digest is no SHA-256 hex digest.
+        """
+
+        try:
+            with open(self._object_path(digest), "rb") as object_file:
+                return zlib.decompress(object_file.read())
+        except FileNotFoundError as not_found:
+            raise KeyError(digest) from not_found
+
+    def snapshots(self, serial_number: str | None = None) -> list[dict]:
+        """List recorded snapshots, oldest first.
+
+        Args:
+            serial_number: Only list snapshots of this mainframe.
+
+        Returns:
+            List of snapshot records with digest, size, serial number
+            and timestamp.
+        """
+
+        with self._lock:
+            snapshots = list(self._snapshots)
+        if serial_number is not None:
+            snapshots = [
+                snapshot
+                for snapshot in snapshots
+                if snapshot["serial_number"] == serial_number
+            ]
+        return sorted(snapshots, key=lambda snapshot: snapshot["timestamp"])
+
+    def latest(self, serial_number: str) -> dict | None:
+        """Most recent snapshot of a mainframe, or None."""
+
+        snapshots = self.snapshots(serial_number)
+        return snapshots[-1] if snapshots else None
+
+    def archive(self, con_handle: ConnectionHandler) -> tuple[str, str | None]:
+        """Store the current settings of a connected mainframe.
+
+        Args:
+            con_handle: A unique identifier per mainframe connection.
+
+        Returns:
+            Tuple with status and content hash of the stored blob.
+        """
+
+        return_var, blob, _ = _settings.get_current_settings(con_handle)
+        if return_var != "OK" or blob is None:
+            return return_var, None
+
+        return_var, _, _, serial_number, _ = _mainframe.get_mainframe_info(
+            con_handle
+        )
+        if return_var != "OK":
+            return return_var, None
+        return return_var, self.put(blob, serial_number)
+
+    def restore(self, con_handle: ConnectionHandler, digest: str) -> str:
+        """Apply a stored blob unless the mainframe already has it.
+
+        The content hash of the current settings cached on the
+        connection is used when available, see
+        set_current_settings.
+
+        The system needs to be idle before calling this function.
+
+        Args:
+            con_handle: A unique identifier per mainframe connection.
+            digest: Content hash of the blob to apply.
+
+        Returns:
+            String value representing request status.
+        """
+
+        if not digest:
+            return "NullPtrArgument"
+        try:
+            blob = self.get(digest)
+        except KeyError:
+            return "NOK"
+        except ValueError:
+            return "InvalidDataType"
+
+        return _settings.load_current_settings(
+            con_handle, blob, skip_if_unchanged=True
+        )
@@ -0,0 +1,180 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Setup transaction with rollback to the settings at its start.
+
+Usage::
+
+    with gen.ghs_setup_transaction() as transaction:
+        for channel_index in range(1, 33):
+            gen.ghs_set_span_and_offset("A", channel_index, 10.0, 1.0)
+    if transaction.result.rolled_back:
+        print("setup failed:", transaction.result.status)
+
+The current settings blob is read once when the transaction starts. The
+setters are staged and sent pipelined at the end. Other writes, e.g.
+SetUserMode or Zeroing, are sent right away. When any write fails, or
+the with block raises after some writes were sent, the blob is applied
+again with a single SetCurrentSettings request instead of undoing every
+write.
+"""
+
+from .connection import ConnectionHandler
+from .ghsapi_results import TransactionResult
+from .ghsapi_states import (
+    RETURN_KEY,
+    SETTINGS_PRESERVING_METHODS,
+    GHSReturnValue,
+    to_string,
+)
+from .manage_mainframe_settings import (
+    get_current_settings,
+    set_current_settings,
+)
+from .write_staging import WriteStaging
+
+
+class SetupTransaction:
+    """Context manager applying setter calls all or nothing.
+
+    Attributes:
+        status: Status of reading the settings at the start, the
+        transaction only proceeds when it is OK.
+        result: TransactionResult at the end, None before.
+    """
+
+    def __init__(self, con_handle: ConnectionHandler) -> None:
+        self._con_handle = con_handle
+        self._staging = WriteStaging(con_handle)
+        self._snapshot = None
+        # Method name and status of each write sent in the transaction
+        self._writes = []
+        self.status = None
+        self.result = None
+
+    def __enter__(self) -> "SetupTransaction":
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def begin(self) -> str:
+        """Read the current settings and start staging setter calls.
+
+        Returns:
+            String value representing request status.
+        """
+
+        self._snapshot = get_current_settings(self._con_handle)
+        self.status = self._snapshot.status
+        self._writes = []
+        self._con_handle.response_observers.append(self._observe)
+        self._con_handle.begin_staging()
+        return self.status
+
+    def _observe(self, method_name: str, response_json: dict) -> None:
+        if method_name not in SETTINGS_PRESERVING_METHODS:
+            self._writes.append((method_name, response_json[RETURN_KEY]))
+
+    def _detach(self) -> None:
+        if self._observe in self._con_handle.response_observers:
+            self._con_handle.response_observers.remove(self._observe)
+
+    def _failed_write(self) -> str:
+        """Status of the first failed write, OK when none failed."""
+
+        for _, return_var in self._writes:
+            if return_var != GHSReturnValue["OK"]:
+                return to_string(return_var, GHSReturnValue)
+        return "OK"
+
+    def commit(self) -> TransactionResult:
+        """Send the staged calls, roll back when any write failed.
+
+        When reading the settings at the start failed, the staged calls
+        are dropped instead.
+
+        Returns:
+            Status of the first failed call or OK, whether the settings
+            were rolled back and the status per sent call.
+        """
+
+        if self.status != "OK":
+            self._staging.discard()
+            self._detach()
+            self.result = TransactionResult(self.status)
+            return self.result
+
+        staged = self._staging.commit()
+        self._detach()
+        status = staged.status
+        if status == "OK":
+            status = self._failed_write()
+        if status == "OK":
+            self.result = TransactionResult("OK", statuses=staged.statuses)
+            return self.result
+        self.result = TransactionResult(
+            status, True, self.rollback(), staged.statuses
+        )
+        return self.result
+
+    def abort(self) -> TransactionResult:
+        """Drop the staged calls and roll back writes already sent.
+
+        Staged calls are sent before the end of the transaction when
+        another request, e.g. a getter, was made inside it. Writes that
+        are not staged are always sent at once.
+
+        Returns:
+            Result with status NOK and whether the settings were rolled
+            back.
+        """
+
+        self._staging.discard()
+        self._detach()
+        if self._writes and self.status == "OK":
+            self.result = TransactionResult("NOK", True, self.rollback())
+        else:
+            self.result = TransactionResult("NOK")
+        return self.result
+
+    def rollback(self) -> str:
+        """Apply the settings read at the start of the transaction.
+
+        Returns:
+            String value representing request status.
+        """
+
+        if self._snapshot is None or self._snapshot.status != "OK":
+            return "NOK"
+        return set_current_settings(
+            self._con_handle,
+            self._snapshot.blob,
+            self._snapshot.blob_size,
+        )
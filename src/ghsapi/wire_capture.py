@@ -0,0 +1,412 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Capture of the wire traffic of a connection and its replay.
+
+Usage::
+
+    with gen.ghs_capture_wire("setup.ghswire"):
+        run_setup_sequence(gen)
+
+    ghs-wire-replay setup.ghswire --port 8006 --latency-scale 0.5
+
+The capture file holds every request and response payload with the time
+since the capture started, gzip compressed when the path ends in .gz.
+The replay server answers the requests of each client with the captured
+responses, delayed by the captured latency times the latency scale, so
+client changes can be benchmarked without a mainframe. Requests are
+matched to captured ones by method and parameters, then by method, in
+capture order. Requests missing from the capture are answered with a
+method not found error.
+"""
+
+import argparse
+import collections
+import gzip
+import json
+import queue
+import socketserver
+import sys
+import threading
+import time
+from struct import Struct
+from typing import BinaryIO, NamedTuple
+
+from .connection import RECV_BUFFER_SIZE, ConnectionHandler
+from .framing import FrameDecoder, encode_frame
+
+MAGIC = b"GHSWIRE1"
+REQUEST = 0
+RESPONSE = 1
+DEFAULT_PORT = 8006
+
+# Record kind, seconds since the capture started, payload size
+_RECORD = Struct("!BdI")
+
+
+class CaptureRecord(NamedTuple):
+    """One captured frame payload."""
+
+    kind: int
+    timestamp: float
+    payload: bytes
+
+
+class Exchange(NamedTuple):
+    """A captured request with its response and latency."""
+
+    method: str
+    params: dict | None
+    response: dict
+    latency: float
+
+
+def _open(path: str, mode: str) -> BinaryIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class WireCapture:
+    """Writes the traffic of a connection to a capture file.
+
+    Use as context manager, or call start() and stop().
+
+    Attributes:
+        path: Path of the capture file.
+        records: Number of records written.
+    """
+
+    def __init__(self, con_handle: ConnectionHandler, path: str) -> None:
+        self._con_handle = con_handle
+        self.path = path
+        self.records = 0
+        self._file = None
+        self._start = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "WireCapture":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.stop()
+        return False
+
+    def start(self) -> None:
+        """Create the capture file and attach to the connection."""
+
+        self._file = _open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._start = time.perf_counter()
+        self._con_handle.capture = self
+
+    def stop(self) -> None:
+        """Detach from the connection and close the capture file."""
+
+        if self._con_handle.capture is self:
+            self._con_handle.capture = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def sent(self, payload: bytes) -> None:
+        """Record the payload of a request frame."""
+
+        self._write(REQUEST, payload)
+
+    def received(self, payload: bytes) -> None:
+        """Record the payload of a response frame."""
+
+        self._write(RESPONSE, payload)
+
+    def _write(self, kind: int, payload: bytes) -> None:
+        timestamp = time.perf_counter() - self._start
+        if payload[-1:] == b"\0":
+            payload = payload[:-1]
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD.pack(kind, timestamp, len(payload)))
+            self._file.write(payload)
+            self.records += 1
+
+
+def read_capture(path: str) -> list[CaptureRecord]:
+    """Read the records of a capture file.
+
+    Raises:
+        ValueError: The file is not a capture file.
+    """
+
+    with _open(path, "rb") as capture_file:
+        data = capture_file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a wire capture")
+
+    records = []
+    offset = len(MAGIC)
+    while offset + _RECORD.size <= len(data):
+        kind, timestamp, size = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        records.append(
+            CaptureRecord(kind, timestamp, data[offset : offset + size])
+        )
+        offset += size
+    return records
+
+
+def pair_exchanges(records: list[CaptureRecord]) -> list[Exchange]:
+    """Pair captured requests and responses by their JSON-RPC id.
+
+    Returns:
+        Exchanges in request order, requests without response are left
+        out.
+    """
+
+    pending = {}
+    exchanges = {}
+    for order, record in enumerate(records):
+        message = json.loads(record.payload)
+        if record.kind == REQUEST:
+            pending[message.get("id")] = (order, record)
+            continue
+        order, request = pending.pop(message.get("id"), (None, None))
+        if request is None:
+            continue
+        request_json = json.loads(request.payload)
+        exchanges[order] = Exchange(
+            request_json.get("method"),
+            request_json.get("params"),
+            message,
+            record.timestamp - request.timestamp,
+        )
+    return [exchanges[order] for order in sorted(exchanges)]
+
+
+def _params_key(method: str, params: dict | None) -> tuple[str, str]:
+    return method, json.dumps(params, sort_keys=True)
+
+
+class _Matcher:
+    """Hands out the captured exchanges of one replay client."""
+
+    def __init__(self, exchanges: list[Exchange]) -> None:
+        self._exchanges = exchanges
+        self._used = [False] * len(exchanges)
+        self._by_params = collections.defaultdict(collections.deque)
+        self._by_method = collections.defaultdict(collections.deque)
+        for index, exchange in enumerate(exchanges):
+            key = _params_key(exchange.method, exchange.params)
+            self._by_params[key].append(index)
+            self._by_method[exchange.method].append(index)
+
+    def match(self, method: str, params: dict | None) -> Exchange | None:
+        for candidates in (
+            self._by_params.get(_params_key(method, params)),
+            self._by_method.get(method),
+        ):
+            while candidates:
+                index = candidates.popleft()
+                if not self._used[index]:
+                    self._used[index] = True
+                    return self._exchanges[index]
+        return None
+
+
+class _ReplayHandler(socketserver.BaseRequestHandler):
+    """Answers the requests of one client from the capture."""
+
+    def handle(self):
+        matcher = _Matcher(self.server.exchanges)
+        outgoing = queue.Queue()
+        sender = threading.Thread(
+            target=self._send, args=(outgoing,), daemon=True
+        )
+        sender.start()
+        decoder = FrameDecoder()
+        last_due = 0.0
+        try:
+            while True:
+                try:
+                    data = self.request.recv(RECV_BUFFER_SIZE)
+                    if not data:
+                        return
+                    payloads = decoder.feed(data)
+                except (OSError, ValueError):
+                    return
+                arrival = time.perf_counter()
+                for payload in payloads:
+                    try:
+                        request = json.loads(payload)
+                        request_id = request["id"]
+                        method = request["method"]
+                    except (ValueError, KeyError, TypeError):
+                        return
+                    exchange = matcher.match(method, request.get("params"))
+                    if exchange is None:
+                        self.server.count_unmatched()
+                        response = {
+                            "jsonrpc": "2.0",
+                            "error": {
+                                "code": -32601,
+                                "message": "Method not in capture",
+                            },
+                            "id": request_id,
+                        }
+                        due = arrival
+                    else:
+                        response = dict(exchange.response, id=request_id)
+                        due = (
+                            arrival
+                            + exchange.latency * self.server.latency_scale
+                        )
+                    # Responses leave in request order
+                    last_due = max(due, last_due)
+                    outgoing.put(
+                        (
+                            last_due,
+                            encode_frame(
+                                json.dumps(
+                                    response, separators=(",", ":")
+                                ).encode("utf-8")
+                                + b"\0"
+                            ),
+                        )
+                    )
+        finally:
+            outgoing.put(None)
+            sender.join()
+
+    def _send(self, outgoing: queue.Queue) -> None:
+        while True:
+            item = outgoing.get()
+            if item is None:
+                return
+            due, frame = item
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.request.sendall(frame)
+            except OSError:
+                return
+
+
+class ReplayServer(socketserver.ThreadingTCPServer):
+    """TCP server replaying a capture to every client.
+
+    Attributes:
+        exchanges: Captured exchanges served to each client.
+        latency_scale: Factor applied to the captured latencies, 0
+        answers at once.
+        unmatched: Number of requests missing from the capture.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        exchanges: list[Exchange],
+        address: tuple[str, int] = ("127.0.0.1", DEFAULT_PORT),
+        latency_scale: float = 1.0,
+    ) -> None:
+        self.exchanges = exchanges
+        self.latency_scale = latency_scale
+        self.unmatched = 0
+        self._unmatched_lock = threading.Lock()
+        super().__init__(address, _ReplayHandler)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        address: tuple[str, int] = ("127.0.0.1", DEFAULT_PORT),
+        latency_scale: float = 1.0,
+    ) -> "ReplayServer":
+        """Create a replay server for a capture file."""
+
+        return cls(pair_exchanges(read_capture(path)), address, latency_scale)
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on."""
+
+        return self.server_address[1]
+
+    def count_unmatched(self) -> None:
+        """Count a request missing from the capture."""
+
+        with self._unmatched_lock:
+            self.unmatched += 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+
+    parser = argparse.ArgumentParser(
+        prog="ghs-wire-replay",
+        description="Serve a wire capture as a mainframe.",
+    )
+    parser.add_argument("capture", help="capture file")
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="address to listen on"
+    )
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help="port to listen on"
+    )
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="factor for the captured latencies, 0 answers at once",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        server = ReplayServer.from_file(
+            args.capture, (args.host, args.port), args.latency_scale
+        )
+    except (OSError, ValueError) as error:
+        print(f"ghs-wire-replay: {error}", file=sys.stderr)
+        return 2
+    print(
+        f"Replaying {len(server.exchanges)} exchanges on "
+        f"{args.host}:{server.port}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.unmatched:
+            print(f"{server.unmatched} requests not in the capture")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Staging of setter calls with write coalescing.
+
+Usage::
+
+    with gen.ghs_staged_writes() as staging:
+        gen.ghs_set_span_and_offset("A", 1, 10.0, 1.0)
+        gen.ghs_set_auto_range("A", 1, "Enable", 1.0)
+        gen.ghs_set_span_and_offset("A", 1, 20.0, 1.0)
+    print(staging.result)
+
+Only the last span and offset of channel A1 is sent, after the auto
+range setting. The calls are sent pipelined when the with block ends.
+"""
+
+from .connection import ConnectionHandler
+from .ghsapi_results import StagedWritesResult
+from .ghsapi_states import RETURN_KEY, GHSReturnValue, to_string
+
+
+class WriteStaging:
+    """Context manager staging the setter calls on a connection.
+
+    Leaving the with block commits the staged calls, an exception
+    discards them.
+
+    Attributes:
+        result: StagedWritesResult of the commit, None before.
+    """
+
+    def __init__(self, con_handle: ConnectionHandler) -> None:
+        self._con_handle = con_handle
+        self.result = None
+
+    def __enter__(self) -> "WriteStaging":
+        self._con_handle.begin_staging()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def commit(self) -> StagedWritesResult:
+        """Send the staged calls and stop staging.
+
+        Returns:
+            Status of the first failed call or OK, the number of staged
+            and of sent calls, and the status per sent call.
+        """
+
+        staged_calls = self._con_handle.staged_calls
+        statuses = [
+            to_string(response_json[RETURN_KEY], GHSReturnValue)
+            for _, _, response_json in self._con_handle.commit_staging()
+        ]
+        status = next((status for status in statuses if status != "OK"), "OK")
+        self.result = StagedWritesResult(
+            status, staged_calls, len(statuses), statuses
+        )
+        return self.result
+
+    def discard(self) -> int:
+        """Drop the staged calls and stop staging.
+
+        Returns:
+            Number of dropped calls.
+        """
+
+        return self._con_handle.discard_staging()
@@ -0,0 +1,109 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Fakes of the mainframe shared by the unit tests."""
+
+import json
+import os
+import socketserver
+import sys
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import framing
+
+
+class FakeSocket:
+    """Socket answering requests with OK or a preset result."""
+
+    def __init__(self):
+        self.methods = []
+        self.params = []
+        self.results = {}
+        self.replies = b""
+        self.decoder = framing.FrameDecoder()
+
+    def send(self, data):
+        for payload in self.decoder.feed(bytes(data)):
+            request = json.loads(payload)
+            self.methods.append(request["method"])
+            self.params.append(request.get("params"))
+            self.replies += framing.encode_frame(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "result": self.results.get(request["method"], 1),
+                        "id": request["id"],
+                    }
+                ).encode()
+                + b"\0"
+            )
+        return len(data)
+
+    def recv(self, size):
+        data, self.replies = self.replies[:size], self.replies[size:]
+        return data
+
+
+class FakeMainframe(socketserver.ThreadingTCPServer):
+    """Mainframe answering OK, with two slots, recording the methods."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.methods = []
+        super().__init__(("127.0.0.1", 0), FakeMainframeHandler)
+
+
+class FakeMainframeHandler(socketserver.BaseRequestHandler):
+    """Serves one connection of the fake mainframe."""
+
+    def handle(self):
+        decoder = framing.FrameDecoder()
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            for payload in decoder.feed(data):
+                request = json.loads(payload)
+                self.server.methods.append(request["method"])
+                result = 1
+                if request["method"] == "GetSlotCount":
+                    result = {"GHSReturnValue": 1, "SlotCount": 2}
+                self.request.sendall(
+                    framing.encode_frame(
+                        json.dumps(
+                            {
+                                "jsonrpc": "2.0",
+                                "result": result,
+                                "id": request["id"],
+                            }
+                        ).encode()
+                        + b"\0"
+                    )
+                )
@@ -0,0 +1,234 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Access monitor unit test."""
+
+import os
+import sys
+import threading
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import access_monitor, connection, ghsapi_states
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+
+def access_result(access):
+    return {
+        RETURN_KEY: GHSReturnValue["OK"],
+        "Access": ghsapi_states.GHSAccess[access],
+    }
+
+
+class TestAccessMonitor(unittest.TestCase):
+    """Access monitor unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = connection.ConnectionHandler()
+        self.con_handle.sock = FakeSocket()
+        self.con_handle.sock.results["GetCurrentAccess"] = access_result(
+            "ReadOnly"
+        )
+        self.monitor = None
+
+    def tearDown(self):
+        if self.monitor:
+            self.monitor.stop()
+
+    def set_sample_rate(self):
+        return self.con_handle.send_request_wait_response(
+            "SetSampleRate", {"SlotId": "A", "SampleRate": 1000.0}
+        )
+
+    def test_blocked_without_round_trip(self):
+        """Test write answered locally while access is ReadOnly"""
+
+        changes = []
+        self.monitor = access_monitor.AccessMonitor(self.con_handle, 60)
+        self.monitor.add_listener(lambda old, new: changes.append(new))
+        self.monitor.start()
+        self.monitor.wait_for_write_access(0)
+        self.assertEqual(self.monitor.access, "ReadOnly", "Poll failed.")
+        self.assertEqual(
+            self.set_sample_rate(),
+            {RETURN_KEY: GHSReturnValue["WriteAccessBlocked"]},
+            "Write not blocked.",
+        )
+        self.assertNotIn(
+            "SetSampleRate", self.con_handle.sock.methods, "Write sent."
+        )
+        self.assertEqual(changes, ["ReadOnly"], "Change event failed.")
+
+    def test_failed_poll_keeps_access(self):
+        """Test writes still blocked when a poll fails"""
+
+        self.monitor = access_monitor.AccessMonitor(self.con_handle, 60)
+        self.monitor.start()
+        self.assertEqual(self.monitor.poll(), "ReadOnly", "Poll failed.")
+        self.con_handle.sock.results["GetCurrentAccess"] = {
+            RETURN_KEY: GHSReturnValue["MainframeTimeout"]
+        }
+        self.assertEqual(
+            self.monitor.poll(), "ReadOnly", "Access lost on failure."
+        )
+        self.assertEqual(
+            self.set_sample_rate(),
+            {RETURN_KEY: GHSReturnValue["WriteAccessBlocked"]},
+            "Write gate opened by a failed poll.",
+        )
+
+    def test_learn_from_response(self):
+        """Test access learned from a blocked write response"""
+
+        self.monitor = access_monitor.AccessMonitor(self.con_handle)
+        self.con_handle.response_observers.append(self.monitor._observe)
+        self.con_handle.sock.results["SetSampleRate"] = GHSReturnValue[
+            "WriteAccessBlocked"
+        ]
+        self.set_sample_rate()
+        self.assertEqual(
+            self.monitor.access, "ReadOnly", "Access not learned."
+        )
+        self.con_handle.sock.results["SetSampleRate"] = 1
+        self.monitor._update(None)
+        self.set_sample_rate()
+        self.assertEqual(
+            self.monitor.access, "ReadWrite", "Write access not learned."
+        )
+
+    def test_block_writes(self):
+        """Test write waiting until write access returns"""
+
+        self.monitor = access_monitor.AccessMonitor(
+            self.con_handle, 0.01, block_writes=True, block_timeout=5
+        ).start()
+        self.monitor.poll()
+        results = []
+        writer = threading.Thread(
+            target=lambda: results.append(self.set_sample_rate())
+        )
+        writer.start()
+        writer.join(0.1)
+        self.assertEqual(results, [], "Write not blocked.")
+
+        self.con_handle.sock.results["GetCurrentAccess"] = access_result(
+            "ReadWrite"
+        )
+        writer.join(5)
+        self.assertEqual(
+            results,
+            [{RETURN_KEY: GHSReturnValue["OK"]}],
+            "Blocked write not sent.",
+        )
+
+    def test_staged_writes_kept(self):
+        """Test polls neither flushing nor blocking on staged writes"""
+
+        self.monitor = access_monitor.AccessMonitor(
+            self.con_handle, 0.01, block_writes=True, block_timeout=5
+        )
+        self.monitor.poll()
+        self.con_handle.begin_staging()
+        self.set_sample_rate()
+        self.monitor.start()
+        while self.con_handle.sock.methods.count("GetCurrentAccess") < 4:
+            threading.Event().wait(0.01)
+        self.assertNotIn(
+            "SetSampleRate", self.con_handle.sock.methods, "Poll flushed."
+        )
+
+        results = []
+        writer = threading.Thread(
+            target=lambda: results.append(self.con_handle.commit_staging())
+        )
+        writer.start()
+        writer.join(0.05)
+        self.assertEqual(results, [], "Staged write not blocked.")
+        self.con_handle.sock.results["GetCurrentAccess"] = access_result(
+            "ReadWrite"
+        )
+        writer.join(5)
+        self.assertEqual(
+            [response for _, _, response in results[0]],
+            [{RETURN_KEY: GHSReturnValue["OK"]}],
+            "Staged write not sent once access returned.",
+        )
+
+    def test_concurrent_staging(self):
+        """Test setters staged during a flush not dropped"""
+
+        self.con_handle.sock.results["GetCurrentAccess"] = access_result(
+            "ReadWrite"
+        )
+        self.con_handle.begin_staging()
+        threads = [
+            threading.Thread(
+                target=lambda slot_id=slot_id: [
+                    self.con_handle.send_request_wait_response(
+                        "SetSampleRate",
+                        {"SlotId": slot_id, "SampleRate": 1000.0},
+                    ),
+                    self.con_handle.send_request_wait_response(
+                        "GetCurrentAccess", None
+                    ),
+                ]
+            )
+            for slot_id in "ABCDEFGH"
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.con_handle.commit_staging()
+        self.assertEqual(
+            sorted(
+                params["SlotId"]
+                for method, params in zip(
+                    self.con_handle.sock.methods, self.con_handle.sock.params
+                )
+                if method == "SetSampleRate"
+            ),
+            list("ABCDEFGH"),
+            "Staged setter dropped.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Access Monitor Unittest Report",
+            report_title="Access Monitor Unittest Report",
+        )
+    )
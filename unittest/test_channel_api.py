@@ -460,6 +460,32 @@ class TestChannelAPI(unittest.TestCase):
                     "get_trigger_settings success response test failed.",
                 )
 
+    def test_get_trigger_settings_fields(self):
+        """Test get_trigger_settings result fields by name"""
+
+        with patch(
+            "test_connection_handler.connection.ConnectionHandler.send_request_wait_response"
+        ) as mock_req_ros:
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["OK"],
+                "TriggerMode": 1,
+                "PrimaryLevel": 10.0,
+                "SecondaryLevel": 20.0,
+                "Hysteresis": 30.0,
+                "Direction": 1,
+            }
+            result = channel_api.get_trigger_settings(self.con_handle, "A", 1)
+            self.assertEqual(result.status, "OK", "Status field failed.")
+            self.assertEqual(
+                result.trigger_mode, "Basic", "Trigger mode field failed."
+            )
+            self.assertEqual(
+                result.direction, "FallingEdge", "Direction field failed."
+            )
+            self.assertFalse(
+                hasattr(result, "__dict__"), "Result has instance dict."
+            )
+
     def test_get_trigger_settings_neg(self):
         """Test get_trigger_settings api with failure response"""
 
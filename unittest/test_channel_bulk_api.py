@@ -0,0 +1,204 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Channel bulk API unit test."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import channel_bulk_api, ghsapi_states
+
+
+class TestChannelBulkAPI(unittest.TestCase):
+    """Channel bulk API unit test."""
+
+    GHSReturnValue = ghsapi_states.GHSReturnValue
+    RETURN_KEY = ghsapi_states.RETURN_KEY
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = MagicMock()
+        self.con_handle.send_requests_pipelined.side_effect = (
+            lambda requests, window: [
+                {self.RETURN_KEY: self.GHSReturnValue["OK"]}
+            ]
+            * len(requests)
+        )
+
+    def test_set_span_and_offset_bulk(self):
+        """Test set_span_and_offset_bulk with a shared offset"""
+
+        result = channel_bulk_api.set_span_and_offset_bulk(
+            self.con_handle, "A", [1, 2, 3], [10.0, 20.0, 5], 0.0
+        )
+        self.assertEqual(
+            result,
+            ("OK", ["OK", "OK", "OK"]),
+            "set_span_and_offset_bulk success response test failed.",
+        )
+        requests = self.con_handle.send_requests_pipelined.call_args[0][0]
+        self.assertEqual(
+            requests[2],
+            (
+                "SetSpanAndOffset",
+                {
+                    "SlotId": "A",
+                    "ChannelIndex": 3,
+                    "Span": 5.0,
+                    "Offset": 0.0,
+                },
+            ),
+            "set_span_and_offset_bulk request test failed.",
+        )
+
+    def test_set_span_and_offset_bulk_neg(self):
+        """Test set_span_and_offset_bulk validation before sending"""
+
+        for indices, spans in (
+            ([1, 2], [10.0]),
+            ([1, 0], [10.0, 1.0]),
+            ([1, 2], [10.0, "1"]),
+            ([1, 2], [10.0, float("nan")]),
+        ):
+            self.assertEqual(
+                channel_bulk_api.set_span_and_offset_bulk(
+                    self.con_handle, "A", indices, spans, 0.0
+                ).status,
+                "InvalidDataType",
+                "set_span_and_offset_bulk validation test failed.",
+            )
+        self.assertEqual(
+            channel_bulk_api.set_span_and_offset_bulk(
+                self.con_handle, "", [1], 1.0, 0.0
+            ),
+            ("NullPtrArgument", None),
+            "set_span_and_offset_bulk null argument test failed.",
+        )
+        self.con_handle.send_requests_pipelined.assert_not_called()
+
+    def test_set_trigger_settings_bulk(self):
+        """Test set_trigger_settings_bulk reporting a channel failure"""
+
+        self.con_handle.send_requests_pipelined.side_effect = (
+            lambda requests, window: [
+                {self.RETURN_KEY: self.GHSReturnValue["OK"]},
+                {self.RETURN_KEY: self.GHSReturnValue["InvalidChannelIndex"]},
+            ]
+        )
+        result = channel_bulk_api.set_trigger_settings_bulk(
+            self.con_handle,
+            "A",
+            (1, 2),
+            "Dual",
+            [1.0, 2.0],
+            [3.0, 4.0],
+            0.5,
+            ["RisingEdge", 1],
+        )
+        self.assertEqual(
+            result,
+            ("InvalidChannelIndex", ["OK", "InvalidChannelIndex"]),
+            "set_trigger_settings_bulk failure status test failed.",
+        )
+        requests = self.con_handle.send_requests_pipelined.call_args[0][0]
+        self.assertEqual(
+            [request[1]["Direction"] for request in requests],
+            [0, 1],
+            "set_trigger_settings_bulk direction encoding failed.",
+        )
+        self.assertEqual(
+            requests[0][1]["TriggerMode"],
+            ghsapi_states.GHSTriggerMode["Dual"],
+            "set_trigger_settings_bulk mode encoding failed.",
+        )
+
+    def test_set_trigger_settings_bulk_neg(self):
+        """Test set_trigger_settings_bulk with an unknown direction"""
+
+        self.assertEqual(
+            channel_bulk_api.set_trigger_settings_bulk(
+                self.con_handle, "A", [1], "Dual", 1.0, 2.0, 0.5, "Up"
+            ).status,
+            "InvalidDataType",
+            "set_trigger_settings_bulk validation test failed.",
+        )
+        self.con_handle.send_requests_pipelined.assert_not_called()
+
+    @unittest.skipIf(channel_bulk_api.numpy is None, "numpy not installed")
+    def test_numpy_arrays(self):
+        """Test set_span_and_offset_bulk with NumPy arrays"""
+
+        numpy = channel_bulk_api.numpy
+        result = channel_bulk_api.set_span_and_offset_bulk(
+            self.con_handle,
+            "A",
+            numpy.arange(1, 5),
+            numpy.full(4, 10.0),
+            numpy.zeros(4, dtype=numpy.float32),
+        )
+        self.assertEqual(result.status, "OK", "NumPy bulk set failed.")
+
+    def test_iterables(self):
+        """Test set_span_and_offset_bulk with a range and a generator"""
+
+        result = channel_bulk_api.set_span_and_offset_bulk(
+            self.con_handle,
+            "A",
+            range(1, 4),
+            (span * 10.0 for span in range(1, 4)),
+            0.0,
+        )
+        self.assertEqual(result.status, "OK", "Iterable bulk set failed.")
+        requests = self.con_handle.send_requests_pipelined.call_args[0][0]
+        self.assertEqual(
+            [(param["ChannelIndex"], param["Span"]) for _, param in requests],
+            [(1, 10.0), (2, 20.0), (3, 30.0)],
+            "Iterable bulk set request test failed.",
+        )
+        self.assertEqual(
+            channel_bulk_api.set_span_and_offset_bulk(
+                self.con_handle, "A", range(1, 4), range(2), 0.0
+            ).status,
+            "InvalidDataType",
+            "Iterable length validation test failed.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Channel Bulk API Unittest Report",
+            report_title="Channel Bulk API Unittest Report",
+        )
+    )
@@ -0,0 +1,229 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Channel table unit test."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import channel_table, ghsapi_states
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+ANALOG_RESPONSES = {
+    "GetSpanAndOffset": {"Span": 10.0, "Offset": 0.5},
+    "GetFilterTypeAndFrequency": {"FilterType": 1, "Frequency": 1000.0},
+    "GetExcitation": {"ExcitationType": 0, "ExcitationValue": 5.0},
+    "GetAmplifierMode": {"AmplifierMode": 0},
+    "GetTechnicalUnits": {"UnitType": "V", "Multiplier": 1.0, "Offset": 0.0},
+    "GetTriggerSettings": {
+        "TriggerMode": 0,
+        "PrimaryLevel": 1.0,
+        "SecondaryLevel": 2.0,
+        "Hysteresis": 0.1,
+        "Direction": 1,
+    },
+}
+
+RECORDER_RESPONSES = {
+    "GetRecorderEnabled": {"IsRecorderEnabled": 1},
+    "GetSampleRate": {"SampleRate": 100000.0},
+    "GetHighLowRateStorageEnabled": {"HighRateEnable": 1, "LowRateEnable": 0},
+}
+
+
+def respond(method_name, method_param):
+    """Mainframe with slot A of two channels and an empty slot B."""
+
+    if method_name == "GetChannelCount":
+        if method_param["SlotId"] == "B":
+            return {RETURN_KEY: GHSReturnValue["EmptySlot"]}
+        return {RETURN_KEY: GHSReturnValue["OK"], "ChannelCount": 2}
+    if method_name in RECORDER_RESPONSES:
+        return {
+            RETURN_KEY: GHSReturnValue["OK"],
+            **RECORDER_RESPONSES[method_name],
+        }
+    if method_name == "GetChannelStorageEnabled":
+        return {RETURN_KEY: GHSReturnValue["OK"], "Enabled": 1}
+    if method_name == "GetChannelType":
+        channel_type = 1 if method_param["ChannelIndex"] == 1 else 3
+        return {RETURN_KEY: GHSReturnValue["OK"], "ChannelType": channel_type}
+    return {RETURN_KEY: GHSReturnValue["OK"], **ANALOG_RESPONSES[method_name]}
+
+
+class TestChannelTable(unittest.TestCase):
+    """Channel table unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = MagicMock()
+        self.con_handle.send_request_wait_response.return_value = {
+            RETURN_KEY: GHSReturnValue["OK"],
+            "SlotCount": 2,
+        }
+        self.con_handle.send_requests_pipelined.side_effect = (
+            lambda requests, window: [
+                respond(*request) for request in requests
+            ]
+        )
+
+    def test_get_channel_table(self):
+        """Test reading the channel table with pipelined requests"""
+
+        status, table = channel_table.get_channel_table(self.con_handle)
+        self.assertEqual(status, "OK", "Channel table status failed.")
+        self.assertEqual(len(table), 2, "Empty slot not skipped.")
+        self.assertEqual(
+            table.columns["channel_type"],
+            ["Analog", "TimerCounter"],
+            "Channel type column failed.",
+        )
+        self.assertEqual(
+            table.columns["filter_type"],
+            ["Butterworth", None],
+            "Analog setting column failed.",
+        )
+        self.assertEqual(
+            table.rows()[0]["trigger_direction"],
+            "FallingEdge",
+            "Row view failed.",
+        )
+        self.assertEqual(
+            self.con_handle.send_requests_pipelined.call_count,
+            5,
+            "Requests not batched.",
+        )
+
+    def test_get_recorder_table(self):
+        """Test reading the recorder table and reusing it"""
+
+        status, recorders = channel_table.get_recorder_table(self.con_handle)
+        self.assertEqual(
+            recorders.rows(),
+            [
+                {
+                    "slot_id": "A",
+                    "channel_count": 2,
+                    "recorder_enabled": "Enable",
+                    "sample_rate": 100000.0,
+                    "high_rate_storage": "Enable",
+                    "low_rate_storage": "Disable",
+                }
+            ],
+            "Recorder table failed.",
+        )
+        requests = self.con_handle.send_requests_pipelined.call_args[0][0]
+        self.assertEqual(
+            requests[-1][1],
+            {"SlotId": "A", "Source": 0},
+            "Storage request parameters failed.",
+        )
+
+        self.con_handle.send_requests_pipelined.reset_mock()
+        status, table = channel_table.get_channel_table(
+            self.con_handle, recorders=recorders
+        )
+        self.assertEqual(
+            table.columns["storage_enabled"],
+            ["Enable", "Enable"],
+            "Storage enabled column failed.",
+        )
+        self.assertEqual(
+            self.con_handle.send_requests_pipelined.call_count,
+            3,
+            "Recorder table not reused.",
+        )
+
+    def test_get_channel_table_neg(self):
+        """Test reading the channel table on a lost connection"""
+
+        self.con_handle.send_requests_pipelined.side_effect = (
+            lambda requests, window: [
+                {RETURN_KEY: GHSReturnValue["NoConnection"]}
+            ]
+            * len(requests)
+        )
+        self.assertEqual(
+            channel_table.get_channel_table(self.con_handle, ["A"]),
+            ("NoConnection", None),
+            "Channel table failure response failed.",
+        )
+
+    def test_to_columnar_fallback(self):
+        """Test plain columns when no columnar package is installed"""
+
+        _, table = channel_table.get_channel_table(self.con_handle)
+        if channel_table.pyarrow is None and channel_table.numpy is None:
+            self.assertIs(
+                table.to_columnar(),
+                table.columns,
+                "Plain column fallback failed.",
+            )
+
+    @unittest.skipIf(channel_table.numpy is None, "numpy not installed")
+    def test_to_numpy(self):
+        """Test conversion to a NumPy structured array"""
+
+        _, table = channel_table.get_channel_table(self.con_handle)
+        array = table.to_numpy()
+        self.assertEqual(
+            list(array["span"][:1]), [10.0], "NumPy column failed."
+        )
+        self.assertTrue(
+            channel_table.numpy.isnan(array["span"][1]),
+            "Missing value not NaN.",
+        )
+
+    @unittest.skipIf(channel_table.pyarrow is None, "pyarrow not installed")
+    def test_to_arrow(self):
+        """Test conversion to an Arrow table"""
+
+        _, table = channel_table.get_channel_table(self.con_handle)
+        arrow_table = table.to_arrow()
+        self.assertEqual(
+            arrow_table.column("units").to_pylist(),
+            ["V", None],
+            "Arrow column failed.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Channel Table Unittest Report",
+            report_title="Channel Table Unittest Report",
+        )
+    )
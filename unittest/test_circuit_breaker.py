@@ -0,0 +1,228 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Circuit breaker unit test."""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import (
+    circuit_breaker,
+    connection,
+    fleet,
+    fleet_settings,
+    ghsapi_states,
+)
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+
+class FakeClock:
+    """Clock advanced by the test."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeadSocket(FakeSocket):
+    """Socket failing while dead is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.dead = True
+        self.sends = 0
+
+    def send(self, data):
+        self.sends += 1
+        if self.dead:
+            raise ConnectionRefusedError()
+        return super().send(data)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Circuit breaker unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.clock = FakeClock()
+        self.breaker = circuit_breaker.CircuitBreaker(3, 10.0, self.clock)
+
+    def test_states(self):
+        """Test opening, half open probe and closing"""
+
+        self.breaker.record("NoConnection")
+        self.breaker.record("NoConnection")
+        self.breaker.record("OK")
+        self.breaker.record(GHSReturnValue["MainframeTimeout"])
+        self.breaker.record("InvalidSlotID")
+        self.assertEqual(self.breaker.state, "closed", "Opened on success.")
+
+        for _ in range(3):
+            self.breaker.record("ConnectionFailed")
+        self.assertEqual(self.breaker.state, "open", "Not opened.")
+        self.assertEqual(self.breaker.allow(), "open")
+        self.assertEqual(self.breaker.rejected_calls, 1)
+
+        self.clock.now = 10.0
+        self.assertEqual(self.breaker.allow(), "half_open", "No probe.")
+        self.assertEqual(self.breaker.allow(), "open", "Second probe.")
+        self.breaker.record("MainframeTimeout")
+        self.assertEqual(self.breaker.state, "open", "Failed probe closed.")
+
+        self.clock.now = 15.0
+        self.assertEqual(self.breaker.allow(), "open", "Reopen not timed.")
+        self.clock.now = 20.0
+        self.assertEqual(self.breaker.allow(), "half_open")
+        self.breaker.record("ReadWrite")
+        self.assertEqual(self.breaker.state, "closed", "Probe not closing.")
+        self.assertEqual(self.breaker.allow(), "closed")
+
+    def test_connection_fails_fast(self):
+        """Test requests failing without the socket while open"""
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = DeadSocket()
+        circuit_breaker.enable_circuit_breaker(con_handle, self.breaker)
+
+        for _ in range(5):
+            response_json = con_handle.send_request_wait_response(
+                "SetSampleRate", {"SlotId": "A", "SampleRate": 1e3}
+            )
+        self.assertEqual(con_handle.sock.sends, 3, "Open breaker sent.")
+        self.assertEqual(
+            response_json[RETURN_KEY], GHSReturnValue["NoConnection"]
+        )
+        self.assertEqual(
+            con_handle.send_requests_pipelined([("GetSlotCount", None)] * 2),
+            [{RETURN_KEY: GHSReturnValue["NoConnection"]}] * 2,
+        )
+
+        con_handle.sock.dead = False
+        self.clock.now = 10.0
+        con_handle.send_request_wait_response("GetSampleRate", {"SlotId": "A"})
+        self.assertEqual(
+            con_handle.sock.methods,
+            ["GetCurrentAccess", "GetSampleRate"],
+            "No probe before the request.",
+        )
+        self.assertEqual(self.breaker.state, "closed")
+
+        circuit_breaker.disable_circuit_breaker(con_handle)
+        self.assertEqual(con_handle.response_observers, [])
+
+    def test_fleet_connect(self):
+        """Test fleet connects skipped while the breaker is open"""
+
+        breakers = circuit_breaker.CircuitBreakers(2, 10.0, self.clock)
+        with patch("ghsapi.fleet.GHS.ghs_connect") as mock_connect, patch(
+            "ghsapi.fleet.GHS.ghs_disconnect"
+        ), patch("ghsapi.fleet.GHS.ghs_get_current_access") as mock_access:
+            mock_connect.return_value = "ConnectionFailed"
+            for _ in range(4):
+                with fleet.connected("10.0.0.9", 1.0, breakers) as (
+                    return_var,
+                    _,
+                ):
+                    pass
+            self.assertEqual(mock_connect.call_count, 2, "Open connected.")
+            self.assertEqual(return_var, "NoConnection")
+            self.assertEqual(breakers.states(), {"10.0.0.9": "open"})
+
+            mock_connect.return_value = "OK"
+            mock_access.return_value = "ReadWrite"
+            self.clock.now = 10.0
+            with fleet.connected("10.0.0.9", 1.0, breakers) as (
+                return_var,
+                gen,
+            ):
+                self.assertEqual(return_var, "OK", "Probe failed.")
+                self.assertIs(
+                    gen._con_handle.breaker, breakers.get("10.0.0.9")
+                )
+            mock_access.assert_called_once()
+            self.assertEqual(breakers.states(), {"10.0.0.9": "closed"})
+
+    def test_state_kept_between_runs(self):
+        """Test a sweep skipping a mainframe unreachable in a former run"""
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "breakers.json")
+            with patch("ghsapi.fleet.GHS.ghs_connect") as mock_connect, patch(
+                "ghsapi.fleet.GHS.ghs_disconnect"
+            ), patch("ghsapi.fleet.GHS.ghs_archive_current_settings") as (
+                mock_archive
+            ):
+                mock_connect.side_effect = lambda host, port, timeout: (
+                    "OK" if host == "10.0.0.1" else "ConnectionFailed"
+                )
+                mock_archive.return_value = ("OK", "digest")
+                for run in range(2):
+                    with patch("builtins.print"):
+                        fleet_settings.main(
+                            [
+                                "backup",
+                                "--store",
+                                temp_dir,
+                                "--breaker-state",
+                                path,
+                                "10.0.0.1",
+                                "10.0.0.2",
+                            ]
+                        )
+                    self.assertEqual(
+                        mock_connect.call_count,
+                        2 + run,
+                        "Unreachable mainframe connected again.",
+                    )
+
+            breakers = circuit_breaker.CircuitBreakers(
+                1, 300.0, lambda: time.time() + 300.0, path
+            )
+            self.assertEqual(breakers.get("10.0.0.2").allow(), "half_open")
+            self.assertEqual(breakers.get("10.0.0.1").allow(), "closed")
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Circuit Breaker Unittest Report",
+            report_title="Circuit Breaker Unittest Report",
+        )
+    )
@@ -0,0 +1,225 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Scheduled command unit test."""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import (
+    circuit_breaker,
+    command_scheduler,
+    connection,
+    ghsapi,
+    ghsapi_states,
+)
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+RTT = 0.004
+# Wall-clock time at perf_counter time zero of the fake clock
+EPOCH = 1_700_000_000.0
+
+
+class FakeClock:
+    """Clock advancing a tick per reading, and on sleeps and sends."""
+
+    TICK = 1e-6
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += self.TICK
+        return self.now
+
+    def wall(self):
+        return EPOCH + self()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TimedSocket(FakeSocket):
+    """Socket with a round trip, logging when requests are written."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+        self.written = []
+
+    def send(self, data):
+        request = json.loads(bytes(data)[8:].rstrip(b"\0"))
+        self.written.append((request["method"], request["id"], self.clock()))
+        self.clock.sleep(RTT)
+        return super().send(data)
+
+
+class TestCommandScheduler(unittest.TestCase):
+    """Scheduled command unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.clock = FakeClock()
+        self.con_handle = connection.ConnectionHandler()
+        self.con_handle.sock = TimedSocket(self.clock)
+        self.scheduler = command_scheduler.CommandScheduler(
+            self.con_handle,
+            probe_interval=0.02,
+            wall_clock=self.clock.wall,
+            clock=self.clock,
+            sleep=self.clock.sleep,
+        )
+
+    def test_spin_until(self):
+        """Test waking up at the deadline"""
+
+        deadline = time.perf_counter() + 0.03
+        woke_at = command_scheduler.spin_until(deadline)
+        self.assertGreaterEqual(woke_at, deadline, "Woke up early.")
+        self.assertLess(woke_at - deadline, 0.002, "Woke up late.")
+
+    def test_latency_compensated(self):
+        """Test the command written one latency before the target"""
+
+        at = self.clock.wall() + 0.2
+        result = self.scheduler.run("StartRecording", at)
+        self.assertEqual(result.status, "OK", "Command failed.")
+        self.assertEqual(result.target_time, at)
+        self.assertAlmostEqual(result.latency, RTT / 2, delta=1e-5)
+        self.assertLess(abs(result.send_error), 1e-5, "Send not precise.")
+        self.assertLess(abs(result.arrival_error), 1e-5)
+
+        written = self.con_handle.sock.written
+        method, request_id, written_at = written[-1]
+        self.assertEqual(method, "StartRecording")
+        self.assertLess(request_id, written[0][1], "Frame not prepared ahead.")
+        self.assertGreater(len(written), 6, "Not probed while waiting.")
+        self.assertAlmostEqual(
+            EPOCH + written_at + result.latency, at, delta=1e-5
+        )
+
+    def test_staged_writes_flushed(self):
+        """Test staged writes sent before the scheduled command"""
+
+        self.con_handle.begin_staging()
+        self.con_handle.send_request_wait_response(
+            "SetSampleRate", {"SampleRate": 1000}
+        )
+        result = self.scheduler.run("StartRecording", self.clock.wall())
+        self.assertEqual(result.status, "OK")
+        methods = self.con_handle.sock.methods
+        self.assertLess(
+            methods.index("SetSampleRate"), methods.index("StartRecording")
+        )
+
+    def test_open_breaker(self):
+        """Test the command refused while the breaker is open"""
+
+        self.con_handle.breaker = circuit_breaker.CircuitBreaker(
+            1, 30.0, self.clock
+        )
+        self.con_handle.breaker.record(GHSReturnValue["NoConnection"])
+        result = self.scheduler.run("StartRecording", self.clock.wall())
+        self.assertEqual(result.status, "NoConnection")
+        self.assertEqual(self.con_handle.sock.methods, [])
+
+    def test_unique_request_ids(self):
+        """Test ids prepared while other threads send kept unique"""
+
+        prepared = []
+
+        def prepare():
+            for _ in range(500):
+                prepared.append(
+                    self.con_handle.prepare_request("Trigger", None)
+                )
+
+        def send():
+            for _ in range(500):
+                self.con_handle.send_request_wait_response(
+                    "GetSlotCount", None
+                )
+
+        threads = [threading.Thread(target=prepare) for _ in range(2)]
+        threads.append(threading.Thread(target=send))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        request_ids = [request.request_id for request in prepared]
+        request_ids += [
+            request_id for _, request_id, _ in self.con_handle.sock.written
+        ]
+        self.assertEqual(len(set(request_ids)), 1500, "Duplicate ids.")
+
+    def test_trigger_at(self):
+        """Test a passed time sending the trigger at once"""
+
+        gen_daq = ghsapi.GHS()
+        gen_daq._con_handle = self.con_handle
+        result = gen_daq.ghs_trigger_at(time.time() - 1.0)
+        self.assertEqual(result.status, "OK")
+        self.assertGreater(result.arrival_error, 0.9, "Late trigger hidden.")
+        self.assertEqual(self.con_handle.sock.methods[-1], "Trigger")
+
+    def test_probe_failure(self):
+        """Test the command not sent when probes fail"""
+
+        self.con_handle.sock.results["GetCurrentAccess"] = {
+            RETURN_KEY: GHSReturnValue["NoConnection"]
+        }
+        result = self.scheduler.run("StartRecording", time.time() + 0.1)
+        self.assertEqual(result.status, "NoConnection")
+        self.assertEqual(self.scheduler.failed_probes, 1)
+        self.assertNotIn("StartRecording", self.con_handle.sock.methods)
+
+    def test_control_methods_only(self):
+        """Test state setters refused"""
+
+        result = self.scheduler.run("SetSampleRate", time.time())
+        self.assertEqual(result.status, "NOK")
+        self.assertEqual(self.con_handle.sock.methods, [])
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Command Scheduler Unittest Report",
+            report_title="Command Scheduler Unittest Report",
+        )
+    )
@@ -0,0 +1,149 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Disk forecast unit test."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import disk_forecast, ghsapi_states
+from test_channel_table import respond
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+# Slot A records an analog and a timer/counter channel at 100 kS/s
+WRITE_RATE = 100000.0 * (2.0 + 4.0) / 1e9
+
+
+class TestDiskForecast(unittest.TestCase):
+    """Disk forecast unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.now = 0.0
+        self.available = [60.0]
+        self.con_handle = MagicMock()
+        self.con_handle.send_request_wait_response.side_effect = self.respond
+        self.con_handle.send_requests_pipelined.side_effect = (
+            lambda requests, window: [
+                respond(*request) for request in requests
+            ]
+        )
+        self.forecast = disk_forecast.DiskForecast(
+            self.con_handle, clock=lambda: self.now
+        )
+
+    def respond(self, method_name, method_param):
+        if method_name == "DiskSpace":
+            return {
+                RETURN_KEY: GHSReturnValue["OK"],
+                "TotalSize": 100.0,
+                "AvailableSize": self.available.pop(0),
+            }
+        return {RETURN_KEY: GHSReturnValue["OK"], "SlotCount": 2}
+
+    def disk_space_polls(self):
+        return [
+            call
+            for call in self.con_handle.send_request_wait_response.mock_calls
+            if call.args[0] == "DiskSpace"
+        ]
+
+    def test_estimate(self):
+        """Test write rate estimated from the recording setup"""
+
+        self.assertEqual(self.forecast.estimate(), "OK", "Estimate failed.")
+        self.assertAlmostEqual(
+            self.forecast.estimated_rate, WRITE_RATE, msg="Wrong rate."
+        )
+        methods = [
+            request[0]
+            for call in self.con_handle.send_requests_pipelined.mock_calls
+            for request in call.args[0]
+        ]
+        self.assertNotIn("GetSpanAndOffset", methods, "Analog settings read.")
+
+    def test_recording_time(self):
+        """Test recording time forecast before starting"""
+
+        self.forecast.reserve = 6.0
+        status, seconds = self.forecast.recording_time()
+        self.assertEqual(status, "OK", "Forecast failed.")
+        self.assertAlmostEqual(seconds, 54.0 / WRITE_RATE, msg="Wrong time.")
+
+    def test_calibration(self):
+        """Test time to full calibrated by DiskSpace samples"""
+
+        self.forecast.estimate()
+        self.available = [60.0, 60.0 - 120 * WRITE_RATE]
+        self.forecast.time_to_full()
+        self.now = 10.0
+        status, seconds = self.forecast.time_to_full()
+        self.assertEqual(status, "OK", "Forecast failed.")
+        self.assertEqual(len(self.disk_space_polls()), 1, "Polled early.")
+        self.assertAlmostEqual(
+            seconds, 60.0 / WRITE_RATE - 10.0, msg="Estimate not used."
+        )
+
+        self.now = 60.0
+        status, seconds = self.forecast.time_to_full()
+        self.assertEqual(len(self.disk_space_polls()), 2, "Not polled.")
+        self.assertAlmostEqual(self.forecast.scale, 2.0, msg="Not scaled.")
+        self.assertAlmostEqual(
+            seconds, (60.0 - 120 * WRITE_RATE) / (2 * WRITE_RATE), msg="Wrong."
+        )
+
+        self.now = 90.0
+        self.assertAlmostEqual(
+            self.forecast.available(),
+            60.0 - 180 * WRITE_RATE,
+            msg="Not extrapolated.",
+        )
+
+    def test_nothing_recorded(self):
+        """Test infinite time when no channel is stored"""
+
+        self.forecast.estimated_rate = 0.0
+        self.assertEqual(
+            self.forecast.recording_time(), ("OK", float("inf")), "Not inf."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Disk Forecast Unittest Report",
+            report_title="Disk Forecast Unittest Report",
+        )
+    )
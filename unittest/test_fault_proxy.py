@@ -0,0 +1,149 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Fault proxy unit test."""
+
+import os
+import random
+import sys
+import threading
+import time
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import connection, fault_proxy, ghsapi_states, wire_capture
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+SAMPLE_RATE = {RETURN_KEY: GHSReturnValue["OK"], "SampleRate": 1000.0}
+EXCHANGE = wire_capture.Exchange(
+    "GetSampleRate",
+    {"SlotId": "A"},
+    {"jsonrpc": "2.0", "result": SAMPLE_RATE, "id": 1},
+    0.0,
+)
+
+
+class TestFaultProxy(unittest.TestCase):
+    """Fault proxy unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.servers = []
+        self.mainframe = self.start(
+            wire_capture.ReplayServer([EXCHANGE] * 4, ("127.0.0.1", 0), 0)
+        )
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def start(self, server):
+        threading.Thread(
+            target=server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        self.servers.append(server)
+        return server
+
+    def connect(self, **faults):
+        self.proxy = self.start(
+            fault_proxy.FaultProxy(
+                ("127.0.0.1", self.mainframe.port),
+                downstream=fault_proxy.FaultProfile(**faults),
+                seed=1,
+            )
+        )
+        con_handle = connection.ConnectionHandler()
+        con_handle.connection_establish("127.0.0.1", self.proxy.port, 5)
+        return con_handle
+
+    def get_sample_rate(self, con_handle):
+        return con_handle.send_request_wait_response(
+            "GetSampleRate", {"SlotId": "A"}
+        )
+
+    def test_segment_splitting(self):
+        """Test responses read from one byte segments"""
+
+        con_handle = self.connect(segment_size=1)
+        self.assertEqual(
+            con_handle.send_requests_pipelined(
+                [("GetSampleRate", {"SlotId": "A"})] * 3
+            ),
+            [SAMPLE_RATE] * 3,
+            "Split responses not decoded.",
+        )
+
+    def test_latency(self):
+        """Test latency added to the responses"""
+
+        con_handle = self.connect(latency=0.05)
+        start = time.perf_counter()
+        self.assertEqual(self.get_sample_rate(con_handle), SAMPLE_RATE)
+        self.assertGreaterEqual(
+            time.perf_counter() - start, 0.05, "Latency not added."
+        )
+
+    def test_reset(self):
+        """Test connection reset after a number of bytes"""
+
+        con_handle = self.connect(reset_after=100)
+        self.assertEqual(self.get_sample_rate(con_handle), SAMPLE_RATE)
+        self.assertEqual(
+            self.get_sample_rate(con_handle),
+            {RETURN_KEY: GHSReturnValue["NoConnection"]},
+            "Reset not seen.",
+        )
+        self.assertEqual(self.proxy.resets, 1, "Reset not counted.")
+
+    def test_sample_latency(self):
+        """Test latency distributions"""
+
+        rng = random.Random(1)
+        for distribution in fault_proxy.DISTRIBUTIONS:
+            profile = fault_proxy.FaultProfile(
+                0.01, 0.02, distribution=distribution
+            )
+            samples = [
+                fault_proxy.sample_latency(profile, rng) for _ in range(200)
+            ]
+            self.assertGreaterEqual(min(samples), 0.0, "Negative latency.")
+            self.assertGreater(max(samples), 0.01, "No jitter.")
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Fault Proxy Unittest Report",
+            report_title="Fault Proxy Unittest Report",
+        )
+    )
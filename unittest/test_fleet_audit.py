@@ -0,0 +1,160 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Fleet audit unit test."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import channel_table, fleet_audit
+
+PROFILE = {
+    "recorders": {"*": {"sample_rate": 100000.0}},
+    "channels": {
+        "*": {"filter_type": "Bessel", "storage_enabled": "Enable"},
+        "A:2": {"span": 20.0},
+    },
+}
+
+
+def make_tables():
+    """Recorder A with an analog and a timer counter channel."""
+
+    recorders = channel_table.RecorderTable()
+    recorders.columns.update(
+        slot_id=["A"],
+        channel_count=[2],
+        recorder_enabled=["Enable"],
+        sample_rate=[100000.0000001],
+        high_rate_storage=["Enable"],
+        low_rate_storage=["Disable"],
+    )
+    channels = channel_table.ChannelTable()
+    for name in channels.columns:
+        channels.columns[name] = [None, None]
+    channels.columns.update(
+        slot_id=["A", "A"],
+        channel_index=[1, 2],
+        channel_type=["TimerCounter", "Analog"],
+        storage_enabled=["Disable", "Enable"],
+        filter_type=[None, "Butterworth"],
+        span=[None, 20.0],
+    )
+    return recorders, channels
+
+
+class TestFleetAudit(unittest.TestCase):
+    """Fleet audit unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.profile_file = os.path.join(self.temp_dir.name, "golden.json")
+        with open(self.profile_file, "w", encoding="utf-8") as profile:
+            json.dump(PROFILE, profile)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compare_settings(self):
+        """Test differences against a golden profile"""
+
+        recorders, channels = make_tables()
+        differences = fleet_audit.compare_settings(
+            fleet_audit.load_profile(self.profile_file), recorders, channels
+        )
+        self.assertEqual(
+            [
+                (item["channel_index"], item["setting"], item["actual"])
+                for item in differences
+            ],
+            [
+                (1, "storage_enabled", "Disable"),
+                (2, "filter_type", "Butterworth"),
+            ],
+            "Profile comparison failed.",
+        )
+
+    def test_load_profile_neg(self):
+        """Test a profile with an unknown setting"""
+
+        with open(self.profile_file, "w", encoding="utf-8") as profile:
+            json.dump({"channels": {"*": {"gain": 2}}}, profile)
+        with self.assertRaises(ValueError):
+            fleet_audit.load_profile(self.profile_file)
+
+    def test_main(self):
+        """Test the command line report and exit code"""
+
+        results = {
+            "10.0.0.1": {
+                "status": "OK",
+                "differences": [
+                    {
+                        "slot_id": "A",
+                        "channel_index": 1,
+                        "setting": "span",
+                        "expected": 20.0,
+                        "actual": 10.0,
+                    }
+                ],
+            },
+            "10.0.0.2": {"status": "OK", "differences": []},
+        }
+        with patch(
+            "ghsapi.fleet_audit.audit_mainframe",
+            side_effect=lambda address, profile, timeout, breakers: dict(
+                results[address]
+            ),
+        ), patch("builtins.print") as mock_print:
+            exit_code = fleet_audit.main(
+                ["--profile", self.profile_file, "10.0.0.1", "10.0.0.2"]
+            )
+        self.assertEqual(exit_code, 1, "Differences not reported as failure.")
+        self.assertEqual(
+            mock_print.call_args_list[0][0][0],
+            "10.0.0.1 A:1 span: expected 20.0, found 10.0",
+            "Diff report failed.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Fleet Audit Unittest Report",
+            report_title="Fleet Audit Unittest Report",
+        )
+    )
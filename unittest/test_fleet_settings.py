@@ -0,0 +1,178 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Fleet settings backup and restore unit test."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import fleet, fleet_settings, settings_store
+
+
+class TestFleetSettings(unittest.TestCase):
+    """Fleet settings backup and restore unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = settings_store.SettingsStore(self.temp_dir.name)
+        self.progress_file = os.path.join(self.temp_dir.name, "progress")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parse_address(self):
+        """Test mainframe address parsing"""
+
+        self.assertEqual(
+            fleet.parse_address("10.0.0.1"),
+            ("10.0.0.1", fleet.DEFAULT_PORT),
+            "Address without port failed.",
+        )
+        self.assertEqual(
+            fleet.parse_address("gen7i:8007"),
+            ("gen7i", 8007),
+            "Address with port failed.",
+        )
+
+    def test_failed_connect_closed(self):
+        """Test the socket closed when the Connect request fails"""
+
+        sock = MagicMock()
+
+        def connect(gen, host, port, timeout):
+            gen._con_handle.sock = sock
+            return "APIMismatch"
+
+        with patch.object(fleet.GHS, "ghs_connect", autospec=True) as (
+            mock_connect
+        ):
+            mock_connect.side_effect = connect
+            with fleet.connected("10.0.0.1") as (return_var, gen):
+                self.assertEqual(return_var, "APIMismatch")
+        sock.close.assert_called_once()
+        self.assertEqual(gen._con_handle.sock, 0, "Socket left open.")
+
+    def test_run_on_fleet_resume(self):
+        """Test fleet run resuming from progress file"""
+
+        calls = []
+
+        def task(address):
+            calls.append(address)
+            if address == "bad":
+                raise OSError("unreachable")
+            return {"status": "OK"}
+
+        results = fleet.run_on_fleet(
+            ["a", "bad", "b"], task, 2, self.progress_file
+        )
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["OK", "NOK", "OK"],
+            "Fleet result status failed.",
+        )
+        self.assertIn("unreachable", fleet.summarize(results))
+
+        calls.clear()
+        results = fleet.run_on_fleet(
+            ["a", "bad", "b"], task, 2, self.progress_file
+        )
+        self.assertEqual(calls, ["bad"], "Completed mainframes run again.")
+        self.assertTrue(results[0]["resumed"], "Resumed result not marked.")
+
+    def test_backup_mainframe(self):
+        """Test backup of one mainframe"""
+
+        with patch("ghsapi.fleet.GHS.ghs_connect") as mock_connect, patch(
+            "ghsapi.fleet.GHS.ghs_disconnect"
+        ) as mock_disconnect, patch(
+            "ghsapi.fleet.GHS.ghs_archive_current_settings"
+        ) as mock_archive:
+            mock_connect.return_value = "OK"
+            mock_archive.return_value = ("OK", "digest")
+            self.assertEqual(
+                fleet_settings.backup_mainframe("10.0.0.1", self.store, 1.0),
+                {"status": "OK", "digest": "digest"},
+                "Mainframe backup failed.",
+            )
+            mock_connect.assert_called_with("10.0.0.1", 8006, 1.0)
+            mock_disconnect.assert_called_once()
+
+            mock_connect.return_value = "NoConnection"
+            self.assertEqual(
+                fleet_settings.backup_mainframe("10.0.0.1", self.store),
+                {"status": "NoConnection"},
+                "Unreachable mainframe backup failed.",
+            )
+            mock_disconnect.assert_called_once()
+
+    def test_restore_latest(self):
+        """Test restore of the latest snapshot of a mainframe"""
+
+        digest = self.store.put("blob", "SN1")
+        with patch("ghsapi.fleet.GHS.ghs_connect") as mock_connect, patch(
+            "ghsapi.fleet.GHS.ghs_disconnect"
+        ), patch(
+            "ghsapi.fleet.GHS.ghs_get_mainframe_info"
+        ) as mock_info, patch(
+            "ghsapi.fleet.GHS.ghs_restore_settings"
+        ) as mock_restore:
+            mock_connect.return_value = "OK"
+            mock_info.return_value = ("OK", "GEN", "GEN", "SN1", "1.0")
+            mock_restore.return_value = "OK"
+            self.assertEqual(
+                fleet_settings.restore_mainframe("10.0.0.1", self.store),
+                {"status": "OK", "digest": digest},
+                "Latest snapshot restore failed.",
+            )
+
+            mock_info.return_value = ("OK", "GEN", "GEN", "SN2", "1.0")
+            self.assertEqual(
+                fleet_settings.restore_mainframe("10.0.0.1", self.store)[
+                    "status"
+                ],
+                "NOK",
+                "Restore without snapshot failed.",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Fleet Settings Unittest Report",
+            report_title="Fleet Settings Unittest Report",
+        )
+    )
@@ -0,0 +1,132 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Flow control unit test."""
+
+import os
+import sys
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, flow_control, ghsapi_states
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+OK = {RETURN_KEY: GHSReturnValue["OK"]}
+
+
+class TestFlowControl(unittest.TestCase):
+    """Flow control unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.now = 0.0
+        self.waits = []
+
+    def sleep(self, seconds):
+        self.waits.append(seconds)
+        self.now += seconds
+
+    def test_token_bucket(self):
+        """Test rate cap with bursts"""
+
+        bucket = flow_control.TokenBucket(
+            10.0, 2, lambda: self.now, self.sleep
+        )
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.waits, [], "Burst not allowed.")
+        bucket.acquire()
+        self.assertAlmostEqual(self.waits[0], 0.1, msg="Rate not capped.")
+        self.now += 1.0
+        bucket.acquire()
+        self.assertEqual(len(self.waits), 1, "Bucket not refilled.")
+
+    def test_additive_increase(self):
+        """Test limit growing by one per window of timely responses"""
+
+        limiter = flow_control.AIMDLimiter(4, max_limit=6)
+        for _ in range(4):
+            limiter.on_response(0.01, OK)
+        self.assertEqual(limiter.limit, 5, "Limit not increased.")
+        for _ in range(20):
+            limiter.on_response(0.01, OK)
+        self.assertEqual(limiter.limit, 6, "Maximum not kept.")
+
+    def test_multiplicative_decrease(self):
+        """Test limit halving once per window on late responses"""
+
+        limiter = flow_control.AIMDLimiter(16)
+        for _ in range(16):
+            limiter.on_response(0.01, OK)
+        self.assertEqual(limiter.limit, 17, "Limit not increased.")
+        for _ in range(8):
+            limiter.on_response(0.2, OK)
+        self.assertEqual(limiter.limit, 8, "Limit not halved once.")
+        for _ in range(30):
+            limiter.on_response(0.2, OK)
+        self.assertLess(limiter.limit, 8, "Limit not decreased again.")
+
+    def test_overload_status(self):
+        """Test limit halving on overload statuses"""
+
+        limiter = flow_control.AIMDLimiter(8)
+        for status in ("MainframeTimeout", "SystemNotIdle"):
+            limiter._since_decrease = limiter.limit
+            limiter.on_response(0.01, {RETURN_KEY: GHSReturnValue[status]})
+        self.assertEqual(limiter.limit, 2, "Not backed off.")
+        self.assertIsNone(limiter.min_latency, "Overload latency used.")
+
+    def test_connection(self):
+        """Test limiter fed by pipelined requests"""
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = FakeSocket()
+        limiter = flow_control.enable_flow_control(con_handle, initial_limit=1)
+        responses = con_handle.send_requests_pipelined(
+            [("GetSampleRate", {"SlotId": "A"})] * 10
+        )
+        self.assertEqual(responses, [OK] * 10, "Requests failed.")
+        self.assertGreater(limiter.limit, 1, "Limiter not fed.")
+        self.assertIsNotNone(limiter.min_latency, "Latency not measured.")
+
+        flow_control.disable_flow_control(con_handle)
+        self.assertIsNone(con_handle.limiter, "Limiter not detached.")
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Flow Control Unittest Report",
+            report_title="Flow Control Unittest Report",
+        )
+    )
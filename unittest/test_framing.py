@@ -0,0 +1,326 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Framing unit test."""
+
+import os
+import socket
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import connection, framing, ghsapi_states, json_rpc
+
+
+class TestFraming(unittest.TestCase):
+    """Framing unit test."""
+
+    GHSReturnValue = ghsapi_states.GHSReturnValue
+    RETURN_KEY = ghsapi_states.RETURN_KEY
+
+    def setUp(self):
+        # run at start of test file
+        self.decoder = framing.FrameDecoder()
+
+    def test_encode_frame(self):
+        """Test frame header encoding"""
+
+        frame = framing.encode_frame(b"{}\0")
+        self.assertEqual(
+            frame,
+            b"\x00\x00\x00\x03GD\x00\x01{}\0",
+            "Frame encoding failed.",
+        )
+
+    def test_partial_reads(self):
+        """Test frame decoding byte by byte"""
+
+        frame = framing.encode_frame(b'{"id":1}\0')
+        payloads = []
+        for index in range(len(frame)):
+            payloads += self.decoder.feed(frame[index : index + 1])
+        self.assertEqual(
+            payloads, [b'{"id":1}'], "Partial frame decoding failed."
+        )
+        self.assertEqual(
+            self.decoder.bytes_needed(),
+            framing.HEADER_SIZE,
+            "Decoder not ready for next header.",
+        )
+
+    def test_coalesced_frames(self):
+        """Test decoding of several frames in one chunk"""
+
+        data = (
+            framing.encode_frame(b'{"id":1}\0')
+            + framing.encode_frame(b'{"id":2}\0')
+            + framing.encode_frame(b'{"id":3}\0')[:5]
+        )
+        self.assertEqual(
+            self.decoder.feed(data),
+            [b'{"id":1}', b'{"id":2}'],
+            "Coalesced frame decoding failed.",
+        )
+        self.assertEqual(
+            self.decoder.bytes_needed(), 3, "Partial header not kept."
+        )
+        self.assertEqual(
+            self.decoder.feed(framing.encode_frame(b'{"id":3}\0')[5:]),
+            [b'{"id":3}'],
+            "Remaining frame decoding failed.",
+        )
+
+    def test_invalid_version_header(self):
+        """Test frame with invalid API version header"""
+
+        with self.assertRaises(ValueError):
+            self.decoder.feed(framing.encode_frame(b"{}\0", 1))
+        self.assertEqual(
+            self.decoder.feed(framing.encode_frame(b"{}\0")),
+            [b"{}"],
+            "Decoder not reset after invalid header.",
+        )
+
+    def test_invalid_header_after_payload(self):
+        """Test payloads before an invalid header returned first"""
+
+        chunk = framing.encode_frame(b"{}\0") + framing.encode_frame(
+            b"[]\0", 1
+        )
+        self.assertEqual(
+            self.decoder.feed(chunk), [b"{}"], "Earlier payload lost."
+        )
+        with self.assertRaises(ValueError):
+            self.decoder.feed(b"")
+        self.assertEqual(
+            self.decoder.feed(framing.encode_frame(b"{}\0")),
+            [b"{}"],
+            "Decoder not reset after invalid header.",
+        )
+
+    def test_invalid_header_closes(self):
+        """Test an invalid response header closing the connection"""
+
+        con_handle = connection.ConnectionHandler()
+        sock = MagicMock()
+        con_handle.sock = sock
+        sock.send.side_effect = len
+        sock.recv.return_value = framing.encode_frame(
+            b'{"jsonrpc":"2.0","result":1,"id":1}\0', 1
+        )
+
+        self.assertEqual(
+            con_handle.send_request_wait_response("StartRecording", None),
+            {self.RETURN_KEY: self.GHSReturnValue["NOK"]},
+        )
+        self.assertEqual(con_handle.sock, 0, "Connection left open.")
+        sock.close.assert_called_once()
+
+    def test_coalesced_responses(self):
+        """Test connection handler reading coalesced responses"""
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = MagicMock()
+        con_handle.sock.send.side_effect = len
+        con_handle.sock.recv.return_value = framing.encode_frame(
+            b'{"jsonrpc":"2.0","result":1,"id":1}\0'
+        ) + framing.encode_frame(b'{"jsonrpc":"2.0","result":7,"id":2}\0')
+
+        self.assertEqual(
+            con_handle.send_request_wait_response("StartRecording", None),
+            {self.RETURN_KEY: self.GHSReturnValue["OK"]},
+            "First coalesced response failed.",
+        )
+        self.assertEqual(
+            con_handle.send_request_wait_response("StopRecording", None),
+            {self.RETURN_KEY: self.GHSReturnValue["SystemNotRecording"]},
+            "Second coalesced response failed.",
+        )
+        self.assertEqual(
+            con_handle.sock.recv.call_count, 1, "Buffered frame not used."
+        )
+
+    def test_pipelined_requests(self):
+        """Test pipelined requests answered in one chunk"""
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = MagicMock()
+        con_handle.sock.send.side_effect = len
+        con_handle.sock.recv.return_value = framing.encode_frame(
+            b'{"jsonrpc":"2.0","result":1,"id":1}\0'
+        ) + framing.encode_frame(b'{"jsonrpc":"2.0","result":7,"id":2}\0')
+
+        self.assertEqual(
+            con_handle.send_requests_pipelined(
+                [("StartRecording", None), ("", None), ("StopRecording", None)]
+            ),
+            [
+                {self.RETURN_KEY: self.GHSReturnValue["OK"]},
+                {self.RETURN_KEY: self.GHSReturnValue["NullPtrArgument"]},
+                {self.RETURN_KEY: self.GHSReturnValue["SystemNotRecording"]},
+            ],
+            "Pipelined responses failed.",
+        )
+        self.assertEqual(
+            con_handle.sock.send.call_count, 2, "Requests not pipelined."
+        )
+
+    def test_pipelined_connection_lost(self):
+        """Test pipelined requests when the connection is lost"""
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = MagicMock()
+        con_handle.sock.send.side_effect = len
+        con_handle.sock.recv.side_effect = [
+            framing.encode_frame(b'{"jsonrpc":"2.0","result":1,"id":1}\0'),
+            b"",
+        ]
+
+        responses = con_handle.send_requests_pipelined(
+            [("GetSlotCount", None)] * 3, window=2
+        )
+        self.assertEqual(
+            [response[self.RETURN_KEY] for response in responses],
+            [self.GHSReturnValue["OK"]]
+            + [self.GHSReturnValue["NoConnection"]] * 2,
+            "Pipelined connection loss failed.",
+        )
+
+    def test_timeout_closes_connection(self):
+        """Test a late response not read by the next request"""
+
+        con_handle = connection.ConnectionHandler()
+        sock = MagicMock()
+        con_handle.sock = sock
+        sock.send.side_effect = len
+        sock.recv.side_effect = [
+            socket.timeout(),
+            framing.encode_frame(b'{"jsonrpc":"2.0","result":1,"id":1}\0'),
+        ]
+
+        self.assertEqual(
+            con_handle.send_request_wait_response("StartRecording", None),
+            {self.RETURN_KEY: self.GHSReturnValue["MainframeTimeout"]},
+        )
+        self.assertEqual(
+            con_handle.send_request_wait_response("StopRecording", None),
+            {self.RETURN_KEY: self.GHSReturnValue["NoConnection"]},
+            "Late response read by the next request.",
+        )
+        sock.close.assert_called_once()
+
+    def test_pipelined_send_failure_closes(self):
+        """Test a failed send closing a connection with responses due"""
+
+        con_handle = connection.ConnectionHandler()
+        sock = MagicMock()
+        con_handle.sock = sock
+        sends = []
+
+        def send(data):
+            sends.append(data)
+            if len(sends) > 1:
+                raise socket.timeout()
+            return len(data)
+
+        sock.send.side_effect = send
+
+        responses = con_handle.send_requests_pipelined(
+            [("GetSlotCount", None)] * 2
+        )
+        self.assertEqual(
+            [response[self.RETURN_KEY] for response in responses],
+            [self.GHSReturnValue["MainframeTimeout"]] * 2,
+        )
+        self.assertEqual(con_handle.sock, 0, "Connection left open.")
+
+    def test_pipelined_timeout_closes(self):
+        """Test a timeout result closing a connection with responses due"""
+
+        con_handle = connection.ConnectionHandler()
+        sock = MagicMock()
+        con_handle.sock = sock
+        sock.send.side_effect = len
+        sock.recv.return_value = framing.encode_frame(
+            b'{"jsonrpc":"2.0","result":14,"id":1}\0'
+        ) + framing.encode_frame(b'{"jsonrpc":"2.0","result":1,"id":2}\0')
+
+        responses = con_handle.send_requests_pipelined(
+            [("GetSlotCount", None)] * 2
+        )
+        self.assertEqual(
+            [response[self.RETURN_KEY] for response in responses],
+            [self.GHSReturnValue["MainframeTimeout"]] * 2,
+        )
+        self.assertEqual(
+            con_handle.send_request_wait_response("GetSlotCount", None),
+            {self.RETURN_KEY: self.GHSReturnValue["NoConnection"]},
+            "Response in flight read by the next request.",
+        )
+        sock.close.assert_called_once()
+
+    def test_read_progress(self):
+        """Test progress reporting while reading a large frame"""
+
+        frame = framing.encode_frame(b"x" * 99 + b"\0")
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = MagicMock()
+        con_handle.sock.recv.side_effect = [frame[:58], frame[58:]]
+        reports = []
+
+        payload = con_handle.read_frame(
+            lambda received, total: reports.append((received, total))
+        )
+        self.assertEqual(len(payload), 99, "Frame payload read failed.")
+        self.assertEqual(
+            reports, [(50, 100), (100, 100)], "Read progress report failed."
+        )
+
+    def test_parse_without_nul(self):
+        """Test JSON parse of decoded payload"""
+
+        self.assertEqual(
+            json_rpc.json_rpc_parse_response(
+                1, b'{"jsonrpc":"2.0","result":1,"id":1}'
+            ),
+            {self.RETURN_KEY: self.GHSReturnValue["OK"]},
+            "JSON parse without trailing NUL failed.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Framing Unittest Report",
+            report_title="Framing Unittest Report",
+        )
+    )
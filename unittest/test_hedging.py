@@ -0,0 +1,208 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Hedged requests unit test."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, ghsapi, ghsapi_states, hedging
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+
+class SlowSocket(FakeSocket):
+    """Socket answering after a settable delay."""
+
+    def __init__(self, result):
+        super().__init__()
+        self.delay = 0.0
+        self.results["GetAcquisitionState"] = result
+
+    def recv(self, size):
+        time.sleep(self.delay)
+        return super().recv(size)
+
+
+class TestHedging(unittest.TestCase):
+    """Hedged requests unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = connection.ConnectionHandler()
+        self.con_handle.sock = SlowSocket(
+            {RETURN_KEY: GHSReturnValue["OK"], "GHSAcquisitionState": 4}
+        )
+        self.spare = connection.ConnectionHandler()
+        self.spare.sock = SlowSocket(
+            {RETURN_KEY: GHSReturnValue["OK"], "GHSAcquisitionState": 3}
+        )
+        self.hedge = hedging.Hedger(
+            hedging.ConnectionPool([self.spare]), min_samples=3
+        )
+        self.con_handle.hedge = self.hedge
+
+    def tearDown(self):
+        # run at end of test file
+        self.hedge._primaries.shutdown(wait=True)
+        self.hedge._hedges.shutdown(wait=True)
+
+    def state(self):
+        return self.con_handle.send_request_wait_response(
+            "GetAcquisitionState", None
+        )["GHSAcquisitionState"]
+
+    def test_learning(self):
+        """Test requests not hedged before enough latencies are known"""
+
+        self.con_handle.sock.delay = 0.01
+        for _ in range(3):
+            self.assertEqual(self.state(), 4, "Wrong response.")
+        self.assertIsNotNone(self.hedge.threshold("GetAcquisitionState"))
+        self.assertIsNone(self.hedge.threshold("GetSampleRate"))
+        self.assertEqual(self.hedge.hedged_calls, 0, "Hedged while learning.")
+        self.assertEqual(self.spare.sock.methods, [], "Spare used.")
+
+    def test_slow_request_hedged(self):
+        """Test a stalled getter answered by the spare connection"""
+
+        for _ in range(3):
+            self.state()
+        self.con_handle.sock.delay = 0.2
+        started_at = time.perf_counter()
+        self.assertEqual(self.state(), 3, "Spare answer not used.")
+        self.assertLess(time.perf_counter() - started_at, 0.15, "Not hedged.")
+        self.assertEqual(self.hedge.hedged_calls, 1)
+        self.assertEqual(self.hedge.hedge_wins, 1)
+        self.assertEqual(self.spare.sock.methods, ["GetAcquisitionState"])
+
+        gen_daq = ghsapi.GHS()
+        gen_daq._con_handle = self.con_handle
+        stats = gen_daq.ghs_latency_stats()["hedged"]
+        self.assertEqual(stats["count"], 4, "Hedged latency not recorded.")
+        self.assertEqual(stats["hedge_wins"], 1)
+
+    def test_busy_workers(self):
+        """Test hedges sent while all primary workers are stalled"""
+
+        self.tearDown()
+        self.hedge = hedging.Hedger(
+            hedging.ConnectionPool([self.spare]), min_samples=3, max_workers=1
+        )
+        self.con_handle.hedge = self.hedge
+        self.con_handle.single_flight = False
+        for _ in range(3):
+            self.state()
+        self.con_handle.sock.delay = 0.3
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.state()))
+            for _ in range(3)
+        ]
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(time.perf_counter() - started_at, 0.25, "Queued.")
+        self.assertEqual(results, [3, 3, 3], "Spare answers not used.")
+        self.assertEqual(self.hedge.hedge_wins, 3)
+
+    def test_access_not_hedged(self):
+        """Test the access always read on the own connection"""
+
+        self.con_handle.sock.results["GetCurrentAccess"] = {
+            RETURN_KEY: GHSReturnValue["OK"],
+            "Access": 2,
+        }
+        self.spare.sock.results["GetCurrentAccess"] = {
+            RETURN_KEY: GHSReturnValue["OK"],
+            "Access": 1,
+        }
+        for _ in range(3):
+            self.con_handle.send_request_wait_response(
+                "GetCurrentAccess", None
+            )
+        self.con_handle.sock.delay = 0.05
+        response_json = self.con_handle.send_request_wait_response(
+            "GetCurrentAccess", None
+        )
+        self.assertEqual(response_json["Access"], 2, "Spare access used.")
+        self.assertIsNone(self.hedge.threshold("GetCurrentAccess"))
+        self.assertEqual(self.hedge.hedged_calls, 0)
+        self.assertEqual(self.spare.sock.methods, [], "Spare used.")
+
+    def test_setters_not_hedged(self):
+        """Test state changing requests never sent twice"""
+
+        for _ in range(3):
+            self.state()
+        self.con_handle.sock.delay = 0.05
+        self.con_handle.send_request_wait_response(
+            "SetSampleRate", {"SlotId": "A", "SampleRate": 1e3}
+        )
+        self.assertEqual(self.spare.sock.methods, [], "Setter hedged.")
+        self.assertEqual(self.hedge.hedged_calls, 0)
+
+    @staticmethod
+    def broken_send(data):
+        raise ConnectionResetError()
+
+    def test_broken_spare(self):
+        """Test the slow answer used when the spare connection fails"""
+
+        for _ in range(3):
+            self.state()
+        self.con_handle.sock.delay = 0.05
+        self.spare.sock.send = self.broken_send
+        self.assertEqual(self.state(), 4, "Failed spare answer used.")
+        self.assertEqual(self.hedge.hedge_wins, 0)
+
+    def test_enable_needs_tcp(self):
+        """Test hedging refused without a TCP connection"""
+
+        handle = connection.ConnectionHandler()
+        self.assertEqual(hedging.enable_hedging(handle, 4), "NullPtrArgument")
+        self.assertIsNone(handle.hedge)
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Hedging Unittest Report",
+            report_title="Hedging Unittest Report",
+        )
+    )
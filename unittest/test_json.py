@@ -139,6 +139,29 @@ class TestJSON(unittest.TestCase):
             "JSON parse with result in GHSReturnValue named parameter failed.",
         )
 
+    def test_to_string(self):
+        """Test reverse lookup of state values"""
+
+        self.assertEqual(
+            ghsapi_states.to_string(7, self.GHSReturnValue),
+            "SystemNotRecording",
+            "Reverse lookup failed.",
+        )
+        self.assertEqual(
+            ghsapi_states.to_string(999, self.GHSReturnValue),
+            "Reserved",
+            "Unknown value lookup failed.",
+        )
+        self.assertEqual(
+            ghsapi_states.to_string([1], self.GHSReturnValue),
+            "Reserved",
+            "Unhashable value lookup failed.",
+        )
+        self.assertIsNone(
+            ghsapi_states.optional_to_string(None, self.GHSReturnValue),
+            "Missing value lookup failed.",
+        )
+
 
 if __name__ == "__main__":
     unittest.main(
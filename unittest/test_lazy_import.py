@@ -0,0 +1,117 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Lazy import unit test."""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+LOADED_MODULES = """
+import json, sys
+import {target}
+{statement}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def loaded_modules(target: str, statement: str = "") -> list[str]:
+    """Import target in a new interpreter and list the loaded modules."""
+
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            LOADED_MODULES.format(target=target, statement=statement),
+        ],
+        cwd=os.path.join(parentdir, "src"),
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+class TestLazyImport(unittest.TestCase):
+    """Lazy import unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        pass
+
+    def test_import_package(self):
+        """Test package import without submodules"""
+
+        modules = loaded_modules("ghsapi")
+        self.assertNotIn("ghsapi.ghsapi", modules, "Submodule imported.")
+        self.assertNotIn("ghsapi.connection", modules, "Connection imported.")
+
+    def test_import_ghs(self):
+        """Test GHS import without the domain modules"""
+
+        modules = loaded_modules("ghsapi.ghsapi")
+        for module in (
+            "ghsapi.channel_api",
+            "ghsapi.recorder_api",
+            "ghsapi.settings_store",
+        ):
+            self.assertNotIn(module, modules, f"{module} imported.")
+
+    def test_load_on_use(self):
+        """Test domain module import on first use"""
+
+        modules = loaded_modules(
+            "ghsapi", "ghsapi.ghsapi.GHS().ghs_get_channel_type('A', 1)"
+        )
+        self.assertIn("ghsapi.channel_api", modules, "Module not loaded.")
+        self.assertNotIn(
+            "ghsapi.recorder_api", modules, "Unused module loaded."
+        )
+
+    def test_unknown_attribute(self):
+        """Test a missing submodule raising AttributeError"""
+
+        modules = loaded_modules(
+            "ghsapi",
+            "assert not hasattr(ghsapi, 'no_such_module')\n"
+            "ghsapi.settings_store.SettingsStore",
+        )
+        self.assertIn("ghsapi.settings_store", modules, "Not loaded.")
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Lazy Import Unittest Report",
+            report_title="Lazy Import Unittest Report",
+        )
+    )
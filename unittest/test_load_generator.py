@@ -0,0 +1,173 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Load generator unit test."""
+
+import contextlib
+import io
+import os
+import sys
+import threading
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeMainframe
+from ghsapi import load_generator
+
+
+class TestLoadGenerator(unittest.TestCase):
+    """Load generator unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.mainframe = FakeMainframe()
+        threading.Thread(
+            target=self.mainframe.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        self.port = self.mainframe.server_address[1]
+
+    def tearDown(self):
+        self.mainframe.shutdown()
+        self.mainframe.server_close()
+
+    def connect(self, gen):
+        return gen.ghs_connect("127.0.0.1", self.port, 5)
+
+    def test_parse_call(self):
+        """Test parsing calls of the mix"""
+
+        self.assertEqual(
+            load_generator.parse_call("ghs_get_sample_rate:A=2"),
+            ("ghs_get_sample_rate", ("A",), 2.0),
+            "Call not parsed.",
+        )
+        self.assertEqual(
+            load_generator.parse_call("ghs_get_channel_type:A,1").args,
+            ("A", 1),
+            "Arguments not parsed.",
+        )
+        with self.assertRaises(ValueError):
+            load_generator.parse_call("ghs_no_such_method")
+        with self.assertRaises(ValueError):
+            load_generator.parse_call("ghs_get_disk_space=often")
+
+    def test_percentile(self):
+        """Test nearest rank percentiles"""
+
+        values = [float(value) for value in range(100, 0, -1)]
+        self.assertEqual(load_generator.percentile(values, 50), 50.0)
+        self.assertEqual(load_generator.percentile(values, 99), 99.0)
+        self.assertEqual(load_generator.percentile(values, 100), 100.0)
+        self.assertIsNone(load_generator.percentile([], 50))
+
+    def test_run_load(self):
+        """Test virtual clients calling the mix"""
+
+        mix = [
+            load_generator.parse_call(spec)
+            for spec in load_generator.DEFAULT_MIX
+        ]
+        report = load_generator.run_load(self.connect, mix, 3, calls=5, seed=1)
+        self.assertEqual(report.calls, 15, "Calls not made.")
+        self.assertEqual(dict(report.statuses), {"OK": 15}, "Statuses.")
+        self.assertLessEqual(
+            set(report.latencies),
+            {call.name for call in mix},
+            "Unexpected method.",
+        )
+        self.assertGreater(report.rate, 0, "Rate not measured.")
+        self.assertEqual(
+            self.mainframe.methods.count("Connect"), 3, "Not connected."
+        )
+
+    def test_connect_failure(self):
+        """Test clients failing to connect"""
+
+        report = load_generator.run_load(
+            lambda gen: "ConnectionFailed",
+            [load_generator.Call("ghs_get_disk_space")],
+            2,
+            calls=1,
+        )
+        self.assertEqual(report.connect_failures, 2, "Failures not counted.")
+        self.assertEqual(report.calls, 0, "Calls made.")
+
+    def test_raising_calls(self):
+        """Test exceptions of connect and calls reported as statuses"""
+
+        def connect(gen):
+            try:
+                connects.pop()
+            except IndexError:
+                raise ConnectionRefusedError() from None
+            return self.connect(gen)
+
+        connects = [True]
+        report = load_generator.run_load(
+            connect,
+            [load_generator.Call("ghs_get_sample_rate", ("A", "B"))],
+            2,
+            calls=2,
+        )
+        self.assertEqual(report.connect_failures, 1, "Failure not counted.")
+        self.assertEqual(
+            dict(report.statuses),
+            {"ConnectionRefusedError": 1, "TypeError": 2},
+            "Exceptions not reported.",
+        )
+
+    def test_main(self):
+        """Test the command line report"""
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = load_generator.main(
+                [
+                    f"127.0.0.1:{self.port}",
+                    "--clients",
+                    "2",
+                    "--calls",
+                    "3",
+                    "--call",
+                    "ghs_get_sample_rate:A",
+                ]
+            )
+        self.assertEqual(status, 0, "Load test failed.")
+        self.assertIn("6 calls", output.getvalue(), "Report failed.")
+        self.assertIn("ghs_get_sample_rate", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Load Generator Unittest Report",
+            report_title="Load Generator Unittest Report",
+        )
+    )
@@ -24,6 +24,7 @@
 
 """Manage mainframe settings API unit test."""
 
+import io
 import os
 import sys
 import unittest
@@ -139,6 +140,178 @@ class TestManageMainframeSettingsAPI(unittest.TestCase):
             "set_current_settings null argument check failed.",
         )
 
+    def test_save_current_settings(self):
+        """Test save_current_settings api writing blob in chunks"""
+
+        with patch(
+            "test_connection_handler.connection.ConnectionHandler.send_request_wait_response"
+        ) as mock_req_ros:
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["OK"],
+                "Size": 10,
+                "Blob": "0123456789",
+            }
+            file_obj = io.BytesIO()
+            self.assertEqual(
+                manage_mainframe_settings.save_current_settings(
+                    self.con_handle, file_obj, chunk_size=3
+                ),
+                ("OK", 10),
+                "save_current_settings success response test failed.",
+            )
+            self.assertEqual(
+                file_obj.getvalue(),
+                b"0123456789",
+                "save_current_settings blob content test failed.",
+            )
+
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["NOK"],
+            }
+            self.assertEqual(
+                manage_mainframe_settings.save_current_settings(
+                    self.con_handle, io.BytesIO()
+                ),
+                ("NOK", None),
+                "save_current_settings failure response test failed.",
+            )
+
+    def test_load_current_settings(self):
+        """Test load_current_settings api from file and buffer"""
+
+        with patch(
+            "test_connection_handler.connection.ConnectionHandler.send_request_wait_response"
+        ) as mock_req_ros:
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["OK"],
+            }
+            self.assertEqual(
+                manage_mainframe_settings.load_current_settings(
+                    self.con_handle, io.BytesIO(b"blob")
+                ),
+                "OK",
+                "load_current_settings from file test failed.",
+            )
+            mock_req_ros.assert_called_with(
+                "SetCurrentSettings", {"Blob": "blob", "Size": 4}, None
+            )
+
+            self.assertEqual(
+                manage_mainframe_settings.load_current_settings(
+                    self.con_handle, memoryview(bytearray(b"blob"))
+                ),
+                "OK",
+                "load_current_settings from buffer test failed.",
+            )
+            self.assertEqual(
+                manage_mainframe_settings.load_current_settings(
+                    self.con_handle, b"\xff"
+                ),
+                "InvalidUTF8Character",
+                "load_current_settings invalid blob test failed.",
+            )
+
+    def test_set_current_settings_skip_if_unchanged(self):
+        """Test set_current_settings skipping unchanged settings"""
+
+        self.con_handle.settings_digest = None
+        with patch(
+            "test_connection_handler.connection.ConnectionHandler.send_request_wait_response"
+        ) as mock_req_ros:
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["OK"],
+                "Size": 4,
+                "Blob": "blob",
+            }
+            self.assertEqual(
+                manage_mainframe_settings.set_current_settings(
+                    self.con_handle, "blob", 4, skip_if_unchanged=True
+                ),
+                "OK",
+                "set_current_settings skip test failed.",
+            )
+            mock_req_ros.assert_called_once_with(
+                "GetCurrentSettings", None, None
+            )
+
+            self.assertEqual(
+                manage_mainframe_settings.set_current_settings(
+                    self.con_handle, "blob", 4, skip_if_unchanged=True
+                ),
+                "OK",
+                "set_current_settings cached skip test failed.",
+            )
+            self.assertEqual(
+                mock_req_ros.call_count, 1, "Cached digest not used."
+            )
+
+            self.assertEqual(
+                manage_mainframe_settings.set_current_settings(
+                    self.con_handle, "other", 5, skip_if_unchanged=True
+                ),
+                "OK",
+                "set_current_settings changed settings test failed.",
+            )
+            mock_req_ros.assert_called_with(
+                "SetCurrentSettings", {"Blob": "other", "Size": 5}, None
+            )
+            self.assertEqual(
+                self.con_handle.settings_digest,
+                manage_mainframe_settings.settings_digest("other"),
+                "Applied settings digest not cached.",
+            )
+
+    def test_settings_digest_invalidation(self):
+        """Test cached settings digest is cleared by setters"""
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.settings_digest = "digest"
+        con_handle.send_request_wait_response("GetSlotCount", None)
+        self.assertEqual(
+            con_handle.settings_digest, "digest", "Getter cleared digest."
+        )
+        con_handle.send_request_wait_response("SetSampleRate", None)
+        self.assertIsNone(con_handle.settings_digest, "Setter kept digest.")
+
+    def test_apply_persisted_settings_skip_if_unchanged(self):
+        """Test apply_persisted_settings skipping unchanged settings"""
+
+        self.con_handle.settings_digest = "digest"
+        with patch(
+            "test_connection_handler.connection.ConnectionHandler.send_request_wait_response"
+        ) as mock_req_ros:
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["OK"],
+            }
+            self.assertEqual(
+                manage_mainframe_settings.persist_current_settings(
+                    self.con_handle
+                ),
+                "OK",
+                "persist_current_settings test failed.",
+            )
+            self.assertEqual(
+                manage_mainframe_settings.apply_persisted_settings(
+                    self.con_handle, skip_if_unchanged=True
+                ),
+                "OK",
+                "apply_persisted_settings skip test failed.",
+            )
+            self.assertEqual(
+                mock_req_ros.call_count, 1, "Unchanged settings applied."
+            )
+
+            self.con_handle.settings_digest = "changed"
+            manage_mainframe_settings.apply_persisted_settings(
+                self.con_handle, skip_if_unchanged=True
+            )
+            mock_req_ros.assert_called_with("ApplyPersistedSettings", None)
+            self.assertEqual(
+                self.con_handle.settings_digest,
+                "digest",
+                "Persisted settings digest not applied.",
+            )
+
 
 if __name__ == "__main__":
     unittest.main(
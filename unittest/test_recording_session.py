@@ -0,0 +1,222 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Recording session unit test."""
+
+import os
+import sys
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, recording_session
+from ghsapi.ghsapi_states import (
+    RETURN_KEY,
+    GHSAcquisitionState,
+    GHSReturnValue,
+    GHSStorageLocation,
+)
+
+
+def state_result(state):
+    return {
+        RETURN_KEY: GHSReturnValue["OK"],
+        "GHSAcquisitionState": GHSAcquisitionState[state],
+    }
+
+
+class StateSocket(FakeSocket):
+    """Socket answering acquisition state requests from a list."""
+
+    def __init__(self):
+        super().__init__()
+        self.states = []
+
+    def send(self, data):
+        if self.states:
+            self.results["GetAcquisitionState"] = state_result(
+                self.states.pop(0)
+            )
+        return super().send(data)
+
+
+class TestRecordingSession(unittest.TestCase):
+    """Recording session unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = connection.ConnectionHandler()
+        self.con_handle.sock = StateSocket()
+        self.con_handle.sock.results.update(
+            {
+                "GetAcquisitionState": state_result("Idle"),
+                "DiskSpace": {
+                    RETURN_KEY: GHSReturnValue["OK"],
+                    "TotalSize": 100.0,
+                    "AvailableSize": 20.0,
+                },
+                "GetStorageLocation": {
+                    RETURN_KEY: GHSReturnValue["OK"],
+                    "StorageLocation": GHSStorageLocation["Local1"],
+                },
+                "GetRecordingName": {
+                    RETURN_KEY: GHSReturnValue["OK"],
+                    "RecordingName": "run",
+                    "RecordingIndex": 41,
+                },
+            }
+        )
+        recording_session.MIN_POLL_INTERVAL = 0.001
+
+    def test_start_increments_name(self):
+        """Test start with automatic recording index"""
+
+        session = recording_session.RecordingSession(self.con_handle)
+        self.assertEqual(session.start(), "OK", "Start failed.")
+        self.assertEqual(
+            self.con_handle.sock.methods,
+            [
+                "GetAcquisitionState",
+                "DiskSpace",
+                "GetStorageLocation",
+                "GetRecordingName",
+                "SetRecordingName",
+                "StartRecording",
+            ],
+            "Unexpected requests.",
+        )
+        self.assertEqual(
+            self.con_handle.sock.params[4],
+            {"RecordingBaseName": "run", "RecordingIndex": 42},
+            "Recording name not incremented.",
+        )
+        self.assertEqual(session.recording_index, 42, "Index not kept.")
+
+    def test_new_base_name(self):
+        """Test recording index restarting for a new base name"""
+
+        session = recording_session.RecordingSession(self.con_handle, "cal")
+        session.start()
+        self.assertEqual(
+            self.con_handle.sock.params[4],
+            {"RecordingBaseName": "cal", "RecordingIndex": 1},
+            "Recording index not restarted.",
+        )
+
+    def test_preflight_failures(self):
+        """Test recording not started when a preflight check fails"""
+
+        session = recording_session.RecordingSession(
+            self.con_handle, min_free_space=50.0
+        )
+        self.assertEqual(
+            session.start(), "InsufficientDiskSpace", "Disk space not checked."
+        )
+
+        session.min_free_space = 1.0
+        self.con_handle.sock.results["GetStorageLocation"][
+            "StorageLocation"
+        ] = GHSStorageLocation["Reserved"]
+        self.assertEqual(
+            session.start(), "IncompatibleStorage", "Storage not checked."
+        )
+
+        self.con_handle.sock.results["GetAcquisitionState"] = state_result(
+            "Preview"
+        )
+        self.assertEqual(
+            session.start(), "SystemNotIdle", "State not checked."
+        )
+        self.assertNotIn(
+            "StartRecording", self.con_handle.sock.methods, "Started."
+        )
+
+    def test_remote_storage(self):
+        """Test remote storage started without a local disk check"""
+
+        self.con_handle.sock.results["GetStorageLocation"][
+            "StorageLocation"
+        ] = GHSStorageLocation["Remote"]
+        self.con_handle.sock.results["DiskSpace"] = GHSReturnValue["NOK"]
+        session = recording_session.RecordingSession(
+            self.con_handle, min_free_space=50.0
+        )
+        self.assertEqual(session.start(), "OK", "Remote storage rejected.")
+        self.assertEqual(session.preflight_result.storage_location, "Remote")
+
+    def test_rejected_name(self):
+        """Test recording not started when the name is rejected"""
+
+        self.con_handle.sock.results["SetRecordingName"] = GHSReturnValue[
+            "InvalidRecordingName"
+        ]
+        session = recording_session.RecordingSession(self.con_handle, "a/b")
+        self.assertEqual(session.start(), "InvalidRecordingName")
+        self.assertNotIn(
+            "StartRecording", self.con_handle.sock.methods, "Started."
+        )
+
+    def test_context_waits_until_saved(self):
+        """Test leaving the with block waits until the data is saved"""
+
+        session = recording_session.RecordingSession(self.con_handle)
+        with session:
+            self.con_handle.sock.states = [
+                "Recording",
+                "SavingData",
+                "SavingData",
+                "Idle",
+            ]
+        self.assertEqual(session.status, "OK", "Wait failed.")
+        self.assertEqual(
+            self.con_handle.sock.methods[6:],
+            ["StopRecording"] + ["GetAcquisitionState"] * 3,
+            "Unexpected requests.",
+        )
+
+    def test_wait_timeout(self):
+        """Test waiting ends with MainframeTimeout"""
+
+        self.con_handle.sock.results["GetAcquisitionState"] = state_result(
+            "SavingData"
+        )
+        session = recording_session.RecordingSession(self.con_handle)
+        self.assertEqual(
+            session.wait_until_idle(0.02), "MainframeTimeout", "No timeout."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Recording Session Unittest Report",
+            report_title="Recording Session Unittest Report",
+        )
+    )
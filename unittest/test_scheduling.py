@@ -0,0 +1,154 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Priority scheduling unit test."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, scheduling
+
+
+class SlowSocket(FakeSocket):
+    """Socket taking a millisecond per receive."""
+
+    def __init__(self):
+        super().__init__()
+        self.busy = threading.Event()
+
+    def recv(self, size):
+        self.busy.set()
+        time.sleep(0.001)
+        return super().recv(size)
+
+
+class TestScheduling(unittest.TestCase):
+    """Priority scheduling unit test."""
+
+    def wait_for_waiters(self, lock, count):
+        while len(lock._waiters) < count:
+            time.sleep(0.001)
+
+    def test_priority_order(self):
+        """Test lock granted by priority, then arrival"""
+
+        lock = scheduling.PriorityLock()
+        order = []
+
+        def take(name, priority):
+            lock.acquire(priority)
+            order.append(name)
+            lock.release()
+
+        lock.acquire()
+        threads = []
+        for name, priority in (
+            ("bulk", scheduling.BULK),
+            ("normal 1", scheduling.NORMAL),
+            ("control", scheduling.CONTROL),
+            ("normal 2", scheduling.NORMAL),
+        ):
+            threads.append(
+                threading.Thread(target=take, args=(name, priority))
+            )
+            threads[-1].start()
+            self.wait_for_waiters(lock, len(threads))
+        self.assertTrue(lock.urgent_waiting(scheduling.NORMAL))
+        lock.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+            order,
+            ["control", "normal 1", "normal 2", "bulk"],
+            "Wrong order.",
+        )
+
+    def test_reentrant(self):
+        """Test lock taken twice by the same thread"""
+
+        lock = scheduling.PriorityLock()
+        with lock:
+            with lock:
+                pass
+            self.assertEqual(lock._count, 1, "Count not restored.")
+        with self.assertRaises(RuntimeError):
+            lock.release()
+
+    def test_control_preempts_batch(self):
+        """Test trigger sent between the requests of a batch"""
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = SlowSocket()
+        batch = threading.Thread(
+            target=con_handle.send_requests_pipelined,
+            args=([("GetSampleRate", {"SlotId": "A"})] * 200, 4),
+        )
+        batch.start()
+        con_handle.sock.busy.wait()
+        con_handle.send_request_wait_response("Trigger", None)
+        batch.join()
+
+        methods = con_handle.sock.methods
+        self.assertEqual(len(methods), 201, "Requests lost.")
+        self.assertLess(methods.index("Trigger"), 100, "Not preempted.")
+        stats = con_handle.latency_stats
+        self.assertEqual(stats["control"].count, 1, "Control not counted.")
+        self.assertEqual(stats["bulk"].count, 1, "Batch not counted.")
+        self.assertLess(
+            stats["control"].maximum,
+            stats["bulk"].maximum,
+            "Trigger waited for the batch.",
+        )
+
+    def test_latency_stats(self):
+        """Test latency summary"""
+
+        stats = scheduling.LatencyStats(samples=10)
+        for latency in range(1, 21):
+            stats.add(latency / 1000)
+        summary = stats.summary()
+        self.assertEqual(summary["count"], 20)
+        self.assertAlmostEqual(summary["mean"], 0.0105)
+        self.assertEqual(summary["p50"], 0.015, "Recent samples not used.")
+        self.assertEqual(summary["max"], 0.02)
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Scheduling Unittest Report",
+            report_title="Scheduling Unittest Report",
+        )
+    )
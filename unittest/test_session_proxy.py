@@ -0,0 +1,134 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Session proxy unit test."""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeMainframe
+from ghsapi import ghsapi
+
+try:
+    from ghsapi import session_proxy
+except ImportError:
+    # No Unix domain sockets, e.g. on Windows
+    session_proxy = None
+
+
+@unittest.skipUnless(
+    hasattr(socket, "AF_UNIX"), "Unix domain sockets not available"
+)
+class TestSessionProxy(unittest.TestCase):
+    """Session proxy unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.mainframe = FakeMainframe()
+        threading.Thread(
+            target=self.mainframe.serve_forever, daemon=True
+        ).start()
+        self.address = "127.0.0.1:%d" % self.mainframe.server_address[1]
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.servers = session_proxy.serve(
+            [self.address], self.temp_dir.name, timeout=5, cache_ttl=60
+        )
+        self.path = session_proxy.socket_path(self.temp_dir.name, self.address)
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+            server.session.close()
+        self.mainframe.shutdown()
+        self.mainframe.server_close()
+        self.temp_dir.cleanup()
+
+    def test_shared_session(self):
+        """Test clients sharing the warm session and getter cache"""
+
+        for _ in range(3):
+            gen = ghsapi.GHS()
+            self.assertEqual(
+                gen.ghs_connect_proxy(self.path, 5), "OK", "Connect failed."
+            )
+            self.assertEqual(
+                gen.ghs_get_slot_count(),
+                ("OK", 2),
+                "Proxied getter failed.",
+            )
+            self.assertEqual(gen.ghs_disconnect(), "OK", "Disconnect failed.")
+        self.assertEqual(
+            self.mainframe.methods,
+            ["Connect", "GetSlotCount"],
+            "Session or cache not shared.",
+        )
+
+    def test_cache_cleared_by_setter(self):
+        """Test cached answers dropped after a state changing request"""
+
+        gen = ghsapi.GHS()
+        gen.ghs_connect_proxy(self.path, 5)
+        gen.ghs_get_slot_count()
+        self.assertEqual(
+            gen.ghs_set_sample_rate("A", 1000.0), "OK", "Setter failed."
+        )
+        gen.ghs_get_slot_count()
+        self.assertEqual(
+            self.mainframe.methods,
+            ["Connect", "GetSlotCount", "SetSampleRate", "GetSlotCount"],
+            "Cache not cleared.",
+        )
+
+    def test_connect_without_proxy(self):
+        """Test connecting to a missing proxy socket"""
+
+        self.assertEqual(
+            ghsapi.GHS().ghs_connect_proxy(
+                os.path.join(self.temp_dir.name, "missing.sock")
+            ),
+            "ConnectionFailed",
+            "Missing proxy not reported.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Session Proxy Unittest Report",
+            report_title="Session Proxy Unittest Report",
+        )
+    )
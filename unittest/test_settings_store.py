@@ -0,0 +1,188 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Settings store unit test."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from ghsapi import connection, ghsapi_states, settings_store
+
+
+class TestSettingsStore(unittest.TestCase):
+    """Settings store unit test."""
+
+    con_handle = connection.ConnectionHandler()
+    GHSReturnValue = ghsapi_states.GHSReturnValue
+    RETURN_KEY = ghsapi_states.RETURN_KEY
+
+    def setUp(self):
+        # run at start of test file
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = settings_store.SettingsStore(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_deduplicates(self):
+        """Test identical blobs are stored once"""
+
+        digest = self.store.put("settings", "SN1", 1.0)
+        self.assertEqual(
+            self.store.put(b"settings", "SN2", 2.0),
+            digest,
+            "Content hash of identical blobs differs.",
+        )
+        self.assertEqual(
+            self.store.get(digest), b"settings", "Stored blob mismatch."
+        )
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.temp_dir.name, "objects"))),
+            1,
+            "Identical blob stored twice.",
+        )
+        self.assertEqual(
+            [snapshot["serial_number"] for snapshot in self.store.snapshots()],
+            ["SN1", "SN2"],
+            "Snapshot metadata not recorded.",
+        )
+        with self.assertRaises(KeyError):
+            self.store.get("0" * 64)
+
+    def test_malformed_digest(self):
+        """Test digests that could leave the store root rejected"""
+
+        self.store.put("settings")
+        for digest in ("../../etc/passwd", "A" * 64, "0" * 63, None):
+            with self.assertRaises(ValueError):
+                self.store.get(digest)
+            self.assertNotIn(digest, self.store)
+        self.assertEqual(
+            self.store.restore(self.con_handle, "../" + "0" * 61),
+            "InvalidDataType",
+            "Malformed digest restored.",
+        )
+
+    def test_index_reload(self):
+        """Test snapshots survive reopening the store"""
+
+        self.store.put("old", "SN1", 1.0)
+        digest = self.store.put("new", "SN1", 2.0)
+        reopened = settings_store.SettingsStore(self.temp_dir.name)
+        self.assertEqual(
+            reopened.latest("SN1")["digest"],
+            digest,
+            "Latest snapshot lookup failed.",
+        )
+        self.assertIsNone(reopened.latest("SN2"), "Unknown serial found.")
+
+    def test_archive(self):
+        """Test archive of current mainframe settings"""
+
+        with patch(
+            "test_connection_handler.connection.ConnectionHandler.send_request_wait_response"
+        ) as mock_req_ros:
+            mock_req_ros.side_effect = [
+                {
+                    self.RETURN_KEY: self.GHSReturnValue["OK"],
+                    "Size": 4,
+                    "Blob": "blob",
+                },
+                {
+                    self.RETURN_KEY: self.GHSReturnValue["OK"],
+                    "MainframeType": "GEN3i",
+                    "MainframeName": "GEN",
+                    "SerialNumber": "SN1",
+                    "FirmwareVersion": "1.0",
+                },
+            ]
+            return_var, digest = self.store.archive(self.con_handle)
+            self.assertEqual(return_var, "OK", "Archive status failed.")
+            self.assertEqual(
+                self.store.latest("SN1")["digest"],
+                digest,
+                "Archived snapshot not recorded.",
+            )
+
+    def test_restore(self):
+        """Test restore only applies differing settings"""
+
+        digest = self.store.put("blob", "SN1")
+        self.con_handle.settings_digest = None
+        with patch(
+            "test_connection_handler.connection.ConnectionHandler.send_request_wait_response"
+        ) as mock_req_ros:
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["OK"],
+                "Size": 4,
+                "Blob": "blob",
+            }
+            self.assertEqual(
+                self.store.restore(self.con_handle, digest),
+                "OK",
+                "Restore of unchanged settings failed.",
+            )
+            self.assertEqual(
+                mock_req_ros.call_count, 1, "Unchanged settings applied."
+            )
+
+            mock_req_ros.return_value = {
+                self.RETURN_KEY: self.GHSReturnValue["OK"],
+                "Size": 5,
+                "Blob": "other",
+            }
+            self.con_handle.settings_digest = None
+            self.assertEqual(
+                self.store.restore(self.con_handle, digest),
+                "OK",
+                "Restore of changed settings failed.",
+            )
+            mock_req_ros.assert_called_with(
+                "SetCurrentSettings", {"Blob": "blob", "Size": 4}, None
+            )
+            self.assertEqual(
+                self.store.restore(self.con_handle, "0" * 64),
+                "NOK",
+                "Restore of unknown blob failed.",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Settings Store Unittest Report",
+            report_title="Settings Store Unittest Report",
+        )
+    )
@@ -0,0 +1,220 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Setup transaction unit test."""
+
+import os
+import sys
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, ghsapi_states, setup_transaction
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+
+class TestSetupTransaction(unittest.TestCase):
+    """Setup transaction unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = connection.ConnectionHandler()
+        self.con_handle.sock = FakeSocket()
+        self.con_handle.sock.results["GetCurrentSettings"] = {
+            RETURN_KEY: GHSReturnValue["OK"],
+            "Blob": "settings",
+            "Size": 8,
+        }
+
+    def set_filter(self, channel_index):
+        return self.con_handle.send_request_wait_response(
+            "SetFilterTypeAndFrequency",
+            {"SlotId": "A", "ChannelIndex": channel_index},
+        )
+
+    def test_commit(self):
+        """Test a transaction without failures"""
+
+        with setup_transaction.SetupTransaction(
+            self.con_handle
+        ) as transaction:
+            self.set_filter(1)
+            self.set_filter(2)
+
+        self.assertEqual(
+            transaction.result,
+            ("OK", False, None, ["OK", "OK"]),
+            "Transaction result failed.",
+        )
+        self.assertNotIn(
+            "SetCurrentSettings",
+            self.con_handle.sock.methods,
+            "Settings rolled back without failure.",
+        )
+
+    def test_rollback_on_failed_setter(self):
+        """Test rollback when a staged setter fails"""
+
+        self.con_handle.sock.results["SetFilterTypeAndFrequency"] = (
+            GHSReturnValue["InvalidChannelType"]
+        )
+        with setup_transaction.SetupTransaction(
+            self.con_handle
+        ) as transaction:
+            self.set_filter(1)
+
+        self.assertEqual(
+            transaction.result[:3],
+            ("InvalidChannelType", True, "OK"),
+            "Transaction rollback result failed.",
+        )
+        self.assertEqual(
+            self.con_handle.sock.methods[-1],
+            "SetCurrentSettings",
+            "Settings not rolled back.",
+        )
+        self.assertEqual(
+            self.con_handle.sock.params[-1],
+            {"Blob": "settings", "Size": 8},
+            "Wrong settings rolled back.",
+        )
+
+    def test_abort(self):
+        """Test rollback of sent calls when the block raises"""
+
+        with self.assertRaises(KeyError):
+            with setup_transaction.SetupTransaction(
+                self.con_handle
+            ) as transaction:
+                self.set_filter(1)
+                self.con_handle.send_request_wait_response(
+                    "GetSlotCount", None
+                )
+                self.set_filter(2)
+                raise KeyError("channel")
+
+        self.assertEqual(
+            transaction.result, ("NOK", True, "OK", None), "Abort failed."
+        )
+        self.assertEqual(
+            self.con_handle.sock.methods,
+            [
+                "GetCurrentSettings",
+                "SetFilterTypeAndFrequency",
+                "GetSlotCount",
+                "SetCurrentSettings",
+            ],
+            "Aborted transaction requests failed.",
+        )
+
+    def test_rollback_on_failed_command(self):
+        """Test rollback when a write that is not staged fails"""
+
+        self.con_handle.sock.results["Zeroing"] = GHSReturnValue[
+            "InvalidChannelType"
+        ]
+        with setup_transaction.SetupTransaction(
+            self.con_handle
+        ) as transaction:
+            self.con_handle.send_request_wait_response(
+                "SetUserMode", {"UserMode": 1}
+            )
+            self.con_handle.send_request_wait_response(
+                "Zeroing", {"SlotId": "A", "ChannelIndex": 1}
+            )
+
+        self.assertEqual(
+            transaction.result[:3],
+            ("InvalidChannelType", True, "OK"),
+            "Failed command not rolled back.",
+        )
+        self.assertEqual(
+            self.con_handle.sock.methods[-1],
+            "SetCurrentSettings",
+            "Settings not rolled back.",
+        )
+
+    def test_abort_after_command(self):
+        """Test rollback of a write that is not staged when aborted"""
+
+        with self.assertRaises(KeyError):
+            with setup_transaction.SetupTransaction(
+                self.con_handle
+            ) as transaction:
+                self.con_handle.send_request_wait_response(
+                    "SetUserMode", {"UserMode": 1}
+                )
+                raise KeyError("channel")
+
+        self.assertEqual(
+            transaction.result, ("NOK", True, "OK", None), "Abort failed."
+        )
+        self.assertEqual(
+            self.con_handle.sock.methods[-1],
+            "SetCurrentSettings",
+            "Command not rolled back.",
+        )
+        self.assertEqual(
+            self.con_handle.response_observers, [], "Observer left attached."
+        )
+
+    def test_snapshot_failure(self):
+        """Test a transaction whose settings cannot be read"""
+
+        self.con_handle.sock.results["GetCurrentSettings"] = GHSReturnValue[
+            "WriteAccessBlocked"
+        ]
+        with setup_transaction.SetupTransaction(
+            self.con_handle
+        ) as transaction:
+            self.set_filter(1)
+
+        self.assertEqual(
+            transaction.result.status,
+            "WriteAccessBlocked",
+            "Snapshot failure status failed.",
+        )
+        self.assertEqual(
+            self.con_handle.sock.methods,
+            ["GetCurrentSettings"],
+            "Setter sent without snapshot.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Setup Transaction Unittest Report",
+            report_title="Setup Transaction Unittest Report",
+        )
+    )
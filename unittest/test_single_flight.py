@@ -0,0 +1,136 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Single-flight deduplication unit test."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, ghsapi_states
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+STATE = {RETURN_KEY: GHSReturnValue["OK"], "GHSAcquisitionState": 4}
+
+
+class HeldSocket(FakeSocket):
+    """Socket holding back responses until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def recv(self, size):
+        self.release.wait()
+        return super().recv(size)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Single-flight deduplication unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = connection.ConnectionHandler()
+        self.con_handle.sock = HeldSocket()
+        self.con_handle.sock.results["GetAcquisitionState"] = STATE
+        self.results = []
+
+    def call(self, method_name, method_param=None):
+        thread = threading.Thread(
+            target=lambda: self.results.append(
+                self.con_handle.send_request_wait_response(
+                    method_name, method_param
+                )
+            )
+        )
+        thread.start()
+        return thread
+
+    def wait_for_requests(self, count):
+        while len(self.con_handle.sock.methods) < count:
+            time.sleep(0.001)
+
+    def test_shared_request(self):
+        """Test concurrent identical getters sharing one request"""
+
+        threads = [self.call("GetAcquisitionState")]
+        self.wait_for_requests(1)
+        threads += [self.call("GetAcquisitionState") for _ in range(3)]
+        threads.append(self.call("GetSampleRate", {"SlotId": "A"}))
+        while self.con_handle.deduplicated_calls < 3:
+            time.sleep(0.001)
+        self.con_handle.sock.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            self.con_handle.sock.methods,
+            ["GetAcquisitionState", "GetSampleRate"],
+            "Requests not shared.",
+        )
+        self.assertEqual(self.results.count(STATE), 4, "Result not shared.")
+
+        self.con_handle.send_request_wait_response("GetAcquisitionState", None)
+        self.assertEqual(
+            len(self.con_handle.sock.methods), 3, "Finished request reused."
+        )
+
+    def test_setters_not_shared(self):
+        """Test setters and disabled deduplication sending every call"""
+
+        self.con_handle.single_flight = False
+        threads = [self.call("GetAcquisitionState")]
+        self.wait_for_requests(1)
+        threads.append(self.call("GetAcquisitionState"))
+        threads += [
+            self.call("SetSampleRate", {"SlotId": "A", "SampleRate": 1e3})
+            for _ in range(2)
+        ]
+        time.sleep(0.01)
+        self.con_handle.sock.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.con_handle.sock.methods), 4, "Shared.")
+        self.assertEqual(self.con_handle.deduplicated_calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Single Flight Unittest Report",
+            report_title="Single Flight Unittest Report",
+        )
+    )
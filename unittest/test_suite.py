@@ -29,15 +29,37 @@ import unittest
 from HtmlTestRunner import HTMLTestRunner
 from xmlrunner import XMLTestRunner
 
+import test_access_monitor
 import test_acquisition_api
 import test_channel_api
+import test_channel_bulk_api
+import test_channel_table
+import test_circuit_breaker
+import test_command_scheduler
 import test_connection_api
 import test_connection_handler
+import test_disk_forecast
+import test_fault_proxy
+import test_fleet_audit
+import test_fleet_settings
+import test_flow_control
+import test_framing
+import test_hedging
 import test_json
+import test_lazy_import
+import test_load_generator
 import test_mainframe_api
 import test_manage_mainframe_settings
 import test_manage_recordings
 import test_recorder_api
+import test_recording_session
+import test_scheduling
+import test_session_proxy
+import test_settings_store
+import test_setup_transaction
+import test_single_flight
+import test_wire_capture
+import test_write_staging
 
 if __name__ == "__main__":
 
@@ -49,13 +71,35 @@ if __name__ == "__main__":
     # add tests to the test suite
     suite.addTests(loader.loadTestsFromModule(test_json))
     suite.addTests(loader.loadTestsFromModule(test_connection_handler))
+    suite.addTests(loader.loadTestsFromModule(test_framing))
+    suite.addTests(loader.loadTestsFromModule(test_lazy_import))
     suite.addTests(loader.loadTestsFromModule(test_connection_api))
+    suite.addTests(loader.loadTestsFromModule(test_session_proxy))
+    suite.addTests(loader.loadTestsFromModule(test_access_monitor))
+    suite.addTests(loader.loadTestsFromModule(test_wire_capture))
+    suite.addTests(loader.loadTestsFromModule(test_fault_proxy))
+    suite.addTests(loader.loadTestsFromModule(test_load_generator))
+    suite.addTests(loader.loadTestsFromModule(test_flow_control))
+    suite.addTests(loader.loadTestsFromModule(test_scheduling))
+    suite.addTests(loader.loadTestsFromModule(test_single_flight))
+    suite.addTests(loader.loadTestsFromModule(test_hedging))
+    suite.addTests(loader.loadTestsFromModule(test_circuit_breaker))
+    suite.addTests(loader.loadTestsFromModule(test_command_scheduler))
     suite.addTests(loader.loadTestsFromModule(test_acquisition_api))
     suite.addTests(loader.loadTestsFromModule(test_mainframe_api))
     suite.addTests(loader.loadTestsFromModule(test_manage_recordings))
+    suite.addTests(loader.loadTestsFromModule(test_recording_session))
     suite.addTests(loader.loadTestsFromModule(test_manage_mainframe_settings))
+    suite.addTests(loader.loadTestsFromModule(test_settings_store))
+    suite.addTests(loader.loadTestsFromModule(test_fleet_settings))
+    suite.addTests(loader.loadTestsFromModule(test_fleet_audit))
     suite.addTests(loader.loadTestsFromModule(test_recorder_api))
     suite.addTests(loader.loadTestsFromModule(test_channel_api))
+    suite.addTests(loader.loadTestsFromModule(test_channel_bulk_api))
+    suite.addTests(loader.loadTestsFromModule(test_write_staging))
+    suite.addTests(loader.loadTestsFromModule(test_setup_transaction))
+    suite.addTests(loader.loadTestsFromModule(test_channel_table))
+    suite.addTests(loader.loadTestsFromModule(test_disk_forecast))
 
     # initialize a runner, pass it your suite and run it
     HTMLTestRunner(
@@ -70,13 +114,35 @@ if __name__ == "__main__":
     # add tests to the test suite
     suite.addTests(loader.loadTestsFromModule(test_json))
     suite.addTests(loader.loadTestsFromModule(test_connection_handler))
+    suite.addTests(loader.loadTestsFromModule(test_framing))
+    suite.addTests(loader.loadTestsFromModule(test_lazy_import))
     suite.addTests(loader.loadTestsFromModule(test_connection_api))
+    suite.addTests(loader.loadTestsFromModule(test_session_proxy))
+    suite.addTests(loader.loadTestsFromModule(test_access_monitor))
+    suite.addTests(loader.loadTestsFromModule(test_wire_capture))
+    suite.addTests(loader.loadTestsFromModule(test_fault_proxy))
+    suite.addTests(loader.loadTestsFromModule(test_load_generator))
+    suite.addTests(loader.loadTestsFromModule(test_flow_control))
+    suite.addTests(loader.loadTestsFromModule(test_scheduling))
+    suite.addTests(loader.loadTestsFromModule(test_single_flight))
+    suite.addTests(loader.loadTestsFromModule(test_hedging))
+    suite.addTests(loader.loadTestsFromModule(test_circuit_breaker))
+    suite.addTests(loader.loadTestsFromModule(test_command_scheduler))
     suite.addTests(loader.loadTestsFromModule(test_acquisition_api))
     suite.addTests(loader.loadTestsFromModule(test_mainframe_api))
     suite.addTests(loader.loadTestsFromModule(test_manage_recordings))
+    suite.addTests(loader.loadTestsFromModule(test_recording_session))
     suite.addTests(loader.loadTestsFromModule(test_manage_mainframe_settings))
+    suite.addTests(loader.loadTestsFromModule(test_settings_store))
+    suite.addTests(loader.loadTestsFromModule(test_fleet_settings))
+    suite.addTests(loader.loadTestsFromModule(test_fleet_audit))
     suite.addTests(loader.loadTestsFromModule(test_recorder_api))
     suite.addTests(loader.loadTestsFromModule(test_channel_api))
+    suite.addTests(loader.loadTestsFromModule(test_channel_bulk_api))
+    suite.addTests(loader.loadTestsFromModule(test_write_staging))
+    suite.addTests(loader.loadTestsFromModule(test_setup_transaction))
+    suite.addTests(loader.loadTestsFromModule(test_channel_table))
+    suite.addTests(loader.loadTestsFromModule(test_disk_forecast))
 
     result = not XMLTestRunner(output="reports").run(suite).wasSuccessful()
     sys.exit(result)
@@ -0,0 +1,175 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Wire capture and replay unit test."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, ghsapi_states, wire_capture
+
+GHSReturnValue = ghsapi_states.GHSReturnValue
+RETURN_KEY = ghsapi_states.RETURN_KEY
+
+SAMPLE_RATE = {RETURN_KEY: GHSReturnValue["OK"], "SampleRate": 1000.0}
+
+
+class TestWireCapture(unittest.TestCase):
+    """Wire capture and replay unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "setup.ghswire.gz")
+        self.server = None
+
+        con_handle = connection.ConnectionHandler()
+        con_handle.sock = FakeSocket()
+        con_handle.sock.results["GetSampleRate"] = SAMPLE_RATE
+        with wire_capture.WireCapture(con_handle, self.path) as capture:
+            con_handle.send_request_wait_response(
+                "GetSampleRate", {"SlotId": "A"}
+            )
+            con_handle.send_requests_pipelined(
+                [
+                    ("SetSampleRate", {"SlotId": "A", "SampleRate": 2e3}),
+                    ("SetSampleRate", {"SlotId": "B", "SampleRate": 3e3}),
+                ]
+            )
+        self.capture = capture
+        con_handle.send_request_wait_response("StartRecording", None)
+
+    def tearDown(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        self.directory.cleanup()
+
+    def replay(self, exchanges, latency_scale=1.0):
+        self.server = wire_capture.ReplayServer(
+            exchanges, ("127.0.0.1", 0), latency_scale
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        con_handle = connection.ConnectionHandler()
+        con_handle.connection_establish("127.0.0.1", self.server.port, 5)
+        return con_handle
+
+    def test_capture_file(self):
+        """Test captured records and exchanges"""
+
+        records = wire_capture.read_capture(self.path)
+        self.assertEqual(self.capture.records, 6, "Records not counted.")
+        self.assertEqual(
+            [record.kind for record in records],
+            [0, 1, 0, 0, 1, 1],
+            "Records not in wire order.",
+        )
+        exchanges = wire_capture.pair_exchanges(records)
+        self.assertEqual(
+            [(exchange.method, exchange.params) for exchange in exchanges],
+            [
+                ("GetSampleRate", {"SlotId": "A"}),
+                ("SetSampleRate", {"SlotId": "A", "SampleRate": 2e3}),
+                ("SetSampleRate", {"SlotId": "B", "SampleRate": 3e3}),
+            ],
+            "Exchanges not paired.",
+        )
+        self.assertTrue(
+            all(exchange.latency >= 0 for exchange in exchanges),
+            "Negative latency.",
+        )
+
+    def test_not_a_capture(self):
+        """Test reading a file that is no capture"""
+
+        path = os.path.join(self.directory.name, "other")
+        with open(path, "wb") as other:
+            other.write(b"{}")
+        with self.assertRaises(ValueError):
+            wire_capture.read_capture(path)
+
+    def test_replay(self):
+        """Test replaying the capture to a client"""
+
+        server_exchanges = wire_capture.pair_exchanges(
+            wire_capture.read_capture(self.path)
+        )
+        con_handle = self.replay(server_exchanges, 0)
+        responses = con_handle.send_requests_pipelined(
+            [
+                ("SetSampleRate", {"SlotId": "B", "SampleRate": 3e3}),
+                ("GetSampleRate", {"SlotId": "A"}),
+                ("StartRecording", None),
+            ]
+        )
+        self.assertEqual(
+            responses,
+            [
+                {RETURN_KEY: GHSReturnValue["OK"]},
+                SAMPLE_RATE,
+                {RETURN_KEY: GHSReturnValue["MethodNotFound"]},
+            ],
+            "Replay failed.",
+        )
+        self.assertEqual(self.server.unmatched, 1, "Unmatched not counted.")
+
+    def test_scaled_latency(self):
+        """Test replay delayed by the scaled latency"""
+
+        exchange = wire_capture.Exchange(
+            "GetSampleRate",
+            {"SlotId": "A"},
+            {"jsonrpc": "2.0", "result": SAMPLE_RATE, "id": 1},
+            0.05,
+        )
+        con_handle = self.replay([exchange], 2.0)
+        start = time.perf_counter()
+        response = con_handle.send_request_wait_response(
+            "GetSampleRate", {"SlotId": "A"}
+        )
+        self.assertGreaterEqual(
+            time.perf_counter() - start, 0.1, "Latency not replayed."
+        )
+        self.assertEqual(response, SAMPLE_RATE, "Wrong response.")
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Wire Capture Unittest Report",
+            report_title="Wire Capture Unittest Report",
+        )
+    )
@@ -0,0 +1,151 @@
+# Copyright (C) 2022 Hottinger Bruel and Kjaer Benelux B.V.
+# Schutweg 15a
+# 5145 NP Waalwijk
+# The Netherlands
+# http://www.hbm.com
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Write staging unit test."""
+
+import os
+import sys
+import unittest
+
+import HtmlTestRunner
+
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+
+sys.path.append(os.path.join(parentdir, "src"))
+
+from fakes import FakeSocket
+from ghsapi import connection, manage_mainframe_settings, write_staging
+
+
+class TestWriteStaging(unittest.TestCase):
+    """Write staging unit test."""
+
+    def setUp(self):
+        # run at start of test file
+        self.con_handle = connection.ConnectionHandler()
+        self.con_handle.sock = FakeSocket()
+
+    def span(self, channel_index, span):
+        return self.con_handle.send_request_wait_response(
+            "SetSpanAndOffset",
+            {
+                "SlotId": "A",
+                "ChannelIndex": channel_index,
+                "Span": span,
+                "Offset": 0.0,
+            },
+        )
+
+    def test_coalesced_writes(self):
+        """Test later writes superseding earlier ones"""
+
+        with write_staging.WriteStaging(self.con_handle) as staging:
+            self.span(1, 10.0)
+            self.con_handle.send_request_wait_response(
+                "SetAutoRange", {"SlotId": "A", "ChannelIndex": 1}
+            )
+            self.span(1, 20.0)
+            self.span(2, 5.0)
+            self.assertEqual(
+                self.con_handle.sock.methods, [], "Setter not staged."
+            )
+
+        self.assertEqual(
+            self.con_handle.sock.methods,
+            ["SetAutoRange", "SetSpanAndOffset", "SetSpanAndOffset"],
+            "Coalesced write order failed.",
+        )
+        self.assertEqual(
+            [params["Span"] for params in self.con_handle.sock.params[1:]],
+            [20.0, 5.0],
+            "Superseding write not kept.",
+        )
+        self.assertEqual(
+            staging.result,
+            ("OK", 4, 3, ["OK", "OK", "OK"]),
+            "Staging result failed.",
+        )
+        self.assertFalse(self.con_handle.staging, "Staging not ended.")
+
+    def test_flush_before_read(self):
+        """Test staged writes sent before a read"""
+
+        with write_staging.WriteStaging(self.con_handle) as staging:
+            self.span(1, 10.0)
+            self.con_handle.send_request_wait_response(
+                "GetSpanAndOffset", {"SlotId": "A", "ChannelIndex": 1}
+            )
+            self.span(1, 20.0)
+
+        self.assertEqual(
+            self.con_handle.sock.methods,
+            ["SetSpanAndOffset", "GetSpanAndOffset", "SetSpanAndOffset"],
+            "Staged write not sent before read.",
+        )
+        self.assertEqual(staging.result.sent_calls, 2, "Sent count failed.")
+
+    def test_digest_cleared(self):
+        """Test staged writes invalidating the settings digest"""
+
+        blob = "<settings/>"
+        self.con_handle.settings_digest = (
+            manage_mainframe_settings.settings_digest(blob)
+        )
+        with write_staging.WriteStaging(self.con_handle):
+            self.span(1, 10.0)
+            manage_mainframe_settings.set_current_settings(
+                self.con_handle, blob, len(blob), skip_if_unchanged=True
+            )
+
+        self.assertEqual(self.con_handle.sock.methods[0], "SetSpanAndOffset")
+        self.assertEqual(
+            self.con_handle.sock.methods[-1],
+            "SetCurrentSettings",
+            "Settings skipped after a staged write.",
+        )
+
+    def test_discard_on_exception(self):
+        """Test staged writes dropped when the block fails"""
+
+        with self.assertRaises(RuntimeError):
+            with write_staging.WriteStaging(self.con_handle) as staging:
+                self.span(1, 10.0)
+                raise RuntimeError("setup failed")
+
+        self.assertEqual(
+            self.con_handle.sock.methods, [], "Staged write not dropped."
+        )
+        self.assertIsNone(staging.result, "Result set after discard.")
+        self.assertFalse(self.con_handle.staging, "Staging not ended.")
+
+
+if __name__ == "__main__":
+    unittest.main(
+        testRunner=HtmlTestRunner.HTMLTestRunner(
+            open_in_browser=True,
+            report_name="Write Staging Unittest Report",
+            report_title="Write Staging Unittest Report",
+        )
+    )